@@ -0,0 +1,851 @@
+import ast
+import json
+import os
+from array import array
+import symtable
+import sys
+import sysconfig
+import tempfile
+import time
+import tracemalloc
+
+from KnowledgeGraph import KnowledgeGraph
+from CallGraph import CallGraph, SummaryCache
+from CachedConstructAST import CachedConstructAST
+from ConstructAST import ConstructAST
+from BinaryGraph import BinaryGraph, write_graph
+from Datalog import Datalog
+from ExtractPaths import extract_paths, python_files
+from ExtractionCache import ExtractionCache
+from FoldOperations import fold_operations
+from GraphDiff import GraphSignature, graph_diff, patch
+from GraphIndex import GraphIndex
+from GraphQuery import GraphQuery, is_variable
+from GraphStore import GraphStore
+from IncrementalExtractor import IncrementalExtractor
+from SourceEmitter import SourceEmitter
+from VerifyPaths import structural_hash, verify_paths
+
+def best_of(function, repeat=3):
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+
+    return best
+
+def extract(source):
+
+    knowledge_graph = KnowledgeGraph()
+    knowledge_graph.visit(ast.parse(source))
+
+    return knowledge_graph.nodes, knowledge_graph.edges
+
+def generated_module(lines):
+
+    statements = []
+    for idx in range(lines):
+        statements.append(f"value_{idx} = compute(a, b, (c, d, e), [f, g], key={idx})")
+
+    return "\n".join(statements) + "\n"
+
+def bench_reconstruction(sizes=(1000, 2000, 4000, 8000)):
+
+    print(f"{'lines':>8} {'edges':>10} {'seconds':>10} {'us/edge':>10}")
+    for lines in sizes:
+        nodes, edges = extract(generated_module(lines))
+        elapsed = best_of(lambda: ConstructAST(nodes, edges).build_module())
+        print(f"{lines:>8} {len(edges):>10} {elapsed:>10.4f} {elapsed / len(edges) * 1e6:>10.2f}")
+
+def stdlib_sources(limit=None):
+
+    library = sysconfig.get_paths()["stdlib"]
+    names = sorted(name for name in os.listdir(library) if name.endswith(".py"))
+    if limit is not None:
+        names = names[:limit]
+
+    sources = []
+    for name in names:
+        with open(os.path.join(library, name), "rb") as handle:
+            sources.append((name, handle.read()))
+
+    return sources
+
+def expression_roots(tree):
+
+    roots = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.expr):
+            continue
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr):
+                roots.append(child)
+
+    return roots
+
+def bench_expressions():
+
+    roots = []
+    for _, source in stdlib_sources():
+        try:
+            roots.extend(expression_roots(ast.parse(source)))
+        except SyntaxError:
+            continue
+
+    def run():
+        knowledge_graph = KnowledgeGraph()
+        handled = failed = 0
+        for root in roots:
+            try:
+                knowledge_graph.handle_expression(root, None)
+                handled += 1
+            except Exception:
+                failed += 1
+        return knowledge_graph, handled, failed
+
+    knowledge_graph, handled, failed = run()
+    elapsed = best_of(run)
+    print(f"roots: {handled} handled, {failed} failed")
+    print(f"expression nodes: {len(knowledge_graph.nodes)} in {elapsed:.3f} s ({len(knowledge_graph.nodes) / elapsed:,.0f} nodes/s)")
+
+def deep_expression(kind, depth):
+
+    expression = ast.Name(id="x", ctx=ast.Load())
+    for idx in range(depth):
+        if kind == "binop":
+            expression = ast.BinOp(left=expression, op=ast.Add(), right=ast.Name(id=f"v{idx}", ctx=ast.Load()))
+        elif kind == "attribute":
+            expression = ast.Attribute(value=expression, attr="b", ctx=ast.Load())
+        elif kind == "call":
+            expression = ast.Call(func=expression, args=[], keywords=[])
+
+    return expression
+
+def bench_deep_expressions(depths=(1000, 10000, 100000)):
+
+    print(f"{'kind':>10} {'depth':>8} {'nodes':>8} {'seconds':>10} {'nodes/s':>12}")
+    for kind in ("binop", "attribute", "call"):
+        for depth in depths:
+            expression = deep_expression(kind, depth)
+            knowledge_graph = None
+
+            def run():
+                nonlocal knowledge_graph
+                knowledge_graph = KnowledgeGraph()
+                knowledge_graph.handle_expression(expression, None)
+
+            try:
+                elapsed = best_of(run)
+            except RecursionError:
+                print(f"{kind:>10} {depth:>8} {'RecursionError':>32}")
+                continue
+            node_count = len(knowledge_graph.nodes)
+            print(f"{kind:>10} {depth:>8} {node_count:>8} {elapsed:>10.4f} {node_count / elapsed:>12,.0f}")
+
+def nested_if_graph(depth):
+
+    nodes = {}
+    edges = []
+    container = ("Module:<top>", "Has_Statement")
+    for idx in range(depth):
+        if_id = f"if_{idx}"
+        name_id = f"name_{idx}"
+        nodes[if_id] = {"type": "Statement", "attributes": {"kind": "If", "lineno": idx + 1, "order": idx + 1}}
+        nodes[name_id] = {"type": "Name", "attributes": {"name": f"c{idx}"}}
+        edges.append((container[0], container[1], if_id))
+        edges.append((if_id, "Condition", name_id))
+        container = (if_id, "Body_Statement")
+
+    return nodes, edges
+
+def bench_deep_reconstruction(depths=(1000, 10000, 100000)):
+
+    print(f"{'kind':>10} {'depth':>8} {'ast nodes':>10} {'seconds':>10}")
+    for kind in ("binop", "attribute", "call", "if"):
+        for depth in depths:
+            if kind == "if":
+                nodes, edges = nested_if_graph(depth)
+            else:
+                module = ast.Module(body=[ast.Expr(value=deep_expression(kind, depth))], type_ignores=[])
+                knowledge_graph = KnowledgeGraph()
+                knowledge_graph.visit(module)
+                nodes, edges = knowledge_graph.nodes, knowledge_graph.edges
+            module = None
+
+            def run():
+                nonlocal module
+                module = ConstructAST(nodes, edges).build_module()
+
+            try:
+                elapsed = best_of(run)
+            except RecursionError:
+                print(f"{kind:>10} {depth:>8} {'RecursionError':>21}")
+                continue
+            node_count = sum(1 for _ in ast.walk(module))
+            print(f"{kind:>10} {depth:>8} {node_count:>10} {elapsed:>10.4f}")
+
+def deep_sizeof(root, seen=None):
+
+    seen = set() if seen is None else seen
+    pending = [root]
+    total = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            pending.extend(item)
+        elif isinstance(item, (str, bytes, int, float, complex, bool, array)) or item is None:
+            continue
+        elif hasattr(item, "__dict__"):
+            pending.extend(vars(item).values())
+
+    return total
+
+def extract_corpus(sources, **options):
+
+    graphs = []
+    for _, source in sources:
+        knowledge_graph = KnowledgeGraph(**options)
+        try:
+            knowledge_graph.visit(ast.parse(source))
+        except Exception:
+            continue
+        graphs.append(knowledge_graph)
+
+    return graphs
+
+def bench_memory():
+
+    sources = stdlib_sources()
+    variants = (("dict", {}), ("interned", {"intern_leaves": True}),
+                ("compact", {"compact": True}), ("compact+interned", {"compact": True, "intern_leaves": True}))
+    for label, options in variants:
+        graphs = extract_corpus(sources, **options)
+        seen = set()
+        if options.get("compact"):
+            node_parts = [(graph.sink.prefixes, graph.sink.prefix_codes, graph.sink.prefix_slots,
+                           graph.sink.sparse_slots, graph.sink.named_ids, graph.sink.named_names,
+                           graph.sink.node_prefixes, graph.sink.node_numbers, graph.sink.node_shapes,
+                           graph.sink.node_records, graph.sink.node_order, graph.sink.shapes, graph.sink.shape_codes,
+                           graph.sink.records, graph.sink.record_codes) for graph in graphs]
+            edge_parts = [(graph.sink.relations, graph.sink.relation_codes, graph.sink.edge_sources,
+                           graph.sink.edge_relations, graph.sink.edge_indexes,
+                           graph.sink.edge_destinations) for graph in graphs]
+        else:
+            node_parts = [graph.nodes for graph in graphs]
+            edge_parts = [graph.edges for graph in graphs]
+        node_size = deep_sizeof(node_parts, seen)
+        edge_size = deep_sizeof(edge_parts, seen)
+        node_count = sum(len(graph.nodes) for graph in graphs)
+        edge_count = sum(len(graph.edges) for graph in graphs)
+        print(f"{label:>16}: {len(graphs)} modules, {node_count} nodes, {edge_count} edges, "
+              f"{node_size / node_count:.1f} bytes/node, {edge_size / edge_count:.1f} bytes/edge")
+
+def bench_parallel(worker_counts=(1, 2, 4, 8)):
+
+    library = sysconfig.get_paths()["stdlib"]
+    files = python_files([library])
+    total_bytes = sum(os.path.getsize(path) for path in files)
+    print(f"{len(files)} files, {total_bytes / 1e6:.1f} MB, {os.cpu_count()} CPUs")
+
+    for workers in worker_counts:
+        start = time.perf_counter()
+        result = extract_paths(files, workers=workers, root=library)
+        elapsed = time.perf_counter() - start
+        print(f"workers={workers:<3} {elapsed:8.2f} s {len(files) / elapsed:8.1f} files/s "
+              f"({len(result.modules)} extracted, {len(result.failures)} failed)")
+
+def bench_cache():
+
+    library = sysconfig.get_paths()["stdlib"]
+    files = python_files([library])
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label in ("cold", "warm"):
+            cache = ExtractionCache(directory)
+            start = time.perf_counter()
+            extract_paths(files, workers=1, root=library, cache=cache)
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {elapsed:8.2f} s, {cache.hits} hits, {cache.misses} misses, "
+                  f"{cache.size() / 1e6:.1f} MB cached")
+
+def stdlib_graph():
+
+    library = sysconfig.get_paths()["stdlib"]
+    result = extract_paths(python_files([library]), root=library)
+    print(f"{len(result.modules)} modules, {len(result.nodes)} nodes, {len(result.edges)} edges")
+
+    return result
+
+def bench_serialization():
+
+    result = stdlib_graph()
+    nodes, edges = result.nodes, result.edges
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "graph.json")
+        binary_path = os.path.join(directory, "graph.kgb")
+        with open(json_path, "w") as handle:
+            json.dump({"nodes": nodes, "edges": edges}, handle, default=repr)
+        write_graph(binary_path, nodes, edges)
+
+        def load_json():
+            with open(json_path) as handle:
+                graph = json.load(handle)
+            return graph["nodes"], graph["edges"]
+
+        def open_binary():
+            graph = BinaryGraph(binary_path)
+            graph.close()
+
+        def scan_binary():
+            with BinaryGraph(binary_path) as graph:
+                for _ in graph.edges:
+                    pass
+
+        def construct_json():
+            loaded_nodes, loaded_edges = load_json()
+            ConstructAST(loaded_nodes, loaded_edges)
+
+        def construct_binary():
+            with BinaryGraph(binary_path) as graph:
+                ConstructAST.from_graph(graph)
+
+        print(f"  json: {os.path.getsize(json_path) / 1e6:8.2f} MB, load {best_of(load_json):.3f} s, "
+              f"load + ConstructAST {best_of(construct_json):.3f} s")
+        print(f"binary: {os.path.getsize(binary_path) / 1e6:8.2f} MB, open {best_of(open_binary):.5f} s, "
+              f"scan edges {best_of(scan_binary):.3f} s, open + ConstructAST {best_of(construct_binary):.3f} s")
+
+def bench_store(module_count=50):
+
+    result = stdlib_graph()
+    module_ids = sorted(result.modules.values())[:module_count]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = GraphStore(os.path.join(directory, "graph.db"))
+        start = time.perf_counter()
+        store.add_graph(result.nodes, result.edges)
+        print(f"bulk insert: {time.perf_counter() - start:.2f} s, "
+              f"{os.path.getsize(os.path.join(directory, 'graph.db')) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        ConstructAST(result.nodes, result.edges)
+        print(f"in memory: ConstructAST setup over every edge {time.perf_counter() - start:.3f} s")
+
+        timings = []
+        for module_id in module_ids:
+            try:
+                elapsed = best_of(lambda: ConstructAST.from_graph(store, module_id).build_module())
+            except Exception:
+                continue
+            timings.append(elapsed)
+        timings.sort()
+        print(f"store: {len(timings)} modules rebuilt, median {timings[len(timings) // 2] * 1e3:.2f} ms, "
+              f"max {timings[-1] * 1e3:.2f} ms")
+        store.close()
+
+def function_module(functions, edited=None):
+
+    blocks = []
+    for idx in range(functions):
+        result = "total + 1" if idx == edited else "total"
+        blocks.append(f"def function_{idx}(a, b, c=None):\n"
+                      f"    total = compute(a, b, (c, {idx}), key={idx})\n"
+                      f"    for item in items(total):\n"
+                      f"        total = total + item * {idx}\n"
+                      f"    return {result}\n")
+
+    return "\n".join(blocks)
+
+def bench_incremental(sizes=(100, 1000, 4000)):
+
+    print(f"{'functions':>10} {'full s':>10} {'update s':>10} {'speedup':>10}")
+    for functions in sizes:
+        source = function_module(functions)
+        edited = function_module(functions, edited=functions // 2)
+        full = best_of(lambda: extract(edited))
+
+        def update():
+
+            incremental = IncrementalExtractor(source, *extract(source))
+            start = time.perf_counter()
+            incremental.update(edited)
+            return time.perf_counter() - start
+
+        elapsed = min(update() for _ in range(3))
+        print(f"{functions:>10} {full:>10.4f} {elapsed:>10.4f} {full / elapsed:>9.1f}x")
+
+def bench_content_ids():
+
+    sources = stdlib_sources()
+    for label, options in (("counter", {}), ("content", {"content_ids": True})):
+        start = time.perf_counter()
+        graphs = extract_corpus(sources, **options)
+        elapsed = time.perf_counter() - start
+        node_count = sum(len(graph.nodes) for graph in graphs)
+        edge_count = sum(len(graph.edges) for graph in graphs)
+        print(f"{label:>8}: {elapsed:6.2f} s, {len(graphs)} modules, {node_count} nodes, {edge_count} edges")
+        if options:
+            distinct = len({node_id for graph in graphs for node_id in graph.nodes})
+            print(f"{'':>8}  {distinct} distinct node IDs when the modules are merged")
+
+def numeric_module(lines):
+
+    statements = []
+    for idx in range(lines):
+        statements.append(f"value_{idx} = (a * b + c ** 2 - d / e) % f - (g // {idx + 1}) * -h")
+        statements.append(f"total += value_{idx} * x_{idx} - y_{idx} << 1 | mask")
+        statements.append(f"flag_{idx} = lower < value_{idx} <= upper and not done or value_{idx} != {idx}")
+
+    return "\n".join(statements) + "\n"
+
+def bench_folding(sizes=(1000, 4000)):
+
+    print(f"{'lines':>8} {'schema':>9} {'nodes':>9} {'edges':>9} {'rebuild s':>10}")
+    for lines in sizes:
+        nodes, edges = extract(numeric_module(lines))
+        for label, (schema_nodes, schema_edges) in (("operation", (nodes, edges)),
+                                                    ("folded", fold_operations(nodes, edges))):
+            elapsed = best_of(lambda: ConstructAST(schema_nodes, schema_edges).build_module())
+            print(f"{lines * 3:>8} {label:>9} {len(schema_nodes):>9} {len(schema_edges):>9} {elapsed:>10.4f}")
+
+def bench_index(lines=8000, queries=10000):
+
+    nodes, edges = extract(generated_module(lines))
+    start = time.perf_counter()
+    index = GraphIndex(nodes, edges)
+    print(f"build: {time.perf_counter() - start:.3f} s for {len(nodes)} nodes, {len(edges)} edges")
+
+    node_ids = list(nodes)[::max(1, len(nodes) // queries)][:queries]
+    scanned = node_ids[:100]
+    elapsed = best_of(lambda: [[(source, relation) for source, relation, destination in edges if destination == node_id]
+                               for node_id in scanned], repeat=1)
+    print(f"parents by scan:  {elapsed / len(scanned) * 1e6:10.1f} us/query")
+    elapsed = best_of(lambda: [index.parents(node_id) for node_id in node_ids])
+    print(f"parents by index: {elapsed / len(node_ids) * 1e6:10.3f} us/query")
+
+    elapsed = best_of(lambda: [node_id for node_id, node in nodes.items() if node["type"] == "Statement"
+                               and node["attributes"].get("kind") == "Assign"])
+    print(f"statements of kind by scan:  {elapsed * 1e3:8.3f} ms")
+    elapsed = best_of(lambda: index.statements_of_kind("Assign"))
+    print(f"statements of kind by index: {elapsed * 1e3:8.3f} ms")
+
+    elapsed = best_of(lambda: ConstructAST(nodes, edges).build_module())
+    print(f"ConstructAST, own adjacency:    {elapsed:.3f} s")
+    elapsed = best_of(lambda: ConstructAST.from_graph(index).build_module())
+    print(f"ConstructAST, shared adjacency: {elapsed:.3f} s")
+
+def bench_subtree(sizes=(100, 1000, 4000)):
+
+    print(f"{'functions':>10} {'module ms':>10} {'subtree ms':>11} {'speedup':>8}")
+    for functions in sizes:
+        nodes, edges = extract(function_module(functions))
+        construct = ConstructAST(nodes, edges)
+        function_id = next(node_id for node_id, node in nodes.items()
+                           if node["attributes"].get("name") == f"function_{functions // 2}")
+        module_time = best_of(lambda: ast.unparse(construct.build_module()))
+        subtree_time = best_of(lambda: construct.unparse_subtree(function_id))
+        print(f"{functions:>10} {module_time * 1e3:>10.2f} {subtree_time * 1e3:>11.3f} {module_time / subtree_time:>7.0f}x")
+
+def bench_cached_reconstruction(sizes=(100, 1000, 4000), edits=20):
+
+    print(f"{'functions':>10} {'fresh ms':>9} {'cached ms':>10} {'speedup':>8}")
+    for functions in sizes:
+        nodes, edges = extract(function_module(functions))
+        construct = CachedConstructAST(nodes, edges)
+        construct.build_module()
+        names = [node_id for node_id, node in nodes.items() if node["type"] == "Name"]
+        edited = names[::max(1, len(names) // edits)][:edits]
+
+        fresh_time = 0.0
+        cached_time = 0.0
+        for step, node_id in enumerate(edited):
+            construct.set_node(node_id, "Name", {"name": f"edited_{step}"})
+            start = time.perf_counter()
+            ConstructAST(construct.nodes, construct.edges).build_module()
+            fresh_time += time.perf_counter() - start
+            start = time.perf_counter()
+            construct.build_module()
+            cached_time += time.perf_counter() - start
+
+        fresh_time /= len(edited)
+        cached_time /= len(edited)
+        print(f"{functions:>10} {fresh_time * 1e3:>9.2f} {cached_time * 1e3:>10.3f} {fresh_time / cached_time:>7.0f}x")
+
+def traced(function):
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+def bench_emitter(sizes=(500, 2000, 8000)):
+
+    print(f"{'functions':>10} {'unparse s':>10} {'emit s':>8} {'unparse MB':>11} {'emit MB':>8}")
+    for functions in sizes:
+        nodes, edges = extract(function_module(functions))
+        construct = ConstructAST(nodes, edges)
+        emitter = SourceEmitter(nodes, edges, adjacency=construct)
+        with open(os.devnull, "w") as stream:
+            unparse_time = best_of(lambda: stream.write(ast.unparse(construct.build_module())))
+            emit_time = best_of(lambda: emitter.emit_module(stream))
+            _, unparse_peak = traced(lambda: stream.write(ast.unparse(construct.build_module())))
+            _, emit_peak = traced(lambda: emitter.emit_module(stream))
+        print(f"{functions:>10} {unparse_time:>10.3f} {emit_time:>8.3f} {unparse_peak / 1e6:>11.1f} {emit_peak / 1e6:>8.2f}")
+
+def bench_verification():
+
+    pairs = []
+    for _, source in stdlib_sources():
+        tree = ast.parse(source)
+        try:
+            knowledge_graph = KnowledgeGraph()
+            knowledge_graph.visit(tree)
+            pairs.append((tree, ConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()))
+        except Exception:
+            continue
+
+    elapsed = best_of(lambda: [ast.unparse(original) == ast.unparse(rebuilt) for original, rebuilt in pairs])
+    print(f"{len(pairs)} modules, unparse comparison: {elapsed:.3f} s")
+    elapsed = best_of(lambda: [structural_hash(original) == structural_hash(rebuilt) for original, rebuilt in pairs])
+    print(f"{len(pairs)} modules, structural hash:    {elapsed:.3f} s")
+
+    library = sysconfig.get_paths()["stdlib"]
+    paths = python_files([library])
+    for workers in (1, 4, 8):
+        start = time.perf_counter()
+        result = verify_paths(paths, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"verify_paths, {workers} workers: {elapsed:6.2f} s, {len(result.passed)} passed, "
+              f"{len(result.mismatches)} mismatched, {len(result.failures)} failures")
+
+def bench_diff(sizes=(100, 1000, 4000)):
+
+    print(f"{'functions':>10} {'signature ms':>13} {'diff ms':>9} {'patch ms':>9} {'delta':>7} {'graph':>8}")
+    for functions in sizes:
+        old_nodes, old_edges = extract(function_module(functions))
+        new_nodes, new_edges = extract(function_module(functions, edited=functions // 2))
+        signature_time = best_of(lambda: GraphSignature(new_nodes, new_edges))
+        old_signature = GraphSignature(old_nodes, old_edges)
+        new_signature = GraphSignature(new_nodes, new_edges)
+        diff_time = best_of(lambda: graph_diff(old_signature, new_signature))
+        delta = graph_diff(old_signature, new_signature)
+        patch_time = best_of(lambda: patch(old_nodes, old_edges, delta))
+        print(f"{functions:>10} {signature_time * 1e3:>13.1f} {diff_time * 1e3:>9.3f} {patch_time * 1e3:>9.2f} "
+              f"{len(delta):>7} {len(new_nodes) + len(new_edges):>8}")
+
+def scan_query(nodes, edges, patterns, types, attributes):
+
+    def accepts(term, value):
+
+        if term not in types and term not in attributes:
+            return True
+        node = nodes.get(value)
+        if node is None or node["type"] != types.get(term, node["type"]):
+            return False
+        return all(node["attributes"].get(name) == expected for name, expected in attributes.get(term, {}).items())
+
+    results = [{}]
+    for pattern in patterns:
+        rows = []
+        for edge in edges:
+            row = {}
+            for term, value in zip(pattern, edge):
+                if not is_variable(term):
+                    if term != value:
+                        break
+                elif row.get(term, value) != value or not accepts(term, value):
+                    break
+                else:
+                    row[term] = value
+            else:
+                rows.append(row)
+        shared = [term for term in dict.fromkeys(pattern) if is_variable(term) and results and term in results[0]]
+        by_key = {}
+        for row in rows:
+            by_key.setdefault(tuple(row[term] for term in shared), []).append(row)
+        results = [{**binding, **row} for binding in results
+                   for row in by_key.get(tuple(binding[term] for term in shared), ())]
+
+    return results
+
+def bench_query():
+
+    library = sysconfig.get_paths()["stdlib"]
+    paths = [os.path.join(library, name) for name in sorted(os.listdir(library)) if name.endswith(".py")]
+    result = extract_paths(paths, root=library)
+    start = time.perf_counter()
+    query = GraphQuery(result.nodes, result.edges)
+    print(f"index: {time.perf_counter() - start:.2f} s for {len(result.nodes)} nodes, {len(result.edges)} edges")
+
+    queries = {
+        "attribute calls in try bodies": (
+            [("?try", "Body_Statement", "?statement"), ("?statement", "Value", "?call"), ("?call", "Function_call", "?function")],
+            {"?try": "Statement"},
+            {"?try": {"kind": "Try"}, "?call": {"type": "call"}, "?function": {"type": "attribute", "attribute_value": "append"}}),
+        "functions returning open()": (
+            [("?function", "Returns", "?return"), ("?return", "Computes", "?call"), ("?call", "Function_call", "?name")],
+            {"?function": "Function", "?name": "Name"},
+            {"?name": {"name": "open"}}),
+        "uses of __file__": (
+            [("?user", "?relation", "?name")],
+            {"?name": "Name"},
+            {"?name": {"name": "__file__"}}),
+    }
+    print(f"{'query':<32} {'rows':>6} {'scan ms':>10} {'index ms':>10} {'first row ms':>13}")
+    for label, (patterns, types, attributes) in queries.items():
+        rows = sum(1 for _ in query.match(patterns, types, attributes))
+        scan_time = best_of(lambda: scan_query(result.nodes, result.edges, patterns, types, attributes), repeat=1)
+        index_time = best_of(lambda: list(query.match(patterns, types, attributes)))
+        first_time = best_of(lambda: next(query.match(patterns, types, attributes), None))
+        print(f"{label:<32} {rows:>6} {scan_time * 1e3:>10.1f} {index_time * 1e3:>10.3f} {first_time * 1e3:>13.3f}")
+
+def class_chain(classes):
+
+    blocks = ["class Class_0:\n    pass\n"]
+    for idx in range(1, classes):
+        bases = f"Class_{idx - 1}, Class_{idx - 2}" if idx % 5 == 0 and idx > 1 else f"Class_{idx - 1}"
+        blocks.append(f"class Class_{idx}({bases}):\n    pass\n")
+
+    return "\n".join(blocks)
+
+def nested_module(functions, depth):
+
+    blocks = []
+    for idx in range(functions):
+        lines = [f"def function_{idx}(a):"]
+        for level in range(depth):
+            indent = "    " * (level + 1)
+            lines.append(f"{indent}if a > {level}:")
+            lines.append(f"{indent}    a = a - {idx}")
+        lines.append("    " * (depth + 1) + "return a")
+        blocks.append("\n".join(lines) + "\n")
+
+    return "\n".join(blocks)
+
+def naive_fixpoint(pairs):
+
+    closure = set(pairs)
+    while True:
+        by_destination = {}
+        for source, destination in closure:
+            by_destination.setdefault(destination, []).append(source)
+        added = {(source, destination) for middle, destination in pairs
+                 for source in by_destination.get(middle, ())} - closure
+        if not added:
+            return closure
+        closure |= added
+
+def bench_datalog(depths=(100, 200, 400), nested=((500, 20), (2000, 20), (500, 40))):
+
+    print(f"{'classes':>10} {'ancestors':>10} {'naive s':>9} {'semi-naive s':>13} {'rounds':>7} {'memoized ms':>12}")
+    for classes in depths:
+        nodes, edges = extract(class_chain(classes))
+        program = Datalog(GraphQuery(nodes, edges))
+        program.rule(("class_named", "?name", "?class"), ("node", "?class", "Class"), ("attribute", "?class", "name", "?name"))
+        program.rule(("base", "?class", "?base"), ("indexed", "?class", "Base", "?expression"),
+                     ("attribute", "?expression", "name", "?name"), ("class_named", "?name", "?base"))
+        program.rule(("ancestor", "?class", "?base"), ("base", "?class", "?base"))
+        program.rule(("ancestor", "?class", "?ancestor"), ("ancestor", "?class", "?base"), ("base", "?base", "?ancestor"))
+
+        def naive():
+
+            classes_by_name = {node["attributes"]["name"]: node_id for node_id, node in nodes.items() if node["type"] == "Class"}
+            pairs = [(source, classes_by_name[nodes[destination]["attributes"]["name"]])
+                     for source, relation, destination in edges
+                     if relation.startswith("Base_") and nodes[destination]["type"] == "Name"]
+            return naive_fixpoint(pairs)
+
+        naive_time = best_of(naive, repeat=1)
+        start = time.perf_counter()
+        ancestors = len(program.relation("ancestor"))
+        solve_time = time.perf_counter() - start
+        memoized_time = best_of(program.solve)
+        print(f"{classes:>10} {ancestors:>10} {naive_time:>9.2f} {solve_time:>13.3f} {program.rounds:>7} {memoized_time * 1e3:>12.4f}")
+
+    relations = ("Has_Statement", "Body_Statement", "OrElse_Statement")
+    print(f"{'functions':>10} {'depth':>6} {'nested':>8} {'naive s':>9} {'semi-naive s':>13} {'rounds':>7} {'lookup ms':>10}")
+    for functions, depth in nested:
+        nodes, edges = extract(nested_module(functions, depth))
+        program = Datalog(GraphQuery(nodes, edges))
+        for relation in relations:
+            program.rule(("nested", "?function", "?statement"), ("node", "?function", "Function"),
+                         ("edge", "?function", relation, "?statement"))
+            program.rule(("nested", "?function", "?statement"), ("nested", "?function", "?parent"),
+                         ("edge", "?parent", relation, "?statement"))
+
+        def naive():
+
+            pairs = [(source, destination) for source, relation, destination in edges if relation in relations]
+            closure = naive_fixpoint(pairs)
+            return {(source, destination) for source, destination in closure if nodes[source]["type"] == "Function"}
+
+        naive_time = best_of(naive, repeat=1)
+        start = time.perf_counter()
+        nested_count = len(program.relation("nested"))
+        solve_time = time.perf_counter() - start
+        function_id = next(node_id for node_id, node in nodes.items() if node["type"] == "Function")
+        lookup_time = best_of(lambda: list(program.match(("nested", function_id, "?statement"))))
+        print(f"{functions:>10} {depth:>6} {nested_count:>8} {naive_time:>9.2f} {solve_time:>13.3f} {program.rounds:>7} "
+              f"{lookup_time * 1e3:>10.3f}")
+
+def bench_symbols():
+
+    trees = []
+    for name, source in stdlib_sources():
+        tree = ast.parse(source)
+        try:
+            KnowledgeGraph().visit(tree)
+        except Exception:
+            continue
+        trees.append((name, source, tree))
+
+    def extract_all(**options):
+        graphs = []
+        for _, _, tree in trees:
+            knowledge_graph = KnowledgeGraph(**options)
+            knowledge_graph.visit(tree)
+            graphs.append(knowledge_graph)
+        return graphs
+
+    def second_walk():
+        extract_all()
+        for name, source, _ in trees:
+            symtable.symtable(source, name, "exec")
+
+    plain = best_of(extract_all)
+    scoped = best_of(lambda: extract_all(symbols=True))
+    walked = best_of(second_walk)
+    graphs = extract_all(symbols=True)
+    counts = {"Defines": 0, "Uses": 0, "ResolvesTo": 0}
+    for knowledge_graph in graphs:
+        for _, relation, _ in knowledge_graph.edges:
+            if relation in counts:
+                counts[relation] += 1
+    unresolved = sum(len(knowledge_graph.symbols.unresolved) for knowledge_graph in graphs)
+
+    print(f"{len(trees)} modules")
+    print(f"extraction:                   {plain:.3f} s")
+    print(f"extraction with symbols=True: {scoped:.3f} s ({(scoped / plain - 1) * 100:+.1f}%)")
+    print(f"extraction, then symtable:    {walked:.3f} s ({(walked / plain - 1) * 100:+.1f}%)")
+    print(f"{counts['Defines']} Defines, {counts['Uses']} Uses, {counts['ResolvesTo']} ResolvesTo, "
+          f"{unresolved} uses left to builtins or undefined names")
+
+def monorepo_module(index, modules):
+
+    first = (index * 7 + 1) % modules
+    second = (index * 13 + 5) % modules
+
+    return (f"from package_{first // 50}.module_{first} import function_{first}\n"
+            f"import package_{second // 50}.module_{second} as other\n"
+            f"\n"
+            f"class Handler_{index}:\n"
+            f"    def handle(self, value):\n"
+            f"        return self.step(value) + function_{first}(value)\n"
+            f"\n"
+            f"    def step(self, value):\n"
+            f"        return other.function_{second}(value)\n"
+            f"\n"
+            f"def function_{index}(value):\n"
+            f"    return Handler_{index}().handle(value)\n")
+
+def write_monorepo(directory, modules):
+
+    paths = []
+    for package in range((modules + 49) // 50):
+        os.makedirs(os.path.join(directory, f"package_{package}"))
+        path = os.path.join(directory, f"package_{package}", "__init__.py")
+        with open(path, "w") as handle:
+            handle.write("")
+        paths.append(path)
+    for index in range(modules):
+        path = os.path.join(directory, f"package_{index // 50}", f"module_{index}.py")
+        with open(path, "w") as handle:
+            handle.write(monorepo_module(index, modules))
+        paths.append(path)
+
+    return paths
+
+def bench_callgraph(sizes=(1000, 5000)):
+
+    print(f"{'modules':>8} {'cold s':>8} {'warm s':>8} {'links':>8} {'rescan s':>9} {'body s':>8} {'relinked':>9} "
+          f"{'export s':>9} {'relinked':>9}")
+    for modules in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            root = os.path.join(directory, "repository")
+            paths = write_monorepo(root, modules)
+            cache = SummaryCache(os.path.join(directory, "cache"))
+
+            start = time.perf_counter()
+            graph = CallGraph(root=root, cache=cache)
+            graph.update(paths)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            CallGraph(root=root, cache=cache).update(paths)
+            warm = time.perf_counter() - start
+            links = sum(1 for _ in graph.edges())
+
+            start = time.perf_counter()
+            graph.update(paths)
+            rescan = time.perf_counter() - start
+
+            edited = os.path.join(root, "package_0", "module_1.py")
+            with open(edited, "a") as handle:
+                handle.write("value = function_1(1)\n")
+            start = time.perf_counter()
+            body = graph.update(paths)
+            body_time = time.perf_counter() - start
+            with open(edited, "a") as handle:
+                handle.write("def extra(value):\n    return value\n")
+            start = time.perf_counter()
+            export = graph.update(paths)
+            export_time = time.perf_counter() - start
+
+            print(f"{modules:>8} {cold:>8.2f} {warm:>8.2f} {links:>8} {rescan:>9.3f} {body_time:>8.3f} {len(body):>9} "
+                  f"{export_time:>9.3f} {len(export):>9}")
+
+BENCHMARKS = {
+    "reconstruction": bench_reconstruction,
+    "expressions": bench_expressions,
+    "deep_expressions": bench_deep_expressions,
+    "deep_reconstruction": bench_deep_reconstruction,
+    "memory": bench_memory,
+    "parallel": bench_parallel,
+    "cache": bench_cache,
+    "serialization": bench_serialization,
+    "store": bench_store,
+    "incremental": bench_incremental,
+    "content_ids": bench_content_ids,
+    "folding": bench_folding,
+    "index": bench_index,
+    "subtree": bench_subtree,
+    "cached_reconstruction": bench_cached_reconstruction,
+    "emitter": bench_emitter,
+    "verification": bench_verification,
+    "diff": bench_diff,
+    "query": bench_query,
+    "datalog": bench_datalog,
+    "symbols": bench_symbols,
+    "callgraph": bench_callgraph,
+}
+
+if __name__ == "__main__":
+    selected = sys.argv[1:] or list(BENCHMARKS)
+    for name in selected:
+        print(f"== {name}")
+        BENCHMARKS[name]()
@@ -0,0 +1,510 @@
+import marshal
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+
+from CompactGraph import split_numbered
+
+MAGIC = b"KGBG"
+FORMAT_VERSION = 1
+EDGE_BLOCK_SIZE = 1024
+
+HEADER = struct.Struct("<4sHH")
+SECTION = struct.Struct("<QQ")
+SECTION_NAMES = ("strings", "directory", "shapes", "edges")
+COUNTS = struct.Struct("<II")
+SHAPE_HEADER = struct.Struct("<III")
+EDGE_HEADER = struct.Struct("<III")
+FLOAT = struct.Struct("<d")
+
+NONE_VALUE = 0
+FALSE_VALUE = 1
+TRUE_VALUE = 2
+INT_VALUE = 3
+STRING_VALUE = 4
+FLOAT_VALUE = 5
+MARSHAL_VALUE = 6
+
+def encode_varint(value, out):
+
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(buffer, position):
+
+    result = 0
+    shift = 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+def decode_varints(buffer, position, count):
+
+    values = []
+    append = values.append
+    for _ in range(count):
+        byte = buffer[position]
+        position += 1
+        if byte < 0x80:
+            append(byte)
+            continue
+        result = byte & 0x7F
+        shift = 7
+        while True:
+            byte = buffer[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        append(result)
+
+    return values, position
+
+def zigzag(value):
+
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+def unzigzag(value):
+
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+def encode_text(text):
+
+    return text.encode("utf-8", "surrogatepass")
+
+def uint32_bytes(values):
+
+    values = array("I", values)
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    return values.tobytes()
+
+def pad(out, alignment=8):
+
+    out.extend(b"\0" * (-len(out) % alignment))
+
+def encode_value(value, string_codes, out):
+
+    value_class = value.__class__
+    if value is None:
+        out.append(NONE_VALUE)
+    elif value_class is bool:
+        out.append(TRUE_VALUE if value else FALSE_VALUE)
+    elif value_class is int:
+        out.append(INT_VALUE)
+        encode_varint(zigzag(value), out)
+    elif value_class is str:
+        out.append(STRING_VALUE)
+        encode_varint(string_codes[value], out)
+    elif value_class is float:
+        out.append(FLOAT_VALUE)
+        out.extend(FLOAT.pack(value))
+    else:
+        data = marshal.dumps(value)
+        out.append(MARSHAL_VALUE)
+        encode_varint(len(data), out)
+        out.extend(data)
+
+def split_relation(relation):
+
+    numbered = split_numbered(relation)
+    if numbered is None:
+        return relation, 0
+
+    return numbered[0], numbered[1] + 1
+
+def write_graph(path, nodes, edges, block_size=EDGE_BLOCK_SIZE):
+
+    node_items = list(nodes.items())
+    edge_items = [(source, *split_relation(relation), destination) for source, relation, destination in edges]
+
+    strings = set()
+    for node_id, node in node_items:
+        strings.add(node_id)
+        strings.add(node["type"])
+        for key, value in node["attributes"].items():
+            strings.add(key)
+            if value.__class__ is str:
+                strings.add(value)
+    for source, relation, _, destination in edge_items:
+        strings.add(source)
+        strings.add(relation)
+        strings.add(destination)
+
+    string_table = sorted(strings)
+    string_codes = {text: code for code, text in enumerate(string_table)}
+
+    sections = {}
+
+    blob = bytearray()
+    offsets = [0]
+    for text in string_table:
+        blob.extend(encode_text(text))
+        offsets.append(len(blob))
+    out = bytearray(COUNTS.pack(len(string_table), len(blob)))
+    out.extend(uint32_bytes(offsets))
+    out.extend(blob)
+    sections["strings"] = out
+
+    shape_codes = {}
+    shapes = []
+    node_shapes = {}
+    for node_id, node in node_items:
+        attributes = node["attributes"]
+        shape_key = (node["type"], tuple(attributes))
+        shape = shape_codes.get(shape_key)
+        if shape is None:
+            shape = shape_codes[shape_key] = len(shapes)
+            shapes.append((shape_key, [], {}))
+        _, records, record_codes = shapes[shape]
+
+        encoded = bytearray()
+        for value in attributes.values():
+            encode_value(value, string_codes, encoded)
+        encoded = bytes(encoded)
+        record = record_codes.get(encoded)
+        if record is None:
+            record = record_codes[encoded] = len(records)
+            records.append(encoded)
+        node_shapes[node_id] = (shape, record)
+
+    directory = sorted(range(len(node_items)), key=lambda position: string_codes[node_items[position][0]])
+    positions = {node_position: directory_position for directory_position, node_position in enumerate(directory)}
+    out = bytearray(COUNTS.pack(len(node_items), 0))
+    out.extend(uint32_bytes(string_codes[node_items[position][0]] for position in directory))
+    out.extend(uint32_bytes(node_shapes[node_items[position][0]][0] for position in directory))
+    out.extend(uint32_bytes(node_shapes[node_items[position][0]][1] for position in directory))
+    out.extend(uint32_bytes(positions[position] for position in range(len(node_items))))
+    sections["directory"] = out
+
+    blocks = []
+    for (node_type, keys), records, _ in shapes:
+        block = bytearray(SHAPE_HEADER.pack(string_codes[node_type], len(keys), len(records)))
+        block.extend(uint32_bytes(string_codes[key] for key in keys))
+        record_offsets = [0]
+        for record in records:
+            record_offsets.append(record_offsets[-1] + len(record))
+        block.extend(uint32_bytes(record_offsets))
+        for record in records:
+            block.extend(record)
+        pad(block, 4)
+        blocks.append(block)
+    out = bytearray(COUNTS.pack(len(blocks), 0))
+    block_offset = len(out) + 4 * len(blocks)
+    block_offsets = []
+    for block in blocks:
+        block_offsets.append(block_offset)
+        block_offset += len(block)
+    out.extend(uint32_bytes(block_offsets))
+    for block in blocks:
+        out.extend(block)
+    sections["shapes"] = out
+
+    data = bytearray()
+    edge_offsets = [0]
+    for start in range(0, len(edge_items), block_size):
+        block = edge_items[start:start + block_size]
+        previous = 0
+        for source, _, _, _ in block:
+            code = string_codes[source]
+            encode_varint(zigzag(code - previous), data)
+            previous = code
+        for _, relation, _, _ in block:
+            encode_varint(string_codes[relation], data)
+        for _, _, index, _ in block:
+            encode_varint(index, data)
+        previous = 0
+        for _, _, _, destination in block:
+            code = string_codes[destination]
+            encode_varint(zigzag(code - previous), data)
+            previous = code
+        edge_offsets.append(len(data))
+    out = bytearray(EDGE_HEADER.pack(len(edge_items), block_size, len(edge_offsets) - 1))
+    out.extend(uint32_bytes(edge_offsets))
+    out.extend(data)
+    sections["edges"] = out
+
+    header = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+    offset = HEADER.size + SECTION.size * len(SECTION_NAMES)
+    offset += -offset % 8
+    for name in SECTION_NAMES:
+        header.extend(SECTION.pack(offset, len(sections[name])))
+        offset += len(sections[name])
+        offset += -offset % 8
+    pad(header)
+
+    with open(path, "wb") as handle:
+        handle.write(header)
+        for name in SECTION_NAMES:
+            section = sections[name]
+            pad(section)
+            handle.write(section)
+
+class BinaryGraph:
+
+    def __init__(self, path):
+
+        self.handle = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.handle.close()
+            raise ValueError(f"{path}: empty file is not a binary graph")
+        self.memory = memoryview(self.map)
+        self.views = []
+
+        magic, version, _ = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a binary graph")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path}: unsupported binary graph version {version}")
+
+        sections = {}
+        for idx, name in enumerate(SECTION_NAMES):
+            sections[name] = SECTION.unpack_from(self.map, HEADER.size + SECTION.size * idx)[0]
+
+        start = sections["strings"]
+        self.string_count, _ = COUNTS.unpack_from(self.map, start)
+        self.string_offsets = self.uint32_view(start + COUNTS.size, self.string_count + 1)
+        self.string_data = start + COUNTS.size + 4 * (self.string_count + 1)
+        self.strings = {}
+
+        start = sections["directory"]
+        self.node_count, _ = COUNTS.unpack_from(self.map, start)
+        start += COUNTS.size
+        self.node_ids = self.uint32_view(start, self.node_count)
+        self.node_shapes = self.uint32_view(start + 4 * self.node_count, self.node_count)
+        self.node_records = self.uint32_view(start + 8 * self.node_count, self.node_count)
+        self.node_order = self.uint32_view(start + 12 * self.node_count, self.node_count)
+
+        start = sections["shapes"]
+        shape_count, _ = COUNTS.unpack_from(self.map, start)
+        block_offsets = self.uint32_view(start + COUNTS.size, shape_count)
+        self.shapes = []
+        for idx in range(shape_count):
+            block = start + block_offsets[idx]
+            type_code, key_count, record_count = SHAPE_HEADER.unpack_from(self.map, block)
+            block += SHAPE_HEADER.size
+            keys = tuple(self.string(code) for code in self.uint32_view(block, key_count))
+            block += 4 * key_count
+            record_offsets = self.uint32_view(block, record_count + 1)
+            block += 4 * (record_count + 1)
+            self.shapes.append((self.string(type_code), keys, record_offsets, block))
+
+        start = sections["edges"]
+        self.edge_count, self.block_size, block_count = EDGE_HEADER.unpack_from(self.map, start)
+        self.edge_offsets = self.uint32_view(start + EDGE_HEADER.size, block_count + 1)
+        self.edge_data = start + EDGE_HEADER.size + 4 * (block_count + 1)
+        self.relation_names = {}
+
+        self.nodes = BinaryNodes(self)
+        self.edges = BinaryEdges(self)
+
+    def uint32_view(self, offset, count):
+
+        view = self.memory[offset:offset + 4 * count]
+        if sys.byteorder == "big":
+            values = array("I", view.tobytes())
+            values.byteswap()
+            view.release()
+            return values
+
+        view = view.cast("I")
+        self.views.append(view)
+
+        return view
+
+    def close(self):
+
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.memory.release()
+        self.map.close()
+        self.handle.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exception):
+
+        self.close()
+
+    def string(self, code):
+
+        text = self.strings.get(code)
+        if text is None:
+            start = self.string_data + self.string_offsets[code]
+            end = self.string_data + self.string_offsets[code + 1]
+            text = self.strings[code] = self.map[start:end].decode("utf-8", "surrogatepass")
+
+        return text
+
+    def string_code(self, text):
+
+        low = 0
+        high = self.string_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.string(middle) < text:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.string_count and self.string(low) == text:
+            return low
+
+        return None
+
+    def node_position(self, node_id):
+
+        code = self.string_code(node_id)
+        if code is None:
+            return None
+
+        low = 0
+        high = self.node_count
+        node_ids = self.node_ids
+        while low < high:
+            middle = (low + high) // 2
+            if node_ids[middle] < code:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.node_count and node_ids[low] == code:
+            return low
+
+        return None
+
+    def decode_value(self, position):
+
+        tag = self.map[position]
+        position += 1
+        if tag == NONE_VALUE:
+            return None, position
+        if tag == FALSE_VALUE:
+            return False, position
+        if tag == TRUE_VALUE:
+            return True, position
+        if tag == INT_VALUE:
+            value, position = decode_varint(self.map, position)
+            return unzigzag(value), position
+        if tag == STRING_VALUE:
+            code, position = decode_varint(self.map, position)
+            return self.string(code), position
+        if tag == FLOAT_VALUE:
+            return FLOAT.unpack_from(self.map, position)[0], position + FLOAT.size
+        if tag == MARSHAL_VALUE:
+            length, position = decode_varint(self.map, position)
+            return marshal.loads(self.map[position:position + length]), position + length
+
+        raise ValueError(f"unknown attribute value tag {tag}")
+
+    def node_value(self, position):
+
+        node_type, keys, record_offsets, records = self.shapes[self.node_shapes[position]]
+        offset = records + record_offsets[self.node_records[position]]
+        attributes = {}
+        for key in keys:
+            attributes[key], offset = self.decode_value(offset)
+
+        return {"type": node_type, "attributes": attributes}
+
+    def relation_name(self, relation_code, index):
+
+        name = self.relation_names.get((relation_code, index))
+        if name is None:
+            relation = self.string(relation_code)
+            name = f"{relation}_{index - 1}" if index else relation
+            self.relation_names[(relation_code, index)] = name
+
+        return name
+
+    def edge_block(self, block):
+
+        start = self.edge_data + self.edge_offsets[block]
+        count = min(self.block_size, self.edge_count - block * self.block_size)
+        sources, position = decode_varints(self.map, start, count)
+        relations, position = decode_varints(self.map, position, count)
+        indexes, position = decode_varints(self.map, position, count)
+        destinations, position = decode_varints(self.map, position, count)
+
+        string = self.string
+        relation_name = self.relation_name
+        edges = []
+        source = destination = 0
+        for source_delta, relation, index, destination_delta in zip(sources, relations, indexes, destinations):
+            source += unzigzag(source_delta)
+            destination += unzigzag(destination_delta)
+            edges.append((string(source), relation_name(relation, index), string(destination)))
+
+        return edges
+
+class BinaryNodes(Mapping):
+
+    def __init__(self, graph):
+
+        self.graph = graph
+
+    def __getitem__(self, node_id):
+
+        position = self.graph.node_position(node_id)
+        if position is None:
+            raise KeyError(node_id)
+
+        return self.graph.node_value(position)
+
+    def __contains__(self, node_id):
+
+        return self.graph.node_position(node_id) is not None
+
+    def __iter__(self):
+
+        graph = self.graph
+        for position in graph.node_order:
+            yield graph.string(graph.node_ids[position])
+
+    def __len__(self):
+
+        return self.graph.node_count
+
+class BinaryEdges(Sequence):
+
+    def __init__(self, graph):
+
+        self.graph = graph
+
+    def __getitem__(self, position):
+
+        if isinstance(position, slice):
+            return [self[idx] for idx in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+
+        block, offset = divmod(position, self.graph.block_size)
+
+        return self.graph.edge_block(block)[offset]
+
+    def __iter__(self):
+
+        graph = self.graph
+        for block in range(len(graph.edge_offsets) - 1):
+            yield from graph.edge_block(block)
+
+    def __len__(self):
+
+        return self.graph.edge_count
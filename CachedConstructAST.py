@@ -0,0 +1,153 @@
+import ast
+from collections import OrderedDict
+
+from ConstructAST import ConstructAST
+from GraphIndex import GraphIndex
+
+class CachedConstructAST(ConstructAST):
+
+    def __init__(self, nodes, edges, module_id="Module:<top>", max_nodes=None):
+
+        self.index = GraphIndex(nodes, edges)
+        super().__init__(self.index.nodes, self.index.edges, module_id, self.index)
+        self.max_nodes = max_nodes
+        self.cache = OrderedDict()
+        self.sizes = {}
+        self.cached_nodes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def set_node(self, node_id, node_type, attributes):
+
+        self.invalidate(node_id)
+        self.index.add_node(node_id, node_type, attributes)
+
+    def remove_node(self, node_id):
+
+        self.invalidate(node_id)
+        self.index.remove_node(node_id)
+
+    def add_edge(self, source, relation, destination):
+
+        self.invalidate(source)
+        self.index.add_edge(source, relation, destination)
+
+    def remove_edge(self, source, relation, destination):
+
+        self.invalidate(source)
+        self.index.remove_edge(source, relation, destination)
+
+    def invalidate(self, node_id):
+
+        self.invalidations += self.discard(node_id)
+
+    def discard(self, node_id):
+
+        discarded = 0
+        seen = {node_id}
+        pending = [node_id]
+        while pending:
+            current = pending.pop()
+            if current in self.cache:
+                del self.cache[current]
+                self.cached_nodes -= self.sizes.pop(current)
+                discarded += 1
+            for parent, _ in self.index.parents(current):
+                if parent not in seen:
+                    seen.add(parent)
+                    pending.append(parent)
+
+        return discarded
+
+    def cached(self, node_id, task):
+
+        subtree = self.cache.get(node_id)
+        if subtree is not None:
+            self.cache.move_to_end(node_id)
+            self.hits += 1
+            return subtree
+
+        self.misses += 1
+        return self.remember(node_id, task())
+
+    def remember(self, node_id, task):
+
+        subtree = yield task
+        size = self.locate(subtree)
+        self.cache[node_id] = subtree
+        self.sizes[node_id] = size
+        self.cached_nodes += size
+        self.enforce_limit()
+
+        return subtree
+
+    def enforce_limit(self):
+
+        if self.max_nodes is None:
+            return
+
+        while self.cached_nodes > self.max_nodes:
+            self.evictions += self.discard(next(iter(self.cache)))
+
+    def start_statement(self, statement_id):
+
+        return self.cached(statement_id, lambda: super(CachedConstructAST, self).start_statement(statement_id))
+
+    def build_any_function(self, function_id):
+
+        return self.cached(function_id, lambda: super(CachedConstructAST, self).build_any_function(function_id))
+
+    def build_class(self, class_id):
+
+        return self.cached(class_id, lambda: super(CachedConstructAST, self).build_class(class_id))
+
+    def build_module(self):
+
+        self.index.adjacency()
+
+        return super().build_module()
+
+    def build_subtree(self, node_id):
+
+        self.index.adjacency()
+
+        return super().build_subtree(node_id)
+
+    def fix_missing_locations(self, root):
+
+        self.locate(root)
+
+        return root
+
+    def locate(self, root):
+
+        located = 0
+        pending = [(root, 1, 0, 1, 0)]
+        while pending:
+            node, lineno, col_offset, end_lineno, end_col_offset = pending.pop()
+            if "lineno" in node._attributes:
+                if hasattr(node, "lineno"):
+                    continue
+                node.lineno = lineno
+                node.col_offset = col_offset
+                node.end_lineno = end_lineno
+                node.end_col_offset = end_col_offset
+            located += 1
+            location = (lineno, col_offset, end_lineno, end_col_offset)
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if isinstance(value, ast.AST):
+                    pending.append((value, *location))
+                elif isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, ast.AST):
+                            pending.append((item, *location))
+
+        return located
+
+    def stats(self):
+
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "invalidations": self.invalidations, "entries": len(self.cache), "nodes": self.cached_nodes}
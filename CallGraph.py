@@ -0,0 +1,458 @@
+import ast
+import hashlib
+from collections import defaultdict
+
+from ExtractionCache import EXTRACTOR_DIGEST, INTERPRETER_TAG, ExtractionCache, source_files_digest
+from ExtractPaths import map_tasks, module_id, path_namespace
+from KnowledgeGraph import EXTRACTOR_VERSION, KnowledgeGraph
+
+SUMMARY_VERSION = "1"
+SUMMARY_DIGEST = source_files_digest((__file__,))
+MODULE_ID = "Module:<top>"
+DEFINITION_NODE_TYPES = frozenset(("Function", "AsyncFunction", "Class"))
+SYMBOL_RELATIONS = frozenset(("Defines", "Uses", "ResolvesTo", "Returns"))
+CALLER_RELATIONS = ("Decorator_", "Base_", "Has_Parameter")
+
+worker_caches = {}
+
+class ModuleSummary:
+
+    def __init__(self):
+
+        self.exports = defaultdict(list)
+        self.classes = {}
+        self.calls = []
+        self.signature = None
+
+class ModuleEntry:
+
+    def __init__(self, path, name, namespace, package, digest, summary, failure):
+
+        self.path = path
+        self.name = name
+        self.namespace = namespace
+        self.package = package
+        self.digest = digest
+        self.summary = summary
+        self.failure = failure
+
+class SummaryCache(ExtractionCache):
+
+    def key(self, source):
+
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+
+        digest = hashlib.sha256(f"{EXTRACTOR_VERSION}:{EXTRACTOR_DIGEST}:{INTERPRETER_TAG}:calls:{SUMMARY_VERSION}:{SUMMARY_DIGEST}".encode("ascii"))
+        digest.update(b"\0")
+        digest.update(source)
+
+        return digest.hexdigest()
+
+    def summarize(self, source):
+
+        entry = self.get(source)
+        if entry is None:
+            try:
+                tree = ast.parse(source)
+            except (SyntaxError, ValueError) as error:
+                entry = error
+            else:
+                entry = summarize_tree(tree)
+            self.store(self.key(source), entry)
+
+        if isinstance(entry, Exception):
+            raise entry
+
+        return entry
+
+def source_digest(source):
+
+    return hashlib.blake2b(source, digest_size=16).digest()
+
+def module_name(path, root=None):
+
+    name = path_namespace(path, root)
+    if name.endswith(".py"):
+        name = name[:-len(".py")]
+    package = name.endswith("/__init__") or name == "__init__"
+    if package:
+        name = name[:-len("__init__")].rstrip("/")
+
+    return name.replace("/", "."), package
+
+def absolute_module(name, package, level, target):
+
+    if not level:
+        return target
+    parts = name.split(".") if name else []
+    if not package:
+        parts = parts[:-1]
+    if level - 1 > len(parts):
+        return None
+    parts = parts[:len(parts) - (level - 1)]
+    if target:
+        parts.append(target)
+
+    return ".".join(parts) or None
+
+def summarize_source(source):
+
+    return summarize_tree(ast.parse(source))
+
+def summarize_tree(tree):
+
+    knowledge_graph = KnowledgeGraph(symbols=True)
+    knowledge_graph.visit(tree)
+
+    return summarize_graph(knowledge_graph.nodes, knowledge_graph.edges)
+
+def summarize_graph(nodes, edges):
+
+    outgoing = defaultdict(list)
+    resolves = defaultdict(list)
+    defines = defaultdict(list)
+    statements = {}
+    for source, relation, destination in edges:
+        if relation == "ResolvesTo":
+            resolves[source].append(destination)
+        elif relation == "Defines":
+            defines[source].append(destination)
+        elif relation not in SYMBOL_RELATIONS:
+            outgoing[source].append((relation, destination))
+            if relation.startswith("Alias_"):
+                statements[destination] = source
+
+    def attribute(node_id, name):
+        attributes = nodes[node_id]["attributes"]
+        return attributes.get(name) if isinstance(attributes, dict) else None
+
+    def child(node_id, relation):
+        for edge_relation, destination in outgoing.get(node_id, ()):
+            if edge_relation == relation:
+                return destination
+        return None
+
+    class_ids = [node_id for node_id, node in nodes.items() if node["type"] == "Class"]
+    instances = {}
+    for class_id in class_ids:
+        for relation, method_id in outgoing.get(class_id, ()):
+            if relation not in ("Has_def", "Has_Async_Function"):
+                continue
+            decorators = {attribute(decorator, "name") for decorator_relation, decorator in outgoing[method_id]
+                          if decorator_relation.startswith("Decorator_")}
+            if "staticmethod" in decorators:
+                continue
+            for parameter_relation, parameter_id in outgoing[method_id]:
+                if parameter_relation == "Has_Parameter" and attribute(parameter_id, "position") == 0 \
+                        and attribute(parameter_id, "kind") in ("PositionOnly", "arg"):
+                    instances[parameter_id] = class_id
+                    break
+
+    def import_binding(alias_id):
+        statement_id = statements.get(alias_id)
+        if statement_id is None:
+            return None
+        name = attribute(alias_id, "name")
+        if attribute(statement_id, "kind") == "Import":
+            if attribute(alias_id, "asname"):
+                return ("module", name)
+            return ("module", name.partition(".")[0])
+        level = attribute(child(statement_id, "Level"), "literal_value")
+        module = attribute(child(statement_id, "Module"), "literal_value")
+        return ("from", level or 0, module, name)
+
+    def binding(node_id):
+        node_type = nodes[node_id]["type"]
+        if node_type in DEFINITION_NODE_TYPES:
+            return ("definition", node_id)
+        if node_type == "Alias":
+            return import_binding(node_id)
+        if node_id in instances:
+            return ("definition", instances[node_id])
+        return None
+
+    def references(expression_id):
+        attributes = []
+        while nodes[expression_id]["type"] == "Expression" and attribute(expression_id, "type") == "attribute":
+            attributes.append(attribute(expression_id, "attribute_value"))
+            expression_id = child(expression_id, "Value")
+            if expression_id is None:
+                return []
+        if nodes[expression_id]["type"] != "Name":
+            return []
+        attributes = tuple(reversed(attributes))
+        found = []
+        for target in resolves.get(expression_id, ()):
+            target_binding = binding(target)
+            if target_binding is not None and (target_binding, attributes) not in found:
+                found.append((target_binding, attributes))
+        return found
+
+    def scope_bindings(scope_id):
+        table = defaultdict(list)
+        for node_id in defines.get(scope_id, ()):
+            node_type = nodes[node_id]["type"]
+            if node_type in DEFINITION_NODE_TYPES:
+                name = attribute(node_id, "name")
+            elif node_type == "Alias":
+                name = attribute(node_id, "asname") or attribute(node_id, "name")
+            else:
+                continue
+            target_binding = binding(node_id)
+            if target_binding is not None and target_binding[0] == "module" and not attribute(node_id, "asname"):
+                name = name.partition(".")[0]
+            if target_binding is not None and target_binding not in table[name]:
+                table[name].append(target_binding)
+        return dict(table)
+
+    summary = ModuleSummary()
+    summary.exports = scope_bindings(MODULE_ID)
+    for class_id in class_ids:
+        bases = [reference for relation, base_id in outgoing.get(class_id, ())
+                 if relation.startswith("Base_") for reference in references(base_id)]
+        summary.classes[class_id] = (scope_bindings(class_id), bases)
+
+    pending = [(MODULE_ID, MODULE_ID)]
+    while pending:
+        node_id, caller = pending.pop()
+        node = nodes.get(node_id)
+        inner = caller
+        if node is not None and node["type"] in DEFINITION_NODE_TYPES:
+            inner = node_id
+        elif node is not None and node["type"] == "Expression" and attribute(node_id, "type") == "call":
+            function_id = child(node_id, "Function_call")
+            if function_id is not None:
+                found = references(function_id)
+                if found:
+                    summary.calls.append((caller, node_id, tuple(found)))
+        for relation, destination in outgoing.get(node_id, ()):
+            outer = inner != caller and relation.startswith(CALLER_RELATIONS)
+            pending.append((destination, caller if outer else inner))
+
+    summary.signature = hashlib.blake2b(repr((sorted(summary.exports.items()), sorted(summary.classes.items())))
+                                        .encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    return summary
+
+def worker_cache(directory):
+
+    if directory is None:
+        return None
+    if directory not in worker_caches:
+        worker_caches[directory] = SummaryCache(directory)
+
+    return worker_caches[directory]
+
+def summarize_file(task, cache=None):
+
+    path, cache_directory = task
+    if cache is None:
+        cache = worker_cache(cache_directory)
+    try:
+        with open(path, "rb") as handle:
+            source = handle.read()
+    except OSError as error:
+        return None, None, f"{type(error).__name__}: {error}"
+    try:
+        summary = cache.summarize(source) if cache is not None else summarize_source(source)
+    except Exception as error:
+        return source_digest(source), None, f"{type(error).__name__}: {error}"
+
+    return source_digest(source), summary, None
+
+class CallGraph:
+
+    def __init__(self, root=None, cache=None, workers=None):
+
+        self.root = root
+        self.cache = cache
+        self.workers = workers
+        self.entries = {}
+        self.modules = {}
+        self.links = {}
+        self.consulted = {}
+        self.dependents = defaultdict(set)
+        self.failures = {}
+        self.unresolved = {}
+
+    def update(self, paths):
+
+        tasks = []
+        for path in paths:
+            entry = self.entries.get(path)
+            try:
+                with open(path, "rb") as handle:
+                    digest = source_digest(handle.read())
+            except OSError:
+                digest = None
+            if entry is None or digest is None or entry.digest != digest:
+                tasks.append(path)
+
+        cache_directory = self.cache.directory if self.cache is not None else None
+        outcomes = map_tasks(summarize_file, [(path, cache_directory) for path in tasks], self.workers, self.cache)
+
+        relink = set()
+        for (digest, summary, failure), path in zip(outcomes, tasks):
+            name, package = module_name(path, self.root)
+            previous = self.entries.get(path)
+            entry = ModuleEntry(path, name, path_namespace(path, self.root), package, digest, summary, failure)
+            self.entries[path] = entry
+            self.modules[name] = entry
+            self.failures.pop(path, None)
+            if failure is not None:
+                self.failures[path] = failure
+            relink.add(name)
+            if self.exports_changed(previous, entry):
+                relink.update(self.dependents.get(name, ()))
+
+        return self.relink(relink)
+
+    def remove(self, paths):
+
+        relink = set()
+        for path in paths:
+            entry = self.entries.pop(path, None)
+            if entry is None:
+                continue
+            self.failures.pop(path, None)
+            if self.modules.get(entry.name) is entry:
+                del self.modules[entry.name]
+            relink.add(entry.name)
+            relink.update(self.dependents.get(entry.name, ()))
+
+        return self.relink(relink)
+
+    def exports_changed(self, previous, entry):
+
+        if previous is None:
+            return True
+        old = previous.summary.signature if previous.summary is not None else None
+        new = entry.summary.signature if entry.summary is not None else None
+
+        return old != new or previous.namespace != entry.namespace
+
+    def relink(self, names):
+
+        for name in names:
+            for module in self.consulted.pop(name, ()):
+                self.dependents[module].discard(name)
+            self.links.pop(name, None)
+            self.unresolved.pop(name, None)
+            entry = self.modules.get(name)
+            if entry is not None and entry.summary is not None:
+                self.link(entry)
+
+        return names
+
+    def link(self, entry):
+
+        consulted = set()
+        resolved = {}
+        links = []
+        unresolved = 0
+        prefix = f"{entry.namespace}:"
+        for caller, call, references in entry.summary.calls:
+            callees = []
+            for reference in references:
+                if reference not in resolved:
+                    resolved[reference] = self.resolve(entry, reference, consulted)
+                callees.extend(resolved[reference])
+            if not callees:
+                unresolved += 1
+            caller_id = module_id(entry.namespace) if caller == MODULE_ID else prefix + caller
+            for callee in dict.fromkeys(callees):
+                links.append((caller_id, prefix + call, callee))
+
+        consulted.discard(entry.name)
+        self.links[entry.name] = links
+        self.unresolved[entry.name] = unresolved
+        self.consulted[entry.name] = consulted
+        for module in consulted:
+            self.dependents[module].add(entry.name)
+
+    def resolve(self, entry, reference, consulted):
+
+        binding, attributes = reference
+        seen = set()
+        targets = self.resolve_binding(entry, binding, consulted, seen)
+        for name in attributes:
+            targets = [found for target in targets for found in self.member(target, name, consulted, seen)]
+
+        return [f"{target[1].namespace}:{target[2]}" for target in targets if target[0] == "definition"]
+
+    def resolve_binding(self, entry, binding, consulted, seen):
+
+        if binding[0] == "definition":
+            return [("definition", entry, binding[1])]
+        if binding[0] == "module":
+            return [("module", binding[1])]
+
+        _, level, module, name = binding
+        base = absolute_module(entry.name, entry.package, level, module)
+        if base is None:
+            return []
+
+        return self.export(base, name, consulted, seen)
+
+    def export(self, module, name, consulted, seen):
+
+        key = ("export", module, name)
+        if key in seen:
+            return []
+        seen.add(key)
+        consulted.add(module)
+
+        targets = []
+        entry = self.modules.get(module)
+        if entry is not None and entry.summary is not None:
+            for binding in entry.summary.exports.get(name, ()):
+                targets.extend(self.resolve_binding(entry, binding, consulted, seen))
+        if not targets:
+            submodule = f"{module}.{name}"
+            consulted.add(submodule)
+            if submodule in self.modules:
+                targets.append(("module", submodule))
+
+        return targets
+
+    def member(self, target, name, consulted, seen):
+
+        if target[0] == "module":
+            return self.export(target[1], name, consulted, seen)
+
+        _, entry, class_id = target
+        key = ("member", entry.name, class_id, name)
+        if key in seen:
+            return []
+        seen.add(key)
+        table = entry.summary.classes.get(class_id)
+        if table is None:
+            return []
+
+        members, bases = table
+        if name in members:
+            return [found for binding in members[name] for found in self.resolve_binding(entry, binding, consulted, seen)]
+        targets = []
+        for binding, attributes in bases:
+            classes = self.resolve_binding(entry, binding, consulted, seen)
+            for attribute in attributes:
+                classes = [found for base in classes for found in self.member(base, attribute, consulted, seen)]
+            for base in classes:
+                if base[0] == "definition":
+                    targets.extend(self.member(base, name, consulted, seen))
+            if targets:
+                break
+
+        return targets
+
+    def edges(self):
+
+        for links in self.links.values():
+            for caller, _, callee in links:
+                yield caller, "Calls", callee
+
+    def call_sites(self):
+
+        for links in self.links.values():
+            yield from links
@@ -0,0 +1,242 @@
+from array import array
+from collections.abc import Mapping, Sequence
+
+NOT_A_NODE = 0xFFFFFFFF
+DENSE_SLOT_SLACK = 1024
+INTERNED_VALUE_TYPES = (str, int, type(None))
+
+def split_numbered(name):
+
+    base, separator, number = name.rpartition("_")
+    if not separator or not number.isdigit() or str(int(number)) != number or int(number) >= NOT_A_NODE:
+        return None
+
+    return base, int(number)
+
+class CompactGraph:
+
+    def __init__(self):
+
+        self.prefixes = []
+        self.prefix_codes = {}
+        self.prefix_slots = []
+        self.sparse_slots = {}
+        self.named_ids = {}
+        self.named_names = {}
+
+        self.node_prefixes = array("I")
+        self.node_numbers = array("I")
+        self.node_shapes = array("I")
+        self.node_records = array("I")
+        self.node_order = array("I")
+
+        self.shapes = []
+        self.shape_codes = {}
+        self.records = []
+        self.record_codes = []
+
+        self.relations = []
+        self.relation_codes = {}
+
+        self.edge_sources = array("I")
+        self.edge_relations = array("I")
+        self.edge_indexes = array("I")
+        self.edge_destinations = array("I")
+
+        self.nodes = CompactNodes(self)
+        self.edges = CompactEdges(self)
+
+    def intern(self, values, codes, value):
+
+        code = codes.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            codes[value] = code
+
+        return code
+
+    def lookup(self, node_id):
+
+        numbered = split_numbered(node_id)
+        if numbered is None:
+            return self.named_ids.get(node_id)
+
+        prefix, number = numbered
+        prefix_code = self.prefix_codes.get(prefix)
+        if prefix_code is None:
+            return None
+
+        slots = self.prefix_slots[prefix_code]
+        if number < len(slots) and slots[number]:
+            return slots[number] - 1
+
+        return self.sparse_slots.get((prefix_code, number))
+
+    def resolve(self, node_id):
+
+        node = self.lookup(node_id)
+        if node is not None:
+            return node
+
+        node = len(self.node_shapes)
+        numbered = split_numbered(node_id)
+        if numbered is None:
+            self.named_ids[node_id] = node
+            self.named_names[node] = node_id
+            self.node_prefixes.append(NOT_A_NODE)
+            self.node_numbers.append(0)
+        else:
+            prefix, number = numbered
+            prefix_code = self.intern(self.prefixes, self.prefix_codes, prefix)
+            if prefix_code == len(self.prefix_slots):
+                self.prefix_slots.append(array("I"))
+            slots = self.prefix_slots[prefix_code]
+            if len(slots) <= number < 2 * len(slots) + DENSE_SLOT_SLACK:
+                slots.extend([0] * (number + 1 - len(slots)))
+            if number < len(slots):
+                slots[number] = node + 1
+            else:
+                self.sparse_slots[(prefix_code, number)] = node
+            self.node_prefixes.append(prefix_code)
+            self.node_numbers.append(number)
+
+        self.node_shapes.append(NOT_A_NODE)
+        self.node_records.append(0)
+
+        return node
+
+    def node_name(self, node):
+
+        prefix_code = self.node_prefixes[node]
+        if prefix_code == NOT_A_NODE:
+            return self.named_names[node]
+
+        return f"{self.prefixes[prefix_code]}_{self.node_numbers[node]}"
+
+    def add_node(self, node_id, node_type, attributes):
+
+        node = self.resolve(node_id)
+        if self.node_shapes[node] == NOT_A_NODE:
+            self.node_order.append(node)
+
+        keys = tuple(attributes)
+        values = tuple(attributes.values())
+        shape = self.intern(self.shapes, self.shape_codes, (node_type, keys))
+        if shape == len(self.records):
+            self.records.append([])
+            self.record_codes.append({})
+
+        records = self.records[shape]
+        if all(value.__class__ in INTERNED_VALUE_TYPES for value in values):
+            record = self.intern(records, self.record_codes[shape], values)
+        else:
+            record = len(records)
+            records.append(values)
+
+        self.node_shapes[node] = shape
+        self.node_records[node] = record
+
+    def add_edge(self, source, relation, destination):
+
+        numbered = split_numbered(relation)
+        if numbered is None:
+            relation_code = self.intern(self.relations, self.relation_codes, relation)
+            index = 0
+        else:
+            base, number = numbered
+            relation_code = self.intern(self.relations, self.relation_codes, base)
+            index = number + 1
+
+        self.edge_sources.append(self.resolve(source))
+        self.edge_relations.append(relation_code)
+        self.edge_indexes.append(index)
+        self.edge_destinations.append(self.resolve(destination))
+
+    def flush(self):
+
+        pass
+
+    def close(self):
+
+        pass
+
+    def node_value(self, node):
+
+        shape = self.node_shapes[node]
+        node_type, keys = self.shapes[shape]
+        values = self.records[shape][self.node_records[node]]
+
+        return {"type": node_type, "attributes": dict(zip(keys, values))}
+
+    def relation_name(self, relation_code, index):
+
+        relation = self.relations[relation_code]
+        if index:
+            return f"{relation}_{index - 1}"
+
+        return relation
+
+    def edge_value(self, position):
+
+        return (
+            self.node_name(self.edge_sources[position]),
+            self.relation_name(self.edge_relations[position], self.edge_indexes[position]),
+            self.node_name(self.edge_destinations[position]),
+        )
+
+class CompactNodes(Mapping):
+
+    def __init__(self, graph):
+
+        self.graph = graph
+
+    def __getitem__(self, node_id):
+
+        node = self.graph.lookup(node_id)
+        if node is None or self.graph.node_shapes[node] == NOT_A_NODE:
+            raise KeyError(node_id)
+
+        return self.graph.node_value(node)
+
+    def __contains__(self, node_id):
+
+        node = self.graph.lookup(node_id)
+
+        return node is not None and self.graph.node_shapes[node] != NOT_A_NODE
+
+    def __iter__(self):
+
+        for node in self.graph.node_order:
+            yield self.graph.node_name(node)
+
+    def __len__(self):
+
+        return len(self.graph.node_order)
+
+class CompactEdges(Sequence):
+
+    def __init__(self, graph):
+
+        self.graph = graph
+
+    def __getitem__(self, position):
+
+        if isinstance(position, slice):
+            return [self.graph.edge_value(idx) for idx in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+
+        return self.graph.edge_value(position)
+
+    def __iter__(self):
+
+        graph = self.graph
+        for position in range(len(graph.edge_sources)):
+            yield graph.edge_value(position)
+
+    def __len__(self):
+
+        return len(self.graph.edge_sources)
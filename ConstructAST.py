@@ -1,12 +1,18 @@
 import ast
 from collections import defaultdict
+from types import GeneratorType
+
+DEFINITION_RELATIONS = ("Has_class", "Has_def", "Has_Async_Function")
+DEFINITION_NODE_TYPES = ("Function", "AsyncFunction", "Class")
 
 class ConstructAST:
    
-    def __init__(self, nodes, edges):
+    def __init__(self, nodes, edges, module_id="Module:<top>", adjacency=None):
         self.nodes = nodes
         self.edges = edges
+        self.module_id = module_id
         self.edge_dict = defaultdict(list)
+        self.indexed_edges = defaultdict(dict)
 
         self.operation_map = {
             "Add": ast.Add,
@@ -16,15 +22,50 @@ class ConstructAST:
             "Mod": ast.Mod,
             "Pow": ast.Pow,
             "FloorDiv": ast.FloorDiv,
+            "MatMult": ast.MatMult,
+            "LShift": ast.LShift,
+            "RShift": ast.RShift,
+            "BitOr": ast.BitOr,
+            "BitXor": ast.BitXor,
+            "BitAnd": ast.BitAnd,
         }
 
-        self.convert_edges_to_dict()
+        if adjacency is None:
+            self.convert_edges_to_dict()
+        else:
+            self.edge_dict = adjacency.edge_dict
+            self.indexed_edges = adjacency.indexed_edges
+
+    @classmethod
+    def from_graph(cls, graph, module_id="Module:<top>"):
+
+        adjacency = graph.adjacency() if hasattr(graph, "adjacency") else None
+
+        return cls(graph.nodes, graph.edges, module_id, adjacency)
+
+    @staticmethod
+    def split_indexed_relation(relation):
+
+        base, separator, idx = relation.rpartition("_")
+        if not separator or not idx.isdigit():
+            return None
+
+        return base, int(idx)
 
     def convert_edges_to_dict(self):
         
         for source, relation, destination in self.edges:
             self.edge_dict[(source, relation)].append(destination)
 
+            indexed_relation = self.split_indexed_relation(relation)
+            if indexed_relation is not None:
+                base, idx = indexed_relation
+                self.indexed_edges[source].setdefault(base, []).append((idx, destination))
+
+        for relations in self.indexed_edges.values():
+            for indexed_children in relations.values():
+                indexed_children.sort(key=lambda x: x[0])
+
     def children(self, src, rel):
         
         return self.edge_dict.get((src, rel), [])
@@ -44,15 +85,11 @@ class ConstructAST:
 
     def children_by_prefix(self, source, prefix):
         
-        output = []
-        for (current_source, current_relation), current_destinations in self.edge_dict.items():
-            if current_source == source and current_relation.startswith(prefix):
-                idx = int(current_relation.split("_", 1)[1])
-                for destination in current_destinations:
-                    output.append((idx, destination))
-        output.sort(key=lambda x: x[0])
-        
-        return output
+        relations = self.indexed_edges.get(source)
+        if not relations:
+            return []
+
+        return relations.get(prefix.rstrip("_"), [])
 
     def statement_order(self, statement_id):
         
@@ -64,15 +101,7 @@ class ConstructAST:
 
     def edge_dict_extraction(self, expression_id, relation_name):
 
-        output = []
-        for (source, relation), destinations in self.edge_dict.items():
-            if source == expression_id and relation.startswith(relation_name):
-                idx = int(relation.split("_", 1)[1])
-                for destination in destinations:
-                    output.append((idx, destination))
-        output.sort(key=lambda x: x[0])
-
-        return output
+        return self.children_by_prefix(expression_id, relation_name)
 
     def literal_value_extraction(self, statement_id):
 
@@ -92,60 +121,139 @@ class ConstructAST:
         
         return ast.alias(name=name, asname=asname)
 
-    def build_target(self, expression_id):
-        
-        node = self.nodes[expression_id]
+    def node_kind(self, node_id):
+
+        node = self.nodes[node_id]
         node_type = node["type"]
         attributes = node["attributes"]
+        if node_type == "Expression" and isinstance(attributes, dict):
+            return attributes.get("type")
 
-        if node_type == "Expression" and isinstance(attributes, dict) and attributes.get("type") == "starred":
-            value_id = self.one(expression_id, "Value")
-            
-            return ast.Starred(
-                value=self.build_target(value_id),
-                ctx=ast.Store()
-            )
+        return node_type
 
-        if node_type == "Name":
-            name = attributes.get("name", attributes)
-            
-            return ast.Name(id=str(name), ctx=ast.Store())
+    def register_target_builder(self, kind, builder):
 
-        if node_type == "Expression" and isinstance(attributes, dict) and attributes.get("type") == "attribute":
-            value_id = self.one(expression_id, "Value")
-            attribute_name = attributes.get("attribute_value")
-   
-            return ast.Attribute(
-                value=self.build_expression(value_id),
-                attr=str(attribute_name),
-                ctx=ast.Store()
-            )
+        if "target_builders" not in self.__dict__:
+            self.target_builders = dict(type(self).target_builders)
+        self.target_builders[kind] = builder
 
-        if node_type == "Expression" and isinstance(attributes, dict) and attributes.get("type") == "subscript":
-            value_id = self.one(expression_id, "Value")
-            slice_id = self.one(expression_id, "Slice")
-            
-            return ast.Subscript(
-                value=self.build_expression(value_id),
-                slice=self.build_expression(slice_id),
-                ctx=ast.Store()
-            )
+    def register_expression_builder(self, kind, builder):
 
-        if node_type == "Expression" and isinstance(attributes, dict) and attributes.get("type") == "tuple":
-            elements = self.children_by_prefix(expression_id, "Element_")
-            
-            return ast.Tuple(
-                elts=[self.build_target(element) for _, element in elements],
-                ctx=ast.Store()
-            )
+        if "expression_builders" not in self.__dict__:
+            self.expression_builders = dict(type(self).expression_builders)
+        self.expression_builders[kind] = builder
 
-        if node_type == "Expression" and isinstance(attributes, dict) and attributes.get("type") == "list":
-            elements = self.children_by_prefix(expression_id, "Element_")
-            
-            return ast.List(
-                elts=[self.build_target(element) for _, element in elements],
-                ctx=ast.Store()
-            )
+    def register_statement_builder(self, kind, builder):
+
+        if "statement_builders" not in self.__dict__:
+            self.statement_builders = dict(type(self).statement_builders)
+        self.statement_builders[kind] = builder
+
+    def run(self, task):
+
+        if task.__class__ is not GeneratorType:
+            return task
+
+        pending = [task.send]
+        send = task.send
+        value = None
+        while True:
+            try:
+                request = send(value)
+            except StopIteration as stop:
+                pending.pop()
+                value = stop.value
+                if not pending:
+                    return value
+                send = pending[-1]
+                continue
+
+            if request.__class__ is GeneratorType:
+                send = request.send
+                pending.append(send)
+                value = None
+            else:
+                value = request
+
+    def build_target(self, expression_id):
+
+        return self.run(self.start_target(expression_id))
+
+    def start_target(self, expression_id):
+        
+        if expression_id is None:
+            return None
+
+        builder = self.target_builders.get(self.node_kind(expression_id))
+        if builder is None:
+            return None
+
+        return builder(self, expression_id)
+
+    def build_each(self, start, node_ids):
+
+        built = []
+        for node_id in node_ids:
+            built.append((yield start(node_id)))
+
+        return built
+
+    def build_starred_target(self, expression_id):
+
+        value_id = self.one(expression_id, "Value")
+        
+        return ast.Starred(
+            value=(yield self.start_target(value_id)),
+            ctx=ast.Store()
+        )
+
+    def build_name_target(self, expression_id):
+
+        attributes = self.nodes[expression_id]["attributes"]
+        name = attributes.get("name", attributes)
+        
+        return ast.Name(id=str(name), ctx=ast.Store())
+
+    def build_attribute_target(self, expression_id):
+
+        attributes = self.nodes[expression_id]["attributes"]
+        value_id = self.one(expression_id, "Value")
+        attribute_name = attributes.get("attribute_value")
+
+        return ast.Attribute(
+            value=(yield self.start_expression(value_id)),
+            attr=str(attribute_name),
+            ctx=ast.Store()
+        )
+
+    def build_subscript_target(self, expression_id):
+
+        value_id = self.one(expression_id, "Value")
+        slice_id = self.one(expression_id, "Slice")
+        
+        return ast.Subscript(
+            value=(yield self.start_expression(value_id)),
+            slice=(yield self.start_expression(slice_id)),
+            ctx=ast.Store()
+        )
+
+    def build_tuple_target(self, expression_id):
+
+        elements = self.children_by_prefix(expression_id, "Element_")
+        
+        return ast.Tuple(
+            elts=(yield self.build_each(self.start_target, [element for _, element in elements])),
+            ctx=ast.Store()
+        )
+
+    def build_list_target(self, expression_id):
+
+        elements = self.children_by_prefix(expression_id, "Element_")
+        
+        return ast.List(
+            elts=(yield self.build_each(self.start_target, [element for _, element in elements])),
+            ctx=ast.Store()
+        )
 
     def build_name(self, name_id):
         
@@ -154,6 +262,11 @@ class ConstructAST:
         
         return ast.Name(id=name, ctx=ast.Load())
 
+    def definition_items(self, owner_id):
+
+        return [("def", definition_id, self.def_order(definition_id))
+                for relation in DEFINITION_RELATIONS for definition_id in self.edge_dict.get((owner_id, relation), [])]
+
     def def_order(self, node_id):
    
         node = self.nodes.get(node_id, {})
@@ -211,7 +324,7 @@ class ConstructAST:
         type_id = self.one(handler_id, "Type", optional=True)
         name_id = self.one(handler_id, "Name", optional=True)
 
-        element_type = self.build_expression(type_id) if type_id is not None else None
+        element_type = (yield self.start_expression(type_id)) if type_id is not None else None
 
         name = None
         if name_id is not None:
@@ -219,363 +332,364 @@ class ConstructAST:
             name = attributes.get("literal_value", attributes)
 
         body_ids = sorted(self.many(handler_id, "Body_Statement"), key=self.statement_order)
-        body = [self.build_statement(body_id) for body_id in body_ids] or [ast.Pass()]
+        body = (yield self.build_each(self.start_body_item, body_ids)) or [ast.Pass()]
 
         return ast.ExceptHandler(type=element_type, name=name, body=body)
 
     def build_expression(self, expression_id):
+
+        return self.run(self.start_expression(expression_id))
+
+    def start_expression(self, expression_id):
         
-        node = self.nodes[expression_id]
-        node_type = node["type"]
-        attributes = node["attributes"]
+        if expression_id is None:
+            return None
 
-        if node_type == "Name":
-            return self.build_name(expression_id)
+        builder = self.expression_builders.get(self.node_kind(expression_id))
+        if builder is None:
+            return None
 
-        if node_type == "Literal":
-            value = attributes.get("literal_value", attributes)
-            
-            return ast.Constant(value=value)
+        return builder(self, expression_id)
 
-        if node_type == "Expression" and isinstance(attributes, dict):
-            element_type = attributes.get("type")
-
-            if element_type == "binary_operator":
-                operation_id = self.one(expression_id, "Operation")
-                operation_name = self.nodes[operation_id]["attributes"]["operation"]
-                operation_operator = self.operation_map.get(operation_name)
-
-                left_id = self.one(expression_id, "Left")
-                right_id = self.one(expression_id, "Right")
-                
-                return ast.BinOp(
-                    left=self.build_expression(left_id),
-                    op=operation_operator(),
-                    right=self.build_expression(right_id),
-                )
-
-            if element_type == "generator_expression":
-                element_id = self.one(expression_id, "Element")
-
-                generator_edges = self.edge_dict_extraction(self, expression_id, "Gen_")
-                generators = [self.build_expression(generator_id) for _, generator_id in generator_edges] 
-                element = self.build_expression(element_id)
-
-                return ast.GeneratorExp(elt=element, generators=generators)
-
-            if element_type == "set":
-                element_list = self.children_by_prefix(expression_id, "Element_")
-                elements = [self.build_expression(destination) for _, destination in element_list]
-                
-                return ast.Set(elts=elements)
-
-            if element_type == "named_expression":
-                target_id = self.one(expression_id, "Target")
-                value_id = self.one(expression_id, "Value")
-                target = self.build_target(target_id)
-                value = self.build_expression(value_id)
-
-                return ast.NamedExpr(target=target, value=value)
-
-            if element_type == "starred":
-                value_id = self.one(expression_id, "Value")
-                value = self.build_expression(value_id)
-                
-                return ast.Starred(value=value, ctx=ast.Load())
-
-            if element_type == "await":
-                value_id = self.one(expression_id, "Value")
-                value = self.build_expression(value_id)
-                
-                return ast.Await(value=value)
-
-            if element_type == "yield":
-                value_id = self.one(expression_id, "Value", optional=True)
-                value = self.build_expression(value_id)
-                
-                return ast.Yield(value=value)
-
-            if element_type == "yieldfrom":
-                value_id = self.one(expression_id, "Value")
-                
-                return ast.YieldFrom(
-                    value=self.build_expression(value_id)
-                )
-
-            if element_type == "lambda":
-                
-                parameters = self.edge_dict_extraction(expression_id, "Parameter_")
-                arg_nodes = []
-                parameter_id_to_default = {}
-
-                for _, parameter_id in parameters:
-                    parameter = self.nodes[parameter_id]["attributes"]
-                    name = str(parameter.get("name", parameter))
-                    arg_nodes.append(ast.arg(arg=name))
-                    parameter_id_to_default[parameter_id] = self.one(parameter_id, "Default", optional=True)
-
-                default_ids = [parameter_id_to_default[parameter_id] for _, parameter_id in parameters]
-                number_of_defaults = sum(1 for default in default_ids if default is not None)
-                tail = default_ids[-number_of_defaults:] if number_of_defaults else []
-                defaults = [self.build_expression(default) for default in tail] if number_of_defaults else []
-
-                args = ast.arguments(
-                    posonlyargs=[],
-                    args=arg_nodes,
-                    variable_arg=None,
-                    kwonlyargs=[],
-                    keyword_defaults=[],
-                    keyword_arg=None,
-                    defaults=defaults,
-                )
-
-                body_id = self.one(expression_id, "Body")
-                
-                return ast.Lambda(args=args, body=self.build_expression(body_id))
-
-            if element_type == "setcomp":
-                element_id = self.one(expression_id, "Element")
-                generator_edges = self.edge_dict_extraction(self, expression_id, "Gen_")
-                generators = [self.build_expression(generator_id) for _, generator_id in generator_edges]
-                element = self.build_expression(element_id)
-
-                return ast.SetComp(
-                    elt=element,
-                    generators=generators
-                )
-
-            if element_type == "dictcomp":
-                key_id = self.one(expression_id, "Key")
-                value_id = self.one(expression_id, "Value")
-                generator_edges = self.edge_dict_extraction(self, expression_id, "Gen_")
-                generators = [self.build_expression(generator_id) for _, generator_id in generator_edges]
-                key = self.build_expression(key_id)
-                value = self.build_expression(value_id)
-
-                return ast.DictComp(
-                    key=key,
-                    value=value,
-                    generators=generators
-                )
-
-            if element_type == "slice":
-                lower_id = self.one(expression_id, "Lower", optional=True)
-                upper_id = self.one(expression_id, "Upper", optional=True)
-                step_id = self.one(expression_id, "Step", optional=True)
-                lower = self.build_expression(low_id)
-                upper = self.build_expression(up_id)
-                step = self.build_expression(step_id)
-
-                return ast.Slice(lower=lower, upper=upper, step=step)
-
-            if element_type == "attribute":
-                value_id = self.one(expression_id, "Value")
-                attribute_name = str(attributes.get("attribute_value", None))
-                value = self.build_expression(value_id)
-
-                return ast.Attribute(value=value, attr=attribute_name, ctx=ast.Load())
-
-            if element_type == "call":
-                function_id = self.one(expression_id, "Function_call")
-                arg_edges = self.children_by_prefix(expression_id, "Arg_")
-                args = [self.build_expression(destination) for _, destination in arg_edges]
-                keywords = []
-                key_edges = self.children_by_prefix(expression_id, "KeywordKey_")
-                value_edges = self.children_by_prefix(expression_id, "KeywordValue_")
-
-                for (key_idx, key_id), (value_idx, value_id) in zip(key_edges, value_edges):
-                    keyword_name = str(self.nodes[key_id]["attributes"]["literal_value"])
-                    value = self.build_expression(value_id)
-                    keywords.append(ast.keyword(arg=keyword_name, value=value))
-
-                starred_edges = self.children_by_prefix(expression_id, "KeywordStar_")
-                for _, value_id in starred_edges:
-                    starred_value = self.build_expression(value_id)
-                    keywords.append(ast.keyword(arg=None, value=starred_value))
-                
-                function = self.build_expression(function_id)
-                
-                return ast.Call(func=function, args=args, keywords=keywords)
-
-            if element_type == "subscript":
-                value_id = self.one(expression_id, "Value")
-                slice_id = self.one(expression_id, "Slice")
-                value = self.build_expression(value_id)
-                slice_ = self.build_expression(slice_id)
-                
-                return ast.Subscript(value=value, slice=slice_, ctx=ast.Load())
-
-            if element_type == "tuple":
-                element_list = self.children_by_prefix(expression_id, "Element_")
-                elements = [self.build_expression(destination) for _, destination in element_list]
-                
-                return ast.Tuple(elts=elements, ctx=ast.Load())
-
-            if element_type == "list":
-                element_list = self.children_by_prefix(expression_id, "Element_")
-                elements = [self.build_expression(destination) for _, destination in element_list]
-                
-                return ast.List(elts=elements, ctx=ast.Load())
-
-            if element_type == "dict":
-                pairs = []
-                for (source, relation), destinations in self.edge_dict.items():
-                    if source == expression_id and (relation.startswith("Key_") or relation.startswith("Value_")):
-                        tag, idx = relation.split("_", 1)
-                        idx = int(idx)
-                        for destination in destinations:
-                            pairs.append((idx, tag, destination))
-
-                grouped = defaultdict(dict)
-                for idx, tag, destination in pairs:
-                    grouped[idx][tag] = destination
-
-                keys = []
-                values = []
-                for idx in sorted(grouped):
-                    key_id = grouped[idx].get("Key")
-                    value_id = grouped[idx].get("Value")
-                    keys.append(self.build_expression(key_id))
-                    values.append(self.build_expression(value_id))
-
-                return ast.Dict(keys=keys, values=values)
-
-            if element_type == "joinedstr":
-                destinations = self.edge_dict_extraction(expression_id, "Value_")
-                values = [self.build_expression(destination) for _, destination in destinations]
-
-                return ast.JoinedStr(values=values)
-
-            if element_type == "formatted_value":
-                value_id = self.one(expression_id, "Value")
-                format_id = self.one(expression_id, "FormatSpecification", optional=True)
-                value = self.build_expression(value_id)
-                format_specification = self.build_expression(format_id) if format_id is not None else None
-
-                return ast.FormattedValue(value=value, conversion=-1, format_spec=format_specification)
-
-            if element_type == "if_expression":
-                condition_id = self.one(expression_id, "Condition")
-                condition = self.build_expression(condition_id)
-                body_id = self.one(expression_id, "Body")
-                body = self.build_expression(body_id)
-                or_else_id = self.one(expression_id, "OrElse")
-                or_else = self.build_expression(or_else_id)
-
-                return ast.IfExp(test=condition, body=body, orelse=or_else)
-
-            if element_type == "boolop":
-                operation_id = self.one(expression_id, "Operation")
-                operation_name = self.nodes[operation_id]["attributes"]["operation"]
-                operation_operator = {"And": ast.And, "Or": ast.Or}.get(operation_name)
-                destinations = self.edge_dict_extraction(expression_id, "Value_")
-                values = [self.build_expression(destination) for _, destination in destinations]
-
-                return ast.BoolOp(op=operation_operator(), values=values)
-
-            if element_type == "listcomp":
-                element_id = self.one(expression_id, "Element")
-                element = self.build_expression(element_id)
-                generator_edges = self.edge_dict_extraction(expression_id, "Gen_")
-                generators = [self.build_expression(generator_id) for _, generator_id in generator_edges]
-
-                return ast.ListComp(element=element, generators=generators)
-
-            if element_type == "comprehension":
-                target_id = self.one(expression_id, "Target")
-                iterator_id = self.one(expression_id, "Iterator")
-                if_edges = self.edge_dict_extraction(expression_id, "If_")
-
-                is_async_id = self.one(expression_id, "IsAsync", optional=True)
-                is_async_val = 0
-                if is_async_id is not None:
-                    literal_id = self.nodes[is_async_id]["attributes"]
-                    is_async_val = 1 if (isinstance(literal_id, dict) and literal_id.get("literal_value")) else 0
-
-                target = self.build_target(target_id)
-                iterator = self.build_expression(iterator_id)
-                ifs = [self.build_expression(destination) for _, destination in if_edges]
-
-                return ast.comprehension(target=target, iter=iterator, ifs=ifs, is_async=is_async_val)
-
-            if element_type == "unaryop":
-                operation_id = self.one(expression_id, "Operation")
-                operation_name = self.nodes[operation_id]["attributes"]["operation"]
-                operation_operator = {
-                    "Not": ast.Not,
-                    "USub": ast.USub,
-                    "UAdd": ast.UAdd,
-                    "Invert": ast.Invert,
-                }.get(operation_name)
-                operandefault_id = self.one(expression_id, "Operand")
-                operand = self.build_expression(operandefault_id)
-
-                return ast.UnaryOp(op=operation_operator(), operand=operand)
-
-            if element_type == "lambda":
- 
-                parameters = self.edge_dict_extraction(expression_id, "Parameter_")
-                args = [ast.arg(arg=str(self.nodes[parameter_id]["attributes"]["name"])) for _, parameter_id in parameters]
-                
-                args = ast.arguments(posonlyargs=[], args=args, variable_arg=None, kwonlyargs=[], keyword_defaults=[], keyword_arg=None, defaults=[])
-                body_id = self.one(expression_id, "Body")
-                body = self.build_expression(body_id)
-
-                return ast.Lambda(args=args, body=body)
-
-            if element_type == "compare":
-                left_id = self.one(expression_id, "Left")
-                left = self.build_expression(left_id)
-
-                operators = []
-                comparators = []
-
-                operator_pairs = []
-                comparator_pairs = []
-
-                for (source, relation), destinations in self.edge_dict.items():
-                    if source == expression_id:
-                        if relation.startswith("Op_"):
-                            idx = int(relation.split("_", 1)[1])
-                            for destination in destinations:
-                                operator_pairs.append((idx, destination))
-                        elif relation.startswith("Comparator_"):
-                            idx = int(relation.split("_", 1)[1])
-                            for destination in destinations:
-                                comparator_pairs.append((idx, destination))
-
-                operator_pairs.sort(key=lambda x: x[0])
-                comparator_pairs.sort(key=lambda x: x[0])
-
-                operator_map = {
-                    "Eq": ast.Eq,
-                    "NotEq": ast.NotEq,
-                    "Lt": ast.Lt,
-                    "LtE": ast.LtE,
-                    "Gt": ast.Gt,
-                    "GtE": ast.GtE,
-                    "Is": ast.Is,
-                    "IsNot": ast.IsNot,
-                    "In": ast.In,
-                    "NotIn": ast.NotIn,
-                }
-
-                for (_, operation_id), (_, comparator_id) in zip(operator_pairs, comparator_pairs):
-                    operation_name = self.nodes[operation_id]["attributes"]["operation"]
-                    operation_operator = operator_map.get(operation_name)
-                    operators.append(operation_operator())
-                    comparators.append(self.build_expression(comparator_id))
-
-                return ast.Compare(left=left, ops=operators, comparators=comparators)
+    def build_literal(self, expression_id):
 
-        return None
+        attributes = self.nodes[expression_id]["attributes"]
+        value = attributes.get("literal_value", attributes)
+        
+        return ast.Constant(value=value)
+
+    def operation_name(self, node_id):
+
+        operation_name = self.nodes[node_id]["attributes"].get("operation")
+        if operation_name is None:
+            operation_id = self.one(node_id, "Operation")
+            operation_name = self.nodes[operation_id]["attributes"]["operation"]
+
+        return operation_name
+
+    def build_binary_operator(self, expression_id):
+
+        operation_name = self.operation_name(expression_id)
+        operation_operator = self.operation_map.get(operation_name)
+
+        left_id = self.one(expression_id, "Left")
+        right_id = self.one(expression_id, "Right")
+        
+        return ast.BinOp(
+            left=(yield self.start_expression(left_id)),
+            op=operation_operator(),
+            right=(yield self.start_expression(right_id)),
+        )
+
+    def build_generator_expression(self, expression_id):
+
+        element_id = self.one(expression_id, "Element")
+
+        generator_edges = self.edge_dict_extraction(expression_id, "Gen_")
+        generators = (yield self.build_each(self.start_expression, [generator_id for _, generator_id in generator_edges]))
+        element = (yield self.start_expression(element_id))
+
+        return ast.GeneratorExp(elt=element, generators=generators)
+
+    def build_set(self, expression_id):
+
+        element_list = self.children_by_prefix(expression_id, "Element_")
+        elements = (yield self.build_each(self.start_expression, [destination for _, destination in element_list]))
+        
+        return ast.Set(elts=elements)
+
+    def build_named_expression(self, expression_id):
+
+        target_id = self.one(expression_id, "Target")
+        value_id = self.one(expression_id, "Value")
+        target = (yield self.start_target(target_id))
+        value = (yield self.start_expression(value_id))
+
+        return ast.NamedExpr(target=target, value=value)
+
+    def build_starred(self, expression_id):
+
+        value_id = self.one(expression_id, "Value")
+        value = (yield self.start_expression(value_id))
+        
+        return ast.Starred(value=value, ctx=ast.Load())
+
+    def build_await(self, expression_id):
+
+        value_id = self.one(expression_id, "Value")
+        value = (yield self.start_expression(value_id))
+        
+        return ast.Await(value=value)
+
+    def build_yield(self, expression_id):
+
+        value_id = self.one(expression_id, "Value", optional=True)
+        value = (yield self.start_expression(value_id))
+        
+        return ast.Yield(value=value)
+
+    def build_yield_from(self, expression_id):
+
+        value_id = self.one(expression_id, "Value")
+        
+        return ast.YieldFrom(
+            value=(yield self.start_expression(value_id))
+        )
+
+    def build_lambda(self, expression_id):
+
+        args = (yield self.build_arguments(expression_id))
+        body_id = self.one(expression_id, "Body")
+        
+        return ast.Lambda(args=args, body=(yield self.start_expression(body_id)))
+
+    def build_setcomp(self, expression_id):
+
+        element_id = self.one(expression_id, "Element")
+        generator_edges = self.edge_dict_extraction(expression_id, "Gen_")
+        generators = (yield self.build_each(self.start_expression, [generator_id for _, generator_id in generator_edges]))
+        element = (yield self.start_expression(element_id))
+
+        return ast.SetComp(
+            elt=element,
+            generators=generators
+        )
+
+    def build_dictcomp(self, expression_id):
+
+        key_id = self.one(expression_id, "Key")
+        value_id = self.one(expression_id, "Value")
+        generator_edges = self.edge_dict_extraction(expression_id, "Gen_")
+        generators = (yield self.build_each(self.start_expression, [generator_id for _, generator_id in generator_edges]))
+        key = (yield self.start_expression(key_id))
+        value = (yield self.start_expression(value_id))
+
+        return ast.DictComp(
+            key=key,
+            value=value,
+            generators=generators
+        )
+
+    def build_slice(self, expression_id):
+
+        lower_id = self.one(expression_id, "Lower", optional=True)
+        upper_id = self.one(expression_id, "Upper", optional=True)
+        step_id = self.one(expression_id, "Step", optional=True)
+        lower = (yield self.start_expression(lower_id))
+        upper = (yield self.start_expression(upper_id))
+        step = (yield self.start_expression(step_id))
+
+        return ast.Slice(lower=lower, upper=upper, step=step)
+
+    def build_attribute(self, expression_id):
+
+        attributes = self.nodes[expression_id]["attributes"]
+        value_id = self.one(expression_id, "Value")
+        attribute_name = str(attributes.get("attribute_value", None))
+        value = (yield self.start_expression(value_id))
+
+        return ast.Attribute(value=value, attr=attribute_name, ctx=ast.Load())
+
+    def build_call(self, expression_id):
+
+        function_id = self.one(expression_id, "Function_call")
+        arg_edges = self.children_by_prefix(expression_id, "Arg_")
+        args = (yield self.build_each(self.start_expression, [destination for _, destination in arg_edges]))
+        keywords = (yield self.build_keywords(expression_id))
+        function = (yield self.start_expression(function_id))
+        
+        return ast.Call(func=function, args=args, keywords=keywords)
+
+    def keyword_items(self, owner_id):
+
+        key_edges = self.children_by_prefix(owner_id, "KeywordKey_")
+        value_edges = self.children_by_prefix(owner_id, "KeywordValue_")
+        items = [(idx, str(self.nodes[key_id]["attributes"]["literal_value"]), value_id)
+                 for (idx, key_id), (_, value_id) in zip(key_edges, value_edges)]
+        items.extend((idx, None, value_id) for idx, value_id in self.children_by_prefix(owner_id, "KeywordStar_"))
+        items.sort(key=lambda x: x[0])
+
+        return [(name, value_id) for _, name, value_id in items]
+
+    def build_keywords(self, owner_id):
+
+        keywords = []
+        for name, value_id in self.keyword_items(owner_id):
+            value = (yield self.start_expression(value_id))
+            keywords.append(ast.keyword(arg=name, value=value))
+
+        return keywords
+
+    def build_subscript(self, expression_id):
+
+        value_id = self.one(expression_id, "Value")
+        slice_id = self.one(expression_id, "Slice")
+        value = (yield self.start_expression(value_id))
+        slice_ = (yield self.start_expression(slice_id))
+        
+        return ast.Subscript(value=value, slice=slice_, ctx=ast.Load())
+
+    def build_tuple(self, expression_id):
+
+        element_list = self.children_by_prefix(expression_id, "Element_")
+        elements = (yield self.build_each(self.start_expression, [destination for _, destination in element_list]))
+        
+        return ast.Tuple(elts=elements, ctx=ast.Load())
+
+    def build_list(self, expression_id):
+
+        element_list = self.children_by_prefix(expression_id, "Element_")
+        elements = (yield self.build_each(self.start_expression, [destination for _, destination in element_list]))
+        
+        return ast.List(elts=elements, ctx=ast.Load())
+
+    def build_dict(self, expression_id):
+
+        grouped = defaultdict(dict)
+        for tag in ("Key", "Value"):
+            for idx, destination in self.children_by_prefix(expression_id, tag):
+                grouped[idx][tag] = destination
+
+        keys = []
+        values = []
+        for idx in sorted(grouped):
+            key_id = grouped[idx].get("Key")
+            value_id = grouped[idx].get("Value")
+            keys.append((yield self.start_expression(key_id)))
+            values.append((yield self.start_expression(value_id)))
+
+        return ast.Dict(keys=keys, values=values)
+
+    def build_joinedstr(self, expression_id):
+
+        destinations = self.edge_dict_extraction(expression_id, "Value_")
+        values = (yield self.build_each(self.start_expression, [destination for _, destination in destinations]))
+
+        return ast.JoinedStr(values=values)
+
+    def build_formatted_value(self, expression_id):
+
+        value_id = self.one(expression_id, "Value")
+        format_id = self.one(expression_id, "FormatSpecification", optional=True)
+        value = (yield self.start_expression(value_id))
+        format_specification = (yield self.start_expression(format_id)) if format_id is not None else None
+
+        conversion = self.nodes[expression_id]["attributes"].get("conversion", -1)
+
+        return ast.FormattedValue(value=value, conversion=conversion, format_spec=format_specification)
+
+    def build_if_expression(self, expression_id):
+
+        condition_id = self.one(expression_id, "Condition")
+        condition = (yield self.start_expression(condition_id))
+        body_id = self.one(expression_id, "Body")
+        body = (yield self.start_expression(body_id))
+        or_else_id = self.one(expression_id, "OrElse")
+        or_else = (yield self.start_expression(or_else_id))
+
+        return ast.IfExp(test=condition, body=body, orelse=or_else)
+
+    def build_boolop(self, expression_id):
+
+        operation_name = self.operation_name(expression_id)
+        operation_operator = {"And": ast.And, "Or": ast.Or}.get(operation_name)
+        destinations = self.edge_dict_extraction(expression_id, "Value_")
+        values = (yield self.build_each(self.start_expression, [destination for _, destination in destinations]))
+
+        return ast.BoolOp(op=operation_operator(), values=values)
+
+    def build_listcomp(self, expression_id):
+
+        element_id = self.one(expression_id, "Element")
+        element = (yield self.start_expression(element_id))
+        generator_edges = self.edge_dict_extraction(expression_id, "Gen_")
+        generators = (yield self.build_each(self.start_expression, [generator_id for _, generator_id in generator_edges]))
+
+        return ast.ListComp(elt=element, generators=generators)
+
+    def build_comprehension(self, expression_id):
+
+        target_id = self.one(expression_id, "Target")
+        iterator_id = self.one(expression_id, "Iterator", optional=True)
+        if iterator_id is None:
+            iterator_id = self.one(expression_id, "Iter")
+        if_edges = self.edge_dict_extraction(expression_id, "If_")
+
+        is_async_val = self.comprehension_is_async(expression_id)
+
+        target = (yield self.start_target(target_id))
+        iterator = (yield self.start_expression(iterator_id))
+        ifs = (yield self.build_each(self.start_expression, [destination for _, destination in if_edges]))
+
+        return ast.comprehension(target=target, iter=iterator, ifs=ifs, is_async=is_async_val)
+
+    def comprehension_is_async(self, expression_id):
+
+        folded_async = self.nodes[expression_id]["attributes"].get("is_async")
+        if folded_async is not None:
+            return 1 if folded_async else 0
+
+        is_async_id = self.one(expression_id, "IsAsync", optional=True)
+        if is_async_id is not None:
+            literal_id = self.nodes[is_async_id]["attributes"]
+            return 1 if (isinstance(literal_id, dict) and literal_id.get("literal_value")) else 0
+
+        return 0
+
+    def build_unaryop(self, expression_id):
+
+        operation_name = self.operation_name(expression_id)
+        operation_operator = {
+            "Not": ast.Not,
+            "USub": ast.USub,
+            "UAdd": ast.UAdd,
+            "Invert": ast.Invert,
+        }.get(operation_name)
+        operand_id = self.one(expression_id, "Operand")
+        operand = (yield self.start_expression(operand_id))
+
+        return ast.UnaryOp(op=operation_operator(), operand=operand)
+
+    def build_compare(self, expression_id):
+
+        left_id = self.one(expression_id, "Left")
+        left = (yield self.start_expression(left_id))
+
+        operators = []
+        comparators = []
+
+        operation_names = self.nodes[expression_id]["attributes"].get("operations")
+        if operation_names is None:
+            operation_names = [self.nodes[operation_id]["attributes"]["operation"]
+                               for _, operation_id in self.children_by_prefix(expression_id, "Op_")]
+        comparator_pairs = self.children_by_prefix(expression_id, "Comparator_")
+
+        operator_map = {
+            "Eq": ast.Eq,
+            "NotEq": ast.NotEq,
+            "Lt": ast.Lt,
+            "LtE": ast.LtE,
+            "Gt": ast.Gt,
+            "GtE": ast.GtE,
+            "Is": ast.Is,
+            "IsNot": ast.IsNot,
+            "In": ast.In,
+            "NotIn": ast.NotIn,
+        }
+
+        for operation_name, (_, comparator_id) in zip(operation_names, comparator_pairs):
+            operation_operator = operator_map.get(operation_name)
+            operators.append(operation_operator())
+            comparators.append((yield self.start_expression(comparator_id)))
+
+        return ast.Compare(left=left, ops=operators, comparators=comparators)
 
     def build_withitem(self, item_id):
         
         context_id = self.one(item_id, "Context")
-        context_expression = self.build_expression(ctx_id)
+        context_expression = (yield self.start_expression(context_id))
         target_id = self.one(item_id, "Target", optional=True)
-        target = self.build_target(target_id)
+        target = (yield self.start_target(target_id))
 
         return ast.withitem(context_expr=context_expression, optional_vars=target)
 
@@ -585,7 +699,7 @@ class ConstructAST:
         parameter = self.nodes[parameter_id]["attributes"]
         name = str(parameter.get("name", parameter))
         annotation_id = self.one(parameter_id, "Annotation", optional=True)
-        annotation = self.build_expression(annotation_id) if annotation_id else None
+        annotation = (yield self.start_expression(annotation_id)) if annotation_id else None
         
         return ast.arg(arg=name, annotation=annotation)
 
@@ -594,11 +708,15 @@ class ConstructAST:
         function_type = self.nodes[function_id]["type"]
         if function_type == "AsyncFunction":
             
-            return self.build_functionlike(function_id, is_async=True)
+            return (yield self.build_functionlike(function_id, is_async=True))
         
-        return self.build_functionlike(function_id, is_async=False)
+        return (yield self.build_functionlike(function_id, is_async=False))
 
     def build_statement(self, statement_id):
+
+        return self.run(self.start_statement(statement_id))
+
+    def start_statement(self, statement_id):
         
         statement_node = self.nodes[statement_id]
         statement_type = statement_node["type"]
@@ -608,204 +726,244 @@ class ConstructAST:
             
             return ast.Pass()
 
-        kind = attributes.get("kind")
-
-        if kind == "Pass":
+        builder = self.statement_builders.get(attributes.get("kind"))
+        if builder is None:
             
             return ast.Pass()
 
-        if kind == "Delete":
-            target_edges = self.children_by_prefix(statement_id, "Target_")
-            targets = []
-            for _, target_id in target_edges:
-                target = self.build_expression(target_id)
-                targets.append(self.to_del_target(target))
-            
-            return ast.Delete(targets=targets)
+        return builder(self, statement_id)
 
-        if kind == "Global":
-            names = self.literal_value_extraction(statement_id)
-            
-            return ast.Global(names=names)
+    def start_body_item(self, node_id):
 
-        if kind == "Nonlocal":
-            names = self.literal_value_extraction(statement_id)
-            
-            return ast.Nonlocal(names=names)
-
-        if kind == "While":
-            condition_id = self.one(statement_id, "Condition")
-            body_ids = sorted(self.many(statement_id, "Body_Statement"), key=self.statement_order)
-            or_else_ids = sorted(self.many(statement_id, "OrElse_statement"), key=self.statement_order)
-
-            condition = self.build_expression(test_id)
-            body = [self.build_statement(body_id) for body_id in body_ids] or [ast.Pass()]
-            or_else = [self.build_statement(or_else_id) for or_else_id in or_else_ids]
-
-            return ast.While(test=condition, body=body, orelse=or_else)
-
-        if kind == "With":
-            item_edges = self.children_by_prefix(statement_id, "Item_")
-            items = [self.build_withitem(item_id) for _, item_id in item_edges]
-            body_ids = sorted(self.many(statement_id, "Body_Statement"), key=self.statement_order)
-            body = [self.build_statement(body_id) for body_id in body_ids] or [ast.Pass()]
-
-            return ast.With(items=items, body=body)
-
-        if kind == "Assert":
-            condition_id = self.one(statement_id, "Condition")
-            condition = self.build_expression(condition_id)
-            message_id = self.one(statement_id, "Message", optional=True)
-            message = self.build_expression(message_id)
-
-            return ast.Assert(test=condition, msg=message)
-
-        if kind == "Try":
-            body_ids = sorted(self.many(statement_id, "Body_Statement"), key=self.statement_order)
-            or_else_ids = sorted(self.many(statement_id, "OrElse_Statement"), key=self.statement_order)
-            final_body_ids = sorted(self.many(statement_id, "FinalBody_Statement"), key=self.statement_order)
-            handler_edges = self.children_by_prefix(statement_id, "Handler_")
-            handlers = [self.build_excepthandler(handler_id) for _, handler_id in handler_edges]
-            body = [self.build_statement(body_id) for body_id in body_ids] or [ast.Pass()]
-            or_else = [self.build_statement(or_else_id) for or_else_id in or_else_ids]
-            final_body = [self.build_statement(final_body_id) for final_body_id in final_body_ids]
-
-            return ast.Try(body=body, handlers=handlers, orelse=or_else, finalbody=final_body)
-
-        if kind == "Raise":
-            exception_id = self.one(statement_id, "Exception", optional=True)
-            exception = self.build_expression(exception_id)
-            cause_id = self.one(statement_id, "Cause", optional=True)
-            cause = self.build_expression(cause_id)
-
-            return ast.Raise(exc=exception, cause=cause)
-
-        if kind == "Import":
-            alias_edges = self.children_by_prefix(statement_id, "Alias_")
-            names = [self.build_alias(alias_edge) for _, alias_edge in alias_edges]
-            
-            return ast.Import(names=names)
+        node_type = self.nodes[node_id]["type"]
+        if node_type in ("Function", "AsyncFunction"):
+            return self.build_any_function(node_id)
+        if node_type == "Class":
+            return self.build_class(node_id)
 
-        if kind == "ImportFrom":
-            module_id = self.one(statement_id, "Module", optional=True)
-            level_id = self.one(statement_id, "Level", optional=True)
+        return self.start_statement(node_id)
 
-            module = None
-            if module_id:
-                attributes = self.nodes[module_id]["attributes"]
-                module = str(attributes.get("literal_value", attributes))
+    def build_body(self, statement_id, relation, placeholder=False):
 
-            level = 0
-            if level_id:
-                attributes = self.nodes[level_id]["attributes"]
-                level = int(attributes.get("literal_value", attributes))
+        statement_ids = sorted(self.many(statement_id, relation), key=self.statement_order)
+        body = (yield self.build_each(self.start_body_item, statement_ids))
+        if placeholder and not body:
+            return [ast.Pass()]
 
-            alias_edges = self.children_by_prefix(statement_id, "Alias_")
-            names = [self.build_alias(alias_edge) for _, alias_edge in alias_edges]
-            
-            return ast.ImportFrom(module=module, names=names, level=level)
-
-        if kind == "AugAssign":
-            target_ids = self.children(statement_id, "Target")
-            target = self.build_target(target_ids[0])
-            value_ids = self.children(statement_id, "Value")
-            value = self.build_expression(value_ids[0])
-            operation_id = self.one(statement_id, "Operation")
-            operation_name = self.nodes[operation_id]["attributes"]["operation"]
-            operation_operator = self.operation_map.get(operation_name)
+        return body
 
-            return ast.AugAssign(target=target, op=operation_operator(), value=value)
+    def build_pass_statement(self, statement_id):
 
-        if kind == "AnnAssign":
-            target_id = self.one(statement_id, "Target")
-            target = self.build_target(target_id)
-            annotation_id = self.one(statement_id, "Annotation")
-            annotation = self.build_expression(annotation_id)
-            value_id = self.one(statement_id, "Value", optional=True)
-            value = self.build_expression(val_id)
-            simple_id = self.one(statement_id, "Simple", optional=True)
+        return ast.Pass()
 
-            simple = 1
-            if simple_id:
-                attributes = self.nodes[simple_id]["attributes"]
-                simple = int(attributes.get("literal_value", 1))
+    def build_delete_statement(self, statement_id):
 
-            return ast.AnnAssign(target=target, annotation=annotation, value=value, simple=simple)
+        target_edges = self.children_by_prefix(statement_id, "Target_")
+        targets = []
+        for _, target_id in target_edges:
+            target = (yield self.start_expression(target_id))
+            targets.append(self.to_del_target(target))
+        
+        return ast.Delete(targets=targets)
 
-        if kind == "Break":
-            
-            return ast.Break()
+    def build_global_statement(self, statement_id):
 
-        if kind == "Continue":
-            
-            return ast.Continue()
-
-        if kind == "For":
-            target_id = self.one(statement_id, "Target")
-            target = self.build_target(target_id)
-            iterator_id = self.one(statement_id, "Iterator")
-            iterator = self.build_expression(iterator_id)
-            body_ids = sorted(self.many(statement_id, "Body_Statement"), key=self.statement_order)
-            body = [self.build_statement(body_id) for body_id in body_ids] or [ast.Pass()]
-            or_else_ids = sorted(self.many(statement_id, "OrElse_Statement"), key=self.statement_order)
-            or_else = [self.build_statement(or_else_id) for or_else_id in or_else_ids]
-
-            return ast.For(target=target, iter=iterator, body=body, orelse=or_else, type_comment=None)
-
-        if kind == "AsyncFor":
-            target_id = self.one(statement_id, "Target")
-            target = self.build_target(target_id)
-            iterator_id = self.one(statement_id, "Iterator")
-            iterator = self.build_expression(iterator_id)
-            body_ids = sorted(self.many(statement_id, "Body_statement"), key=self.statement_order)
-            body = [self.build_statement(body_id) for body_id in body_ids] or [ast.Pass()]
-            or_else_ids = sorted(self.many(statement_id, "Orelse_statement"), key=self.statement_order)
-            or_else = [self.build_statement(or_else_id) for or_else_id in or_else_ids]
-
-            return ast.AsyncFor(target=target, iter=iterator, body=body, orelse=or_else, type_comment=None)
-
-        if kind == "Return":
-            expression_ids = self.children(statement_id, "Computes")
-            if len(expression_ids) == 0:
-                
-                return ast.Return(value=None)
-            expression_value = self.build_expression(expression_ids[0])
-            
-            return ast.Return(value=expression_value)
+        names = self.literal_value_extraction(statement_id)
+        
+        return ast.Global(names=names)
 
-        if kind == "Assign":
-            target_ids = self.children(statement_id, "Target")
-            targets = [self.build_target(target_id) for target_id in target_ids]
-            value_ids = self.children(statement_id, "Value")
-            value = self.build_expression(value_ids[0])
-            
-            return ast.Assign(targets=targets, value=value)
+    def build_nonlocal_statement(self, statement_id):
+
+        names = self.literal_value_extraction(statement_id)
+        
+        return ast.Nonlocal(names=names)
+
+    def build_while_statement(self, statement_id):
+
+        condition_id = self.one(statement_id, "Condition")
+        condition = (yield self.start_expression(condition_id))
+        body = (yield self.build_body(statement_id, "Body_Statement", placeholder=True))
+        or_else = (yield self.build_body(statement_id, "OrElse_Statement"))
+
+        return ast.While(test=condition, body=body, orelse=or_else)
+
+    def build_with_statement(self, statement_id):
+
+        item_edges = self.children_by_prefix(statement_id, "Item_")
+        items = (yield self.build_each(self.build_withitem, [item_id for _, item_id in item_edges]))
+        body = (yield self.build_body(statement_id, "Body_Statement", placeholder=True))
+
+        return ast.With(items=items, body=body)
+
+    def build_asyncwith_statement(self, statement_id):
+
+        item_edges = self.children_by_prefix(statement_id, "Item_")
+        items = (yield self.build_each(self.build_withitem, [item_id for _, item_id in item_edges]))
+        body = (yield self.build_body(statement_id, "Body_Statement", placeholder=True))
+
+        return ast.AsyncWith(items=items, body=body)
+
+    def build_assert_statement(self, statement_id):
+
+        condition_id = self.one(statement_id, "Condition")
+        condition = (yield self.start_expression(condition_id))
+        message_id = self.one(statement_id, "Message", optional=True)
+        message = (yield self.start_expression(message_id))
+
+        return ast.Assert(test=condition, msg=message)
 
-        if kind == "ExpressionStatement":
-            value_ids = self.children(statement_id, "Value")
-            if not value_ids:
-                return ast.Expr(value=ast.Constant(value=None))
-            value = self.build_expression(value_ids[0])
+    def build_try_statement(self, statement_id):
+
+        handler_edges = self.children_by_prefix(statement_id, "Handler_")
+        handlers = (yield self.build_each(self.build_excepthandler, [handler_id for _, handler_id in handler_edges]))
+        body = (yield self.build_body(statement_id, "Body_Statement", placeholder=True))
+        or_else = (yield self.build_body(statement_id, "OrElse_Statement"))
+        final_body = (yield self.build_body(statement_id, "FinalBody_Statement"))
+
+        return ast.Try(body=body, handlers=handlers, orelse=or_else, finalbody=final_body)
+
+    def build_raise_statement(self, statement_id):
+
+        exception_id = self.one(statement_id, "Exception", optional=True)
+        exception = (yield self.start_expression(exception_id))
+        cause_id = self.one(statement_id, "Cause", optional=True)
+        cause = (yield self.start_expression(cause_id))
+
+        return ast.Raise(exc=exception, cause=cause)
+
+    def build_import_statement(self, statement_id):
+
+        alias_edges = self.children_by_prefix(statement_id, "Alias_")
+        names = [self.build_alias(alias_edge) for _, alias_edge in alias_edges]
+        
+        return ast.Import(names=names)
+
+    def build_importfrom_statement(self, statement_id):
+
+        module_id = self.one(statement_id, "Module", optional=True)
+        level_id = self.one(statement_id, "Level", optional=True)
+
+        module = None
+        if module_id:
+            attributes = self.nodes[module_id]["attributes"]
+            module = attributes.get("literal_value", attributes)
+            module = str(module) if module is not None else None
+
+        level = 0
+        if level_id:
+            attributes = self.nodes[level_id]["attributes"]
+            level = int(attributes.get("literal_value", attributes))
+
+        alias_edges = self.children_by_prefix(statement_id, "Alias_")
+        names = [self.build_alias(alias_edge) for _, alias_edge in alias_edges]
+        
+        return ast.ImportFrom(module=module, names=names, level=level)
+
+    def build_augassign_statement(self, statement_id):
+
+        target_ids = self.children(statement_id, "Target")
+        target = (yield self.start_target(target_ids[0]))
+        value_ids = self.children(statement_id, "Value")
+        value = (yield self.start_expression(value_ids[0]))
+        operation_name = self.operation_name(statement_id)
+        operation_operator = self.operation_map.get(operation_name)
+
+        return ast.AugAssign(target=target, op=operation_operator(), value=value)
+
+    def build_annassign_statement(self, statement_id):
+
+        target_id = self.one(statement_id, "Target")
+        target = (yield self.start_target(target_id))
+        annotation_id = self.one(statement_id, "Annotation")
+        annotation = (yield self.start_expression(annotation_id))
+        value_id = self.one(statement_id, "Value", optional=True)
+        value = (yield self.start_expression(value_id))
+        simple_id = self.one(statement_id, "Simple", optional=True)
+
+        simple = 1
+        if simple_id:
+            attributes = self.nodes[simple_id]["attributes"]
+            simple = int(attributes.get("literal_value", 1))
+
+        return ast.AnnAssign(target=target, annotation=annotation, value=value, simple=simple)
+
+    def build_break_statement(self, statement_id):
+
+        return ast.Break()
+
+    def build_continue_statement(self, statement_id):
+
+        return ast.Continue()
+
+    def build_for_statement(self, statement_id):
+
+        target_id = self.one(statement_id, "Target")
+        target = (yield self.start_target(target_id))
+        iterator_id = self.one(statement_id, "Iterator")
+        iterator = (yield self.start_expression(iterator_id))
+        body = (yield self.build_body(statement_id, "Body_Statement", placeholder=True))
+        or_else = (yield self.build_body(statement_id, "OrElse_Statement"))
+
+        return ast.For(target=target, iter=iterator, body=body, orelse=or_else, type_comment=None)
+
+    def build_asyncfor_statement(self, statement_id):
+
+        target_id = self.one(statement_id, "Target")
+        target = (yield self.start_target(target_id))
+        iterator_id = self.one(statement_id, "Iterator")
+        iterator = (yield self.start_expression(iterator_id))
+        body = (yield self.build_body(statement_id, "Body_Statement", placeholder=True))
+        or_else = (yield self.build_body(statement_id, "OrElse_Statement"))
+
+        return ast.AsyncFor(target=target, iter=iterator, body=body, orelse=or_else, type_comment=None)
+
+    def build_return_statement(self, statement_id):
+
+        expression_ids = self.children(statement_id, "Computes")
+        if len(expression_ids) == 0:
             
-            return ast.Expr(value=value)
+            return ast.Return(value=None)
+        expression_value = (yield self.start_expression(expression_ids[0]))
+        
+        return ast.Return(value=expression_value)
+
+    def build_assign_statement(self, statement_id):
 
-        if kind == "If":
-            condition_ids = self.children(statement_id, "Condition")
-            condition = self.build_expression(condition_ids[0])
-            body_ids = self.children(statement_id, "Body_Statement")
-            or_else_ids = self.children(statement_id, "OrElse_Statement")
-            body_ids = sorted(body_ids, key=self.statement_order)
-            body = [self.build_statement(body_id) for body_id in body_ids] or [ast.Pass()]
-            or_else_ids = sorted(or_else_ids, key=self.statement_order)
-            or_else = [self.build_statement(or_else_id) for or_else_id in or_else_ids]
+        target_ids = self.children(statement_id, "Target")
+        targets = (yield self.build_each(self.start_target, target_ids))
+        value_ids = self.children(statement_id, "Value")
+        value = (yield self.start_expression(value_ids[0]))
+        
+        return ast.Assign(targets=targets, value=value)
 
-            return ast.If(test=condition, body=body, orelse=or_else)
+    def build_expression_statement(self, statement_id):
 
-        return ast.Pass()
+        value_ids = self.children(statement_id, "Value")
+        if not value_ids:
+            return ast.Expr(value=ast.Constant(value=None))
+        value = (yield self.start_expression(value_ids[0]))
+        
+        return ast.Expr(value=value)
 
-    def build_functionlike(self, function_id, is_async):
-        function_name = self.nodes[function_id]["attributes"]["name"]
-        parameter_ids = self.edge_dict.get((function_id, "Has_Parameter"), [])
+    def build_if_statement(self, statement_id):
+
+        condition_ids = self.children(statement_id, "Condition")
+        condition = (yield self.start_expression(condition_ids[0]))
+        body = (yield self.build_body(statement_id, "Body_Statement", placeholder=True))
+        or_else = (yield self.build_body(statement_id, "OrElse_Statement"))
+
+        return ast.If(test=condition, body=body, orelse=or_else)
+
+    def parameter_ids(self, owner_id):
+
+        if self.nodes[owner_id]["type"] == "Expression":
+            return [parameter_id for _, parameter_id in self.edge_dict_extraction(owner_id, "Parameter_")]
+
+        return self.edge_dict.get((owner_id, "Has_Parameter"), [])
+
+    def parameter_groups(self, function_id):
+
+        parameter_ids = self.parameter_ids(function_id)
         position_only_parameters = []
         position_parameters = []
         keyword_only_parameters = []
@@ -833,12 +991,20 @@ class ConstructAST:
         position_parameters.sort(key=lambda x: x[0])
         keyword_only_parameters.sort(key=lambda x: x[0])
 
-        position_only_args = [self.build_arg(parameter_id) for _, _, parameter_id in position_only_parameters]
-        position_args     = [self.build_arg(parameter_id) for _, _, parameter_id in position_parameters]
-        keyword_only_args  = [self.build_arg(parameter_id) for _, _, parameter_id in keyword_only_parameters]
+        return (position_only_parameters, position_parameters, keyword_only_parameters,
+                variable_arg_parameter_id, keyword_arg_parameter_id)
+
+    def build_arguments(self, function_id):
+
+        (position_only_parameters, position_parameters, keyword_only_parameters,
+         variable_arg_parameter_id, keyword_arg_parameter_id) = self.parameter_groups(function_id)
 
-        variable_arg = self.build_arg(variable_arg_parameter_id) if variable_arg_parameter_id is not None else None
-        keyword_arg  = self.build_arg(keyword_arg_parameter_id) if keyword_arg_parameter_id is not None else None
+        position_only_args = (yield self.build_each(self.build_arg, [parameter_id for _, _, parameter_id in position_only_parameters]))
+        position_args     = (yield self.build_each(self.build_arg, [parameter_id for _, _, parameter_id in position_parameters]))
+        keyword_only_args  = (yield self.build_each(self.build_arg, [parameter_id for _, _, parameter_id in keyword_only_parameters]))
+
+        variable_arg = (yield self.build_arg(variable_arg_parameter_id)) if variable_arg_parameter_id is not None else None
+        keyword_arg  = (yield self.build_arg(keyword_arg_parameter_id)) if keyword_arg_parameter_id is not None else None
 
         combined_position = position_only_parameters + position_parameters
 
@@ -854,12 +1020,12 @@ class ConstructAST:
             if default_id is None:
                 missing.append(parameter_id)
             else:
-                position_defaults.append(self.build_expression(default_id))
+                position_defaults.append((yield self.start_expression(default_id)))
 
         keyword_defaults = []
         for _, _, parameter_id in keyword_only_parameters:
             default_id = self.one(parameter_id, "Default", optional=True)
-            keyword_defaults.append(self.build_expression(default_id) if default_id is not None else None)
+            keyword_defaults.append((yield self.start_expression(default_id)) if default_id is not None else None)
 
         args = ast.arguments(
             posonlyargs=position_only_args,
@@ -871,28 +1037,34 @@ class ConstructAST:
             defaults=position_defaults,
         )
 
+        return args
+
+    def build_functionlike(self, function_id, is_async):
+        function_name = self.nodes[function_id]["attributes"]["name"]
+        args = (yield self.build_arguments(function_id))
+        returns_id = self.one(function_id, "ReturnAnnotation", optional=True)
+        returns = (yield self.start_expression(returns_id)) if returns_id is not None else None
+
         body_items = []
 
         statement_ids = self.edge_dict.get((function_id, "Has_Statement"), [])
         for statement_id in statement_ids:
             body_items.append(("statement", statement_id, self.statement_order(statement_id)))
 
-        function_define_ids = (self.edge_dict.get((function_id, "Has_def"), []))
-        for function_define_id in function_define_ids:
-            body_items.append(("def", function_define_id, self.def_order(function_define_id)))
+        body_items.extend(self.definition_items(function_id))
 
         body_items.sort(key=lambda x: (x[2], x[1]))
 
         body = []
         for kind, identity, _ in body_items:
             if kind == "statement":
-                body.append(self.build_statement(identity))
+                body.append((yield self.start_statement(identity)))
             else:
                 node_type = self.nodes[identity]["type"]
                 if node_type in ("Function", "AsyncFunction"):
-                    body.append(self.build_any_function(identity))
+                    body.append((yield self.build_any_function(identity)))
                 elif node_type == "Class":
-                    body.append(self.build_class(identity))
+                    body.append((yield self.build_class(identity)))
                 else:
                     body.append(ast.Pass())
 
@@ -901,7 +1073,7 @@ class ConstructAST:
 
 
         decorator_edges = self.children_by_prefix(function_id, "Decorator_")
-        decorators = [self.build_expression(decorator) for _, decorator in decorator_edges]
+        decorators = (yield self.build_each(self.start_expression, [decorator for _, decorator in decorator_edges]))
 
         if is_async:
             
@@ -910,7 +1082,7 @@ class ConstructAST:
                 args=args,
                 body=body,
                 decorator_list=decorators,
-                returns=None,
+                returns=returns,
                 type_comment=None,
             )
 
@@ -919,14 +1091,15 @@ class ConstructAST:
             args=args,
             body=body,
             decorator_list=decorators,
-            returns=None,
+            returns=returns,
             type_comment=None,
         )
 
     def build_class(self, class_id):
         class_name = self.nodes[class_id]["attributes"]["name"]
         base_edges = self.children_by_prefix(class_id, "Base_")
-        bases = [self.build_expression(base_edge) for _, base_edge in base_edges]
+        bases = (yield self.build_each(self.start_expression, [base_edge for _, base_edge in base_edges]))
+        keywords = (yield self.build_keywords(class_id))
 
         body_items = []
 
@@ -934,26 +1107,20 @@ class ConstructAST:
         for statement_id in statement_ids:
             body_items.append(("statement", statement_id, self.statement_order(statement_id)))
 
-        function_define_ids = self.edge_dict.get((class_id, "Has_def"), [])
-        if not function_define_ids:
-            method_define_ids = self.edge_dict.get((class_id, "Has_method"), [])
-            function_define_id_ids = method_define_ids
-
-        for function_define_id in function_define_ids:
-            body_items.append(("def", function_define_id, self.def_order(function_define_id)))
+        body_items.extend(self.definition_items(class_id))
 
         body_items.sort(key=lambda x: (x[2], x[1]))
 
         body = []
         for kind, identity, _ in body_items:
             if kind == "statement":
-                body.append(self.build_statement(identity))
+                body.append((yield self.start_statement(identity)))
             else:
                 node_type = self.nodes[identity]["type"]
                 if node_type in ("Function", "AsyncFunction"):
-                    body.append(self.build_any_function(identity))
+                    body.append((yield self.build_any_function(identity)))
                 elif node_type == "Class":
-                    body.append(self.build_class(identity))
+                    body.append((yield self.build_class(identity)))
                 else:
                     body.append(ast.Pass())
 
@@ -961,12 +1128,12 @@ class ConstructAST:
             body = [ast.Pass()]
 
         decorator_edges = self.children_by_prefix(class_id, "Decorator_")
-        decorators = [self.build_expression(decorator) for _, decorator in decorator_edges]
+        decorators = (yield self.build_each(self.start_expression, [decorator for _, decorator in decorator_edges]))
 
         return ast.ClassDef(
             name=class_name,
             bases=bases,
-            keywords=[],
+            keywords=keywords,
             body=body,
             decorator_list=decorators
         )
@@ -974,18 +1141,12 @@ class ConstructAST:
     def build_module(self):
         body_items = []
 
-        statement_ids = self.edge_dict.get(("Module:<top>", "Has_Statement"), [])
+        statement_ids = self.edge_dict.get((self.module_id, "Has_Statement"), [])
             
         for statement_id in statement_ids:
             body_items.append(("statement", statement_id, self.statement_order(statement_id)))
 
-        module_class_ids = self.edge_dict.get(("Module:<top>", "Has_class"), [])
-        for module_class_id in module_class_ids:
-            body_items.append(("class", module_class_id, self.def_order(module_class_id)))
-
-        module_define_ids = self.edge_dict.get(("Module:<top>", "Has_def"), [])
-        for module_define_id in module_define_ids:
-            body_items.append(("def", module_define_id, self.def_order(module_define_id)))
+        body_items.extend(self.definition_items(self.module_id))
 
         body_items.sort(key=lambda x: (x[2], x[1]))
 
@@ -996,9 +1157,9 @@ class ConstructAST:
             else:
                 node_type = self.nodes[identity]["type"]
                 if node_type in ("Function", "AsyncFunction"):
-                    body.append(self.build_any_function(identity))
+                    body.append(self.run(self.build_any_function(identity)))
                 elif node_type == "Class":
-                    body.append(self.build_class(identity))
+                    body.append(self.run(self.build_class(identity)))
                 else:
                     body.append(ast.Pass())
 
@@ -1007,4 +1168,128 @@ class ConstructAST:
         except TypeError:
             module = ast.Module(body=body)
 
-        return ast.fix_missing_locations(module)
\ No newline at end of file
+        return self.fix_missing_locations(module)
+
+    def build_subtree(self, node_id):
+
+        if node_id == self.module_id:
+            return self.build_module()
+
+        node_type = self.nodes[node_id]["type"]
+        if node_type in ("Function", "AsyncFunction"):
+            subtree = self.run(self.build_any_function(node_id))
+        elif node_type == "Class":
+            subtree = self.run(self.build_class(node_id))
+        elif node_type == "Statement":
+            subtree = self.build_statement(node_id)
+        else:
+            raise ValueError(f"cannot build a subtree from {node_type} node {node_id!r}")
+
+        return self.fix_missing_locations(subtree)
+
+    def unparse_subtree(self, node_id):
+
+        return ast.unparse(self.build_subtree(node_id))
+
+    def fix_missing_locations(self, root):
+
+        pending = [(root, 1, 0, 1, 0)]
+        while pending:
+            node, lineno, col_offset, end_lineno, end_col_offset = pending.pop()
+            if "lineno" in node._attributes:
+                if not hasattr(node, "lineno"):
+                    node.lineno = lineno
+                else:
+                    lineno = node.lineno
+            if "end_lineno" in node._attributes:
+                if getattr(node, "end_lineno", None) is None:
+                    node.end_lineno = end_lineno
+                else:
+                    end_lineno = node.end_lineno
+            if "col_offset" in node._attributes:
+                if not hasattr(node, "col_offset"):
+                    node.col_offset = col_offset
+                else:
+                    col_offset = node.col_offset
+            if "end_col_offset" in node._attributes:
+                if getattr(node, "end_col_offset", None) is None:
+                    node.end_col_offset = end_col_offset
+                else:
+                    end_col_offset = node.end_col_offset
+            location = (lineno, col_offset, end_lineno, end_col_offset)
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if isinstance(value, ast.AST):
+                    pending.append((value, *location))
+                elif isinstance(value, list):
+                    for item in value:
+                        if isinstance(item, ast.AST):
+                            pending.append((item, *location))
+
+        return root
+
+    target_builders = {
+        "starred": build_starred_target,
+        "Name": build_name_target,
+        "attribute": build_attribute_target,
+        "subscript": build_subscript_target,
+        "tuple": build_tuple_target,
+        "list": build_list_target,
+    }
+
+    expression_builders = {
+        "Name": build_name,
+        "Literal": build_literal,
+        "binary_operator": build_binary_operator,
+        "generator_expression": build_generator_expression,
+        "set": build_set,
+        "named_expression": build_named_expression,
+        "starred": build_starred,
+        "await": build_await,
+        "yield": build_yield,
+        "yieldfrom": build_yield_from,
+        "lambda": build_lambda,
+        "setcomp": build_setcomp,
+        "dictcomp": build_dictcomp,
+        "slice": build_slice,
+        "attribute": build_attribute,
+        "call": build_call,
+        "subscript": build_subscript,
+        "tuple": build_tuple,
+        "list": build_list,
+        "dict": build_dict,
+        "joinedstr": build_joinedstr,
+        "formatted_value": build_formatted_value,
+        "if_expression": build_if_expression,
+        "boolop": build_boolop,
+        "listcomp": build_listcomp,
+        "generator": build_comprehension,
+        "comprehension": build_comprehension,
+        "unaryop": build_unaryop,
+        "compare": build_compare,
+    }
+
+    statement_builders = {
+        "Pass": build_pass_statement,
+        "Delete": build_delete_statement,
+        "Global": build_global_statement,
+        "Nonlocal": build_nonlocal_statement,
+        "While": build_while_statement,
+        "With": build_with_statement,
+        "AsyncWith": build_asyncwith_statement,
+        "Assert": build_assert_statement,
+        "Try": build_try_statement,
+        "Raise": build_raise_statement,
+        "Import": build_import_statement,
+        "ImportFrom": build_importfrom_statement,
+        "AugAssign": build_augassign_statement,
+        "AnnAssign": build_annassign_statement,
+        "Break": build_break_statement,
+        "Continue": build_continue_statement,
+        "For": build_for_statement,
+        "AsyncFor": build_asyncfor_statement,
+        "Return": build_return_statement,
+        "Assign": build_assign_statement,
+        "ExpressionStatement": build_expression_statement,
+        "If": build_if_statement,
+    }
@@ -0,0 +1,100 @@
+import hashlib
+from collections import defaultdict
+
+MODULE_ID = "Module:<top>"
+DEFINITION_NODE_TYPES = frozenset(("Function", "AsyncFunction", "Class"))
+DIGEST_SIZE = 12
+
+def content_digest(*parts):
+
+    return hashlib.blake2b(repr(parts).encode("utf-8", "surrogatepass"), digest_size=DIGEST_SIZE).hexdigest()
+
+def relative_attributes(node_type, attributes, base):
+
+    relative = []
+    lineno = attributes.get("lineno")
+    for key in sorted(attributes):
+        value = attributes[key]
+        if key in ("lineno", "order") and lineno is not None and value == lineno:
+            if node_type in DEFINITION_NODE_TYPES:
+                continue
+            value = ("line", lineno - base)
+        relative.append((key, value))
+
+    return tuple(relative)
+
+def post_order(nodes, outgoing, roots):
+
+    order = []
+    bases = {}
+    seen = set()
+    for root in roots:
+        if root in seen:
+            continue
+        seen.add(root)
+        bases[root] = 0
+        pending = [(root, iter(outgoing.get(root, ())))]
+        active = {root}
+        while pending:
+            node_id, children = pending[-1]
+            for _, child in children:
+                if child in active:
+                    raise ValueError(f"graph has a cycle through {child!r}")
+                if child in seen:
+                    continue
+                seen.add(child)
+                active.add(child)
+                node = nodes.get(child)
+                parent = nodes.get(node_id)
+                if parent is not None and parent["type"] in DEFINITION_NODE_TYPES:
+                    bases[child] = parent["attributes"].get("lineno") or 0
+                else:
+                    bases[child] = bases[node_id]
+                pending.append((child, iter(outgoing.get(child, ()))))
+                break
+            else:
+                pending.pop()
+                active.discard(node_id)
+                order.append(node_id)
+
+    return order, bases
+
+def content_ids(nodes, edges, root=MODULE_ID):
+
+    outgoing = defaultdict(list)
+    for source, relation, destination in edges:
+        outgoing[source].append((relation, destination))
+
+    order, bases = post_order(nodes, outgoing, [root] + list(nodes))
+
+    rename = {root: root}
+    assigned = {}
+    canonical = set()
+    for node_id in order:
+        node = nodes.get(node_id)
+        if node is None:
+            rename.setdefault(node_id, node_id)
+            continue
+
+        node_type = node["type"]
+        attributes = node["attributes"]
+        children = tuple((relation, rename[child]) for relation, child in outgoing.get(node_id, ()))
+        digest = content_digest(node_type, relative_attributes(node_type, attributes, bases[node_id]), children)
+        new_id = f"{node_type}:{digest}"
+        if new_id in assigned and assigned[new_id] != attributes:
+            digest = content_digest(digest, sorted(attributes.items(), key=lambda item: item[0]))
+            new_id = f"{node_type}:{digest}"
+        if new_id not in assigned:
+            assigned[new_id] = attributes
+            canonical.add(node_id)
+        rename[node_id] = new_id
+
+    content_nodes = {}
+    for node_id, node in nodes.items():
+        if node_id in canonical:
+            content_nodes[rename[node_id]] = node
+    content_edges = [(rename[source], relation, rename[destination])
+                     for source, relation, destination in edges
+                     if source == root or source in canonical or source not in nodes]
+
+    return content_nodes, content_edges
@@ -0,0 +1,278 @@
+from collections import defaultdict
+
+from ConstructAST import ConstructAST
+from GraphQuery import is_variable
+
+BUILTIN_PREDICATES = frozenset(("edge", "indexed", "node", "attribute"))
+
+class Datalog:
+
+    def __init__(self, graph):
+
+        self.graph = graph
+        self.rules = []
+        self.derived = set()
+        self.facts = {}
+        self.fact_indexes = defaultdict(dict)
+        self.solved = None
+        self.families = None
+        self.rounds = 0
+        self.derivations = 0
+
+    def rule(self, head, *body):
+
+        if head[0] in BUILTIN_PREDICATES:
+            raise ValueError(f"{head[0]} is a built-in predicate and cannot be derived")
+        body_variables = {term for atom in body for term in atom[1:] if is_variable(term)}
+        unbound = [term for term in head[1:] if is_variable(term) and term not in body_variables]
+        if unbound:
+            raise ValueError(f"head variables {', '.join(unbound)} do not appear in the body")
+
+        self.rules.append((tuple(head), tuple(tuple(atom) for atom in body)))
+        self.derived.add(head[0])
+        self.solved = None
+
+    def relation_families(self):
+
+        if self.families is None or self.families[0] != self.graph.version:
+            families = defaultdict(list)
+            for relation in self.graph.pos:
+                indexed_relation = ConstructAST.split_indexed_relation(relation)
+                if indexed_relation is not None:
+                    families[indexed_relation[0]].append(relation)
+            self.families = (self.graph.version, families)
+
+        return self.families[1]
+
+    def boundness(self, atom, bound):
+
+        terms = atom[1:]
+        bound_terms = sum(1 for term in terms if not is_variable(term) or term in bound)
+
+        return (bound_terms == len(terms), bound_terms, atom[0] in BUILTIN_PREDICATES)
+
+    def order_body(self, body, first=None):
+
+        remaining = list(range(len(body)))
+        order = []
+        bound = set()
+        if first is not None:
+            remaining.remove(first)
+            order.append(first)
+            bound.update(term for term in body[first][1:] if is_variable(term))
+        while remaining:
+            best = max(remaining, key=lambda idx: (self.boundness(body[idx], bound), -idx))
+            remaining.remove(best)
+            order.append(best)
+            bound.update(term for term in body[best][1:] if is_variable(term))
+
+        return order
+
+    def unify(self, terms, row, binding):
+
+        extended = binding
+        for term, value in zip(terms, row):
+            if not is_variable(term):
+                if term != value:
+                    return None
+            elif term in extended:
+                if extended[term] != value:
+                    return None
+            else:
+                if extended is binding:
+                    extended = dict(binding)
+                extended[term] = value
+
+        return extended
+
+    def fact_index(self, predicate, positions):
+
+        indexes = self.fact_indexes[predicate]
+        index = indexes.get(positions)
+        if index is None:
+            index = {}
+            for row in self.facts.get(predicate, ()):
+                index.setdefault(tuple(row[idx] for idx in positions), []).append(row)
+            indexes[positions] = index
+
+        return index
+
+    def fact_rows(self, predicate, terms, binding):
+
+        positions = tuple(idx for idx, term in enumerate(terms) if not is_variable(term) or term in binding)
+        if not positions:
+            return self.facts.get(predicate, ())
+        key = tuple(binding[terms[idx]] if is_variable(terms[idx]) else terms[idx] for idx in positions)
+
+        return self.fact_index(predicate, positions).get(key, ())
+
+    def indexed_rows(self, source, base, destination):
+
+        if source is not None or destination is not None:
+            for edge_source, relation, edge_destination in self.graph.triples(source, None, destination):
+                indexed_relation = ConstructAST.split_indexed_relation(relation)
+                if indexed_relation is not None and (base is None or indexed_relation[0] == base):
+                    yield edge_source, indexed_relation[0], edge_destination
+            return
+
+        families = self.relation_families()
+        for family in ([base] if base is not None else list(families)):
+            for relation in families.get(family, ()):
+                for edge_source, _, edge_destination in self.graph.triples(None, relation, None):
+                    yield edge_source, family, edge_destination
+
+    def node_rows(self, node_id, node_type):
+
+        if node_id is not None:
+            node = self.graph.nodes.get(node_id)
+            if node is not None:
+                yield node_id, node["type"]
+        elif node_type is not None:
+            for candidate in self.graph.by_type.get(node_type, ()):
+                yield candidate, node_type
+        else:
+            for candidate, node in self.graph.nodes.items():
+                yield candidate, node["type"]
+
+    def attribute_rows(self, node_id, name, value):
+
+        if node_id is not None:
+            node = self.graph.nodes.get(node_id)
+            attributes = node["attributes"] if node is not None and isinstance(node["attributes"], dict) else {}
+            if name is None:
+                for key, item in attributes.items():
+                    yield node_id, key, item
+            elif name in attributes:
+                yield node_id, name, attributes[name]
+        elif name is not None and value is not None:
+            try:
+                candidates = self.graph.attribute_index(name).get(value, ())
+            except TypeError:
+                candidates = ()
+            for candidate in candidates:
+                yield candidate, name, value
+        else:
+            for candidate, node in self.graph.nodes.items():
+                if isinstance(node["attributes"], dict):
+                    for key, item in node["attributes"].items():
+                        if name is None or key == name:
+                            yield candidate, key, item
+
+    def builtin_rows(self, predicate, terms, binding):
+
+        values = [binding.get(term) if is_variable(term) else term for term in terms]
+        if predicate == "edge":
+            return self.graph.triples(*values)
+        if predicate == "indexed":
+            return self.indexed_rows(*values)
+        if predicate == "node":
+            return self.node_rows(*values)
+
+        return self.attribute_rows(*values)
+
+    def atom_bindings(self, atom, binding, delta):
+
+        predicate, terms = atom[0], atom[1:]
+        if delta is not None:
+            rows = delta
+        elif predicate in BUILTIN_PREDICATES:
+            rows = self.builtin_rows(predicate, terms, binding)
+        else:
+            rows = self.fact_rows(predicate, terms, binding)
+        for row in rows:
+            extended = self.unify(terms, row, binding)
+            if extended is not None:
+                yield extended
+
+    def evaluate(self, body, order, delta_position=None, delta=None):
+
+        if not body:
+            yield {}
+            return
+
+        atoms = [body[idx] for idx in order]
+        sources = [delta if idx == delta_position else None for idx in order]
+        pending = [self.atom_bindings(atoms[0], {}, sources[0])]
+        while pending:
+            binding = next(pending[-1], None)
+            if binding is None:
+                pending.pop()
+            elif len(pending) == len(atoms):
+                yield binding
+            else:
+                depth = len(pending)
+                pending.append(self.atom_bindings(atoms[depth], binding, sources[depth]))
+
+    def add_facts(self, derived_rows):
+
+        delta = {}
+        for predicate, rows in derived_rows.items():
+            facts = self.facts[predicate]
+            indexes = self.fact_indexes[predicate]
+            added = []
+            for row in rows:
+                if row in facts:
+                    continue
+                facts[row] = None
+                added.append(row)
+                for positions, index in indexes.items():
+                    index.setdefault(tuple(row[idx] for idx in positions), []).append(row)
+            if added:
+                delta[predicate] = added
+
+        return delta
+
+    def derive(self, head, bindings, derived_rows):
+
+        predicate, terms = head[0], head[1:]
+        rows = derived_rows[predicate]
+        for binding in bindings:
+            rows[tuple(binding[term] if is_variable(term) else term for term in terms)] = None
+            self.derivations += 1
+
+    def solve(self):
+
+        version = (self.graph.version, len(self.rules))
+        if self.solved == version:
+            return self.facts
+
+        self.facts = {predicate: {} for predicate in self.derived}
+        self.fact_indexes = defaultdict(dict)
+        self.rounds = 0
+        self.derivations = 0
+
+        plans = []
+        for head, body in self.rules:
+            positions = [idx for idx, atom in enumerate(body) if atom[0] in self.derived]
+            plans.append((head, body, positions, {position: self.order_body(body, position) for position in positions}))
+
+        derived_rows = defaultdict(dict)
+        for head, body, positions, _ in plans:
+            if not positions:
+                self.derive(head, self.evaluate(body, self.order_body(body)), derived_rows)
+        delta = self.add_facts(derived_rows)
+
+        while delta:
+            self.rounds += 1
+            derived_rows = defaultdict(dict)
+            for head, body, positions, orders in plans:
+                for position in positions:
+                    rows = delta.get(body[position][0])
+                    if rows:
+                        self.derive(head, self.evaluate(body, orders[position], position, rows), derived_rows)
+            delta = self.add_facts(derived_rows)
+
+        self.solved = version
+
+        return self.facts
+
+    def relation(self, predicate):
+
+        return list(self.solve().get(predicate, ()))
+
+    def match(self, *atoms):
+
+        self.solve()
+        atoms = tuple(tuple(atom) for atom in atoms)
+
+        return self.evaluate(atoms, self.order_body(atoms))
@@ -0,0 +1,173 @@
+import argparse
+import ast
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from ExtractionCache import ExtractionCache
+from KnowledgeGraph import KnowledgeGraph
+
+worker_caches = {}
+
+class ExtractionResult:
+
+    def __init__(self):
+
+        self.nodes = {}
+        self.edges = []
+        self.modules = {}
+        self.failures = {}
+
+    def merge(self, path, namespace, outcome):
+
+        nodes, edges, failure, _ = outcome
+        if failure is not None:
+            self.failures[path] = failure
+            return
+
+        self.nodes.update(nodes)
+        self.edges.extend(edges)
+        self.modules[path] = module_id(namespace)
+
+def module_id(namespace):
+
+    return f"Module:{namespace}"
+
+def namespace_graph(nodes, edges, namespace):
+
+    prefix = f"{namespace}:"
+    root = module_id(namespace)
+
+    def rename(node_id):
+        if node_id == "Module:<top>":
+            return root
+        return prefix + node_id
+
+    renamed_nodes = {rename(node_id): node for node_id, node in nodes.items()}
+    renamed_edges = [(rename(source), relation, rename(destination)) for source, relation, destination in edges]
+
+    return renamed_nodes, renamed_edges
+
+def path_namespace(path, root=None):
+
+    if root is not None:
+        path = os.path.relpath(path, root)
+
+    return path.replace(os.sep, "/")
+
+def extract_source(source, namespace, cache=None):
+
+    if cache is not None:
+        nodes, edges = cache.extract(source)
+        return namespace_graph(nodes, edges, namespace)
+
+    knowledge_graph = KnowledgeGraph()
+    knowledge_graph.visit(ast.parse(source))
+
+    return namespace_graph(knowledge_graph.nodes, knowledge_graph.edges, namespace)
+
+def worker_cache(directory):
+
+    if directory is None:
+        return None
+    if directory not in worker_caches:
+        worker_caches[directory] = ExtractionCache(directory)
+
+    return worker_caches[directory]
+
+def extract_file(task, cache=None):
+
+    path, namespace, cache_directory = task
+    shared = cache is None
+    if shared:
+        cache = worker_cache(cache_directory)
+    lookups = (cache.hits, cache.misses) if cache is not None else None
+    try:
+        with open(path, "rb") as handle:
+            source = handle.read()
+        nodes, edges = extract_source(source, namespace, cache)
+    except Exception as error:
+        nodes, edges, failure = None, None, f"{type(error).__name__}: {error}"
+    else:
+        failure = None
+
+    hit = None
+    if shared and cache is not None and (cache.hits, cache.misses) != lookups:
+        hit = cache.hits > lookups[0]
+
+    return nodes, edges, failure, hit
+
+def map_tasks(function, tasks, workers=None, cache=None):
+
+    worker_count = workers or os.cpu_count() or 1
+    if worker_count == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield function(task) if cache is None else function(task, cache)
+        return
+
+    chunksize = max(1, len(tasks) // (worker_count * 8))
+    with ProcessPoolExecutor(max_workers=worker_count) as executor:
+        yield from executor.map(function, tasks, chunksize=chunksize)
+
+    if cache is not None:
+        cache.entries = None
+        cache.enforce_limit()
+
+def extract_paths(paths, workers=None, root=None, cache=None):
+
+    cache_directory = cache.directory if cache is not None else None
+    tasks = [(path, path_namespace(path, root), cache_directory) for path in paths]
+    result = ExtractionResult()
+
+    for outcome, task in zip(map_tasks(extract_file, tasks, workers, cache), tasks):
+        result.merge(task[0], task[1], outcome)
+        if outcome[3] is not None:
+            cache.hits += outcome[3]
+            cache.misses += not outcome[3]
+
+    return result
+
+def python_files(paths):
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                files.extend(os.path.join(directory, name) for name in names if name.endswith(".py"))
+        else:
+            files.append(path)
+
+    return sorted(set(files))
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Extract one knowledge graph from many Python files.")
+    parser.add_argument("paths", nargs="+", help="Python files or directories to scan for .py files")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("-r", "--root", default=None, help="directory that namespaces are made relative to")
+    parser.add_argument("-o", "--output", default=None, help="write the merged graph as JSON to this file")
+    parser.add_argument("-c", "--cache", default=None, help="directory of the extraction cache")
+    parser.add_argument("--cache-bytes", type=int, default=None, help="evict least recently used cache entries above this size")
+    arguments = parser.parse_args(argv)
+
+    cache = ExtractionCache(arguments.cache, arguments.cache_bytes) if arguments.cache else None
+    files = python_files(arguments.paths)
+    result = extract_paths(files, workers=arguments.workers, root=arguments.root, cache=cache)
+
+    for path, failure in result.failures.items():
+        print(f"{path}: {failure}", file=sys.stderr)
+    print(f"{len(result.modules)} modules, {len(result.nodes)} nodes, {len(result.edges)} edges, "
+          f"{len(result.failures)} failures", file=sys.stderr)
+    if cache is not None:
+        print(f"cache: {cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions", file=sys.stderr)
+
+    if arguments.output is not None:
+        graph = {"modules": result.modules, "nodes": result.nodes, "edges": result.edges}
+        with open(arguments.output, "w") as handle:
+            json.dump(graph, handle, default=repr)
+
+    return 1 if result.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
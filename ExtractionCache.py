@@ -0,0 +1,171 @@
+import ast
+import hashlib
+import importlib
+import os
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+
+from KnowledgeGraph import EXTRACTOR_VERSION, KnowledgeGraph
+
+INTERPRETER_TAG = f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}"
+EXTRACTOR_MODULES = ("KnowledgeGraph", "SymbolTable", "ContentIds", "FoldOperations", "CompactGraph", "GraphSink")
+
+def source_files_digest(paths):
+
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as handle:
+            digest.update(handle.read())
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+EXTRACTOR_FILES = tuple(importlib.import_module(name).__file__ for name in EXTRACTOR_MODULES)
+EXTRACTOR_DIGEST = source_files_digest(EXTRACTOR_FILES)
+
+class ExtractionCache:
+
+    def __init__(self, directory, max_bytes=None):
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.entries = None
+        self.total_bytes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, source):
+
+        if isinstance(source, str):
+            source = source.encode("utf-8")
+
+        digest = hashlib.sha256(f"{EXTRACTOR_VERSION}:{EXTRACTOR_DIGEST}:{INTERPRETER_TAG}".encode("ascii"))
+        digest.update(b"\0")
+        digest.update(source)
+
+        return digest.hexdigest()
+
+    def entry_path(self, key):
+
+        return os.path.join(self.directory, key[:2], f"{key}.pickle")
+
+    def load_entries(self):
+
+        if self.entries is not None:
+            return self.entries
+
+        found = []
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".pickle"):
+                    continue
+                status = os.stat(os.path.join(directory, name))
+                found.append((status.st_mtime_ns, name[:-len(".pickle")], status.st_size))
+
+        found.sort()
+        self.entries = OrderedDict((key, size) for _, key, size in found)
+        self.total_bytes = sum(self.entries.values())
+
+        return self.entries
+
+    def get(self, source):
+
+        key = self.key(source)
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as handle:
+                graph = pickle.load(handle)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            self.misses += 1
+            self.remove(key)
+            return None
+
+        self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        if self.entries is not None and key in self.entries:
+            self.entries.move_to_end(key)
+
+        return graph
+
+    def put(self, source, nodes, edges):
+
+        self.store(self.key(source), (nodes, edges))
+
+    def store(self, key, entry):
+
+        path = self.entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        handle, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temporary:
+                pickle.dump(entry, temporary, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+        if self.entries is not None:
+            self.total_bytes += os.path.getsize(path) - self.entries.get(key, 0)
+            self.entries[key] = os.path.getsize(path)
+            self.entries.move_to_end(key)
+        self.enforce_limit()
+
+    def extract(self, source):
+
+        entry = self.get(source)
+        if entry is None:
+            try:
+                tree = ast.parse(source)
+            except (SyntaxError, ValueError) as error:
+                entry = error
+            else:
+                knowledge_graph = KnowledgeGraph()
+                knowledge_graph.visit(tree)
+                entry = (knowledge_graph.nodes, knowledge_graph.edges)
+            self.store(self.key(source), entry)
+
+        if isinstance(entry, Exception):
+            raise entry
+
+        return entry
+
+    def remove(self, key):
+
+        try:
+            os.remove(self.entry_path(key))
+        except OSError:
+            pass
+        if self.entries is not None:
+            self.total_bytes -= self.entries.pop(key, 0)
+
+    def enforce_limit(self):
+
+        if self.max_bytes is None:
+            return
+
+        entries = self.load_entries()
+        while entries and self.total_bytes > self.max_bytes:
+            key = next(iter(entries))
+            self.remove(key)
+            self.evictions += 1
+
+    def size(self):
+
+        self.load_entries()
+
+        return self.total_bytes
+
+    def stats(self):
+
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
@@ -0,0 +1,92 @@
+from collections import defaultdict
+
+FOLDED_ATTRIBUTES = ("operation", "operations", "is_async")
+
+def compare_index(relation):
+
+    if relation.startswith("Op_") and relation[3:].isdigit():
+        return int(relation[3:])
+
+    return None
+
+def fold_operations(nodes, edges):
+
+    folded = defaultdict(dict)
+    compare_operations = defaultdict(dict)
+    folded_leaves = set()
+    kept_edges = []
+    for edge in edges:
+        source, relation, destination = edge
+        idx = compare_index(relation)
+        if relation == "Operation":
+            folded[source]["operation"] = nodes[destination]["attributes"]["operation"]
+        elif relation == "IsAsync":
+            folded[source]["is_async"] = nodes[destination]["attributes"]["literal_value"]
+        elif idx is not None:
+            compare_operations[source][idx] = nodes[destination]["attributes"]["operation"]
+        else:
+            kept_edges.append(edge)
+            continue
+        folded_leaves.add(destination)
+
+    for source, operations in compare_operations.items():
+        folded[source]["operations"] = [operations[idx] for idx in sorted(operations)]
+
+    referenced = set()
+    for source, _, destination in kept_edges:
+        referenced.add(source)
+        referenced.add(destination)
+
+    folded_nodes = {}
+    for node_id, node in nodes.items():
+        if node_id in folded_leaves and node_id not in referenced:
+            continue
+        attributes = folded.get(node_id)
+        if attributes:
+            node = {"type": node["type"], "attributes": {**node["attributes"], **attributes}}
+        folded_nodes[node_id] = node
+
+    return folded_nodes, kept_edges
+
+def unfold_operations(nodes, edges):
+
+    unfolded_nodes = {}
+    leaf_edges = {}
+    for node_id, node in nodes.items():
+        attributes = node["attributes"]
+        if node["type"] == "Operation" or not any(key in attributes for key in FOLDED_ATTRIBUTES):
+            unfolded_nodes[node_id] = node
+            continue
+
+        attributes = dict(attributes)
+        operation = attributes.pop("operation", None)
+        operations = attributes.pop("operations", None)
+        folded_async = "is_async" in attributes
+        is_async = attributes.pop("is_async", None)
+        unfolded_nodes[node_id] = {"type": node["type"], "attributes": attributes}
+
+        created = []
+        if operation is not None:
+            operation_id = f"{node_id}_operation"
+            unfolded_nodes[operation_id] = {"type": "Operation", "attributes": {"operation": operation}}
+            created.append((node_id, "Operation", operation_id))
+        for idx, operation in enumerate(operations or ()):
+            operation_id = f"{node_id}_op_{idx}"
+            unfolded_nodes[operation_id] = {"type": "Operation", "attributes": {"operation": operation}}
+            created.append((node_id, f"Op_{idx}", operation_id))
+        if folded_async:
+            async_id = f"{node_id}_async"
+            unfolded_nodes[async_id] = {"type": "Literal", "attributes": {"literal_value": is_async}}
+            created.append((node_id, "IsAsync", async_id))
+        leaf_edges[node_id] = created
+
+    unfolded_edges = []
+    for edge in edges:
+        created = leaf_edges.pop(edge[0], None)
+        if created:
+            unfolded_edges.extend(created)
+        unfolded_edges.append(edge)
+    for created in leaf_edges.values():
+        unfolded_edges.extend(created)
+
+    return unfolded_nodes, unfolded_edges
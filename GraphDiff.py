@@ -0,0 +1,392 @@
+import hashlib
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+MODULE_ID = "Module:<top>"
+DEFINITION_NODE_TYPES = frozenset(("Function", "AsyncFunction", "Class"))
+REFERENCE_RELATIONS = frozenset(("Returns", "Defines", "Uses", "ResolvesTo"))
+
+class GraphSignature:
+
+    def __init__(self, nodes, edges, root=MODULE_ID):
+
+        self.nodes = nodes
+        self.root = root
+        self.outgoing = defaultdict(list)
+        self.parents = defaultdict(list)
+        for source, relation, destination in edges:
+            self.outgoing[source].append((relation, destination))
+            self.parents[destination].append((source, relation))
+
+        self.anchors = {root: 0}
+        pending = [root]
+        while pending:
+            node_id = pending.pop()
+            anchor = self.anchors[node_id]
+            for relation, child in self.outgoing.get(node_id, ()):
+                if relation not in REFERENCE_RELATIONS and child not in self.anchors:
+                    line = self.line(child)
+                    self.anchors[child] = anchor if line is None else line
+                    pending.append(child)
+
+        self.hashes = {}
+        for node_id in self.post_order():
+            self.hashes[node_id] = self.node_hash(node_id)
+
+    def line(self, node_id):
+
+        node = self.nodes.get(node_id)
+        if node is None or not isinstance(node["attributes"], dict):
+            return None
+
+        return node["attributes"].get("lineno")
+
+    def post_order(self):
+
+        order = []
+        seen = {self.root}
+        pending = [(self.root, iter(self.outgoing.get(self.root, ())))]
+        while pending:
+            node_id, children = pending[-1]
+            for relation, child in children:
+                if relation not in REFERENCE_RELATIONS and child not in seen:
+                    seen.add(child)
+                    pending.append((child, iter(self.outgoing.get(child, ()))))
+                    break
+            else:
+                pending.pop()
+                order.append(node_id)
+
+        return order
+
+    def node_key(self, node_id):
+
+        node = self.nodes.get(node_id)
+        if node is None:
+            return (node_id,)
+        attributes = node["attributes"]
+        if isinstance(attributes, dict):
+            lineno = attributes.get("lineno")
+            attributes = tuple(sorted((name, "line" if name == "order" and value == lineno else value)
+                                      for name, value in attributes.items() if name != "lineno"))
+
+        return (node["type"], attributes)
+
+    def node_hash(self, node_id):
+
+        anchor = self.anchors[node_id]
+        children = []
+        for relation, child in self.outgoing.get(node_id, ()):
+            if relation in REFERENCE_RELATIONS:
+                child_anchor = self.anchors.get(child)
+                children.append((relation, self.node_key(child), None if child_anchor is None else child_anchor - anchor))
+                continue
+            line = self.line(child)
+            children.append((relation, self.hashes.get(child), None if line is None else line - anchor))
+        children.sort(key=lambda child: child[0])
+
+        return hashlib.blake2b(repr((self.node_key(node_id), children)).encode("utf-8", "surrogatepass"),
+                               digest_size=16).digest()
+
+    def node_type(self, node_id):
+
+        node = self.nodes.get(node_id)
+
+        return None if node is None else node["type"]
+
+    def alignment_key(self, node_id):
+
+        node = self.nodes.get(node_id)
+        if node is None:
+            return (node_id,)
+        attributes = node["attributes"] if isinstance(node["attributes"], dict) else {}
+        if node["type"] in DEFINITION_NODE_TYPES:
+            return (node["type"], attributes.get("name"))
+
+        return (node["type"], attributes.get("kind"))
+
+    def shared(self, node_id):
+
+        return sum(relation not in REFERENCE_RELATIONS for _, relation in self.parents.get(node_id, ())) > 1
+
+    def tree_parent(self, node_id):
+
+        for source, relation in self.parents.get(node_id, ()):
+            if relation not in REFERENCE_RELATIONS:
+                return source, self.outgoing[source].index((relation, node_id))
+
+        return None
+
+class GraphDelta:
+
+    def __init__(self):
+
+        self.removed_nodes = []
+        self.added_nodes = {}
+        self.changed_nodes = {}
+        self.outgoing = {}
+        self.shifts = {}
+
+    def __len__(self):
+
+        return (len(self.removed_nodes) + len(self.added_nodes) + len(self.changed_nodes)
+                + sum(len(edges) for edges in self.outgoing.values()) + len(self.shifts))
+
+def signature(graph, root=MODULE_ID):
+
+    if isinstance(graph, GraphSignature):
+        return graph
+
+    nodes, edges = graph
+
+    return GraphSignature(nodes, edges, root)
+
+def pair_children(old, new, old_children, new_children):
+
+    old_groups = defaultdict(list)
+    new_groups = defaultdict(list)
+    for relation, child in old_children:
+        old_groups[relation].append(child)
+    for relation, child in new_children:
+        new_groups[relation].append(child)
+
+    pairs = []
+    for relation, new_ids in new_groups.items():
+        if relation in REFERENCE_RELATIONS:
+            continue
+        old_ids = old_groups.get(relation, [])
+        if len(old_ids) == 1 and len(new_ids) == 1:
+            pairs.append((old_ids[0], new_ids[0]))
+            continue
+
+        old_ids = sorted(old_ids, key=lambda node_id: old.anchors.get(node_id, 0))
+        new_ids = sorted(new_ids, key=lambda node_id: new.anchors.get(node_id, 0))
+        old_hashes = [old.hashes[node_id] for node_id in old_ids]
+        new_hashes = [new.hashes[node_id] for node_id in new_ids]
+        prefix = 0
+        while prefix < min(len(old_hashes), len(new_hashes)) and old_hashes[prefix] == new_hashes[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < min(len(old_hashes), len(new_hashes)) - prefix
+               and old_hashes[-1 - suffix] == new_hashes[-1 - suffix]):
+            suffix += 1
+        pairs.extend(zip(old_ids[:prefix], new_ids[:prefix]))
+        pairs.extend(zip(old_ids[len(old_ids) - suffix:], new_ids[len(new_ids) - suffix:]))
+        old_ids = old_ids[prefix:len(old_ids) - suffix]
+        new_ids = new_ids[prefix:len(new_ids) - suffix]
+        matcher = SequenceMatcher(None, old_hashes[prefix:len(old_hashes) - suffix],
+                                  new_hashes[prefix:len(new_hashes) - suffix], autojunk=False)
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            if tag == "equal":
+                pairs.extend(zip(old_ids[old_start:old_end], new_ids[new_start:new_end]))
+                continue
+            unmatched = defaultdict(list)
+            for node_id in old_ids[old_start:old_end]:
+                unmatched[old.alignment_key(node_id)].append(node_id)
+            for node_id in new_ids[new_start:new_end]:
+                candidates = unmatched.get(new.alignment_key(node_id))
+                if candidates:
+                    pairs.append((candidates.pop(0), node_id))
+
+    return pairs
+
+def counterpart(source, target, aligned, touched, node_id):
+
+    path = []
+    while node_id not in aligned:
+        parent = source.tree_parent(node_id)
+        if parent is None:
+            return None
+        node_id, position = parent
+        path.append(position)
+
+    target_id = aligned[node_id]
+    if target_id in touched:
+        return None
+    for position in reversed(path):
+        target_id = target.outgoing[target_id][position][1]
+
+    return target_id
+
+def graph_diff(old_graph, new_graph, root=MODULE_ID):
+
+    old = signature(old_graph, root)
+    new = signature(new_graph, root)
+    delta = GraphDelta()
+
+    aligned = {}
+    claimed = set()
+    touched = {}
+    pending = [(old.root, new.root)]
+    while pending:
+        old_id, new_id = pending.pop()
+        if new_id in aligned or old_id in claimed:
+            continue
+        equal = old.hashes[old_id] == new.hashes[new_id]
+        if not equal and old.shared(old_id):
+            continue
+        aligned[new_id] = old_id
+        claimed.add(old_id)
+
+        if equal:
+            shift = new.anchors[new_id] - old.anchors[old_id]
+            if shift:
+                delta.shifts[old_id] = shift
+            continue
+
+        touched[old_id] = new_id
+        if old_id != old.root and old.nodes[old_id] != new.nodes[new_id]:
+            delta.changed_nodes[old_id] = new.nodes[new_id]
+        for old_child, new_child in pair_children(old, new, old.outgoing.get(old_id, ()), new.outgoing.get(new_id, ())):
+            if old.node_type(old_child) == new.node_type(new_child):
+                pending.append((old_child, new_child))
+
+    added = []
+    realigned = []
+    pending = [child for new_id in touched.values() for relation, child in new.outgoing.get(new_id, ())
+               if relation not in REFERENCE_RELATIONS]
+    while pending:
+        new_id = pending.pop()
+        if new_id in aligned or new_id in added:
+            continue
+        old_id = counterpart(new, old, aligned, touched, new_id)
+        if old_id is not None and old_id not in claimed:
+            aligned[new_id] = old_id
+            claimed.add(old_id)
+            realigned.append(new_id)
+            continue
+        if new_id not in new.nodes or (new_id in old.nodes and new_id not in claimed
+                                       and old.hashes.get(new_id) == new.hashes[new_id]
+                                       and old.anchors.get(new_id) == new.anchors[new_id]):
+            aligned[new_id] = new_id
+            claimed.add(new_id)
+            realigned.append(new_id)
+            continue
+        added.append(new_id)
+        pending.extend(child for relation, child in new.outgoing.get(new_id, ()) if relation not in REFERENCE_RELATIONS)
+
+    removed = set()
+    pending = [child for old_id in touched for relation, child in old.outgoing.get(old_id, ())
+               if relation not in REFERENCE_RELATIONS]
+    while pending:
+        old_id = pending.pop()
+        if old_id in claimed or old_id in removed or old_id not in old.nodes:
+            continue
+        removed.add(old_id)
+        pending.extend(child for relation, child in old.outgoing.get(old_id, ()) if relation not in REFERENCE_RELATIONS)
+
+    retained = [old_id for old_id in removed
+                if any(parent not in removed and parent not in touched and relation not in REFERENCE_RELATIONS
+                       for parent, relation in old.parents.get(old_id, ()))]
+    while retained:
+        old_id = retained.pop()
+        if old_id in removed:
+            removed.discard(old_id)
+            retained.extend(child for relation, child in old.outgoing.get(old_id, ())
+                            if relation not in REFERENCE_RELATIONS and child in removed)
+
+    patched_ids = {}
+    for new_id in added:
+        patched_id = new_id
+        suffix = 0
+        while (patched_id in old.nodes and patched_id not in removed) or patched_id in delta.added_nodes:
+            suffix += 1
+            patched_id = f"{new_id}#{suffix}"
+        patched_ids[new_id] = patched_id
+        delta.added_nodes[patched_id] = new.nodes[new_id]
+
+    def patched_id(new_id):
+        if new_id in aligned:
+            return aligned[new_id]
+        if new_id in patched_ids:
+            return patched_ids[new_id]
+        return counterpart(new, old, aligned, touched, new_id)
+
+    def patched_children(new_id):
+        return [(relation, patched_id(child)) for relation, child in new.outgoing.get(new_id, ())]
+
+    for old_id, new_id in touched.items():
+        children = patched_children(new_id)
+        if children != old.outgoing.get(old_id, []):
+            delta.outgoing[old_id] = children
+    for new_id in added:
+        children = patched_children(new_id)
+        if children:
+            delta.outgoing[patched_ids[new_id]] = children
+
+    referrers = {}
+    old_ids = {old_id: new_id for new_id, old_id in aligned.items()}
+    touched_new = set(touched.values())
+    for old_id in [*removed, *touched, *(aligned[new_id] for new_id in realigned)]:
+        for source, relation in old.parents.get(old_id, ()):
+            if relation in REFERENCE_RELATIONS and source not in removed and source not in touched:
+                referrers.setdefault(source, counterpart(old, new, old_ids, touched_new, source))
+    for new_id in [*added, *touched_new, *realigned]:
+        for source, relation in new.parents.get(new_id, ()):
+            if relation in REFERENCE_RELATIONS and source not in patched_ids and source not in touched_new:
+                old_id = patched_id(source)
+                if old_id is not None:
+                    referrers.setdefault(old_id, source)
+    for old_id, new_id in referrers.items():
+        if new_id is None:
+            continue
+        children = patched_children(new_id)
+        if children != old.outgoing.get(old_id, []):
+            delta.outgoing[old_id] = children
+    delta.removed_nodes = sorted(removed)
+
+    return delta
+
+def patch(nodes, edges, delta):
+
+    patched_nodes = dict(nodes)
+    for node_id in delta.removed_nodes:
+        patched_nodes.pop(node_id, None)
+
+    if delta.shifts:
+        outgoing = defaultdict(list)
+        for source, relation, destination in edges:
+            if relation not in REFERENCE_RELATIONS:
+                outgoing[source].append(destination)
+        seen = set()
+        for node_id, shift in delta.shifts.items():
+            pending = [node_id]
+            while pending:
+                current = pending.pop()
+                if current in seen:
+                    continue
+                seen.add(current)
+                pending.extend(outgoing.get(current, ()))
+                node = patched_nodes.get(current)
+                if node is None or not isinstance(node["attributes"], dict):
+                    continue
+                lineno = node["attributes"].get("lineno")
+                if lineno is None:
+                    continue
+                attributes = dict(node["attributes"])
+                attributes["lineno"] = lineno + shift
+                if node["attributes"].get("order") == lineno:
+                    attributes["order"] = lineno + shift
+                patched_nodes[current] = {"type": node["type"], "attributes": attributes}
+
+    patched_nodes.update(delta.changed_nodes)
+    patched_nodes.update(delta.added_nodes)
+
+    removed = set(delta.removed_nodes)
+    written = set()
+    patched_edges = []
+    for edge in edges:
+        source = edge[0]
+        if source in removed:
+            continue
+        if source in delta.outgoing:
+            if source not in written:
+                written.add(source)
+                patched_edges.extend((source, relation, destination) for relation, destination in delta.outgoing[source])
+            continue
+        patched_edges.append(edge)
+    for source, children in delta.outgoing.items():
+        if source not in written:
+            patched_edges.extend((source, relation, destination) for relation, destination in children)
+
+    return patched_nodes, patched_edges
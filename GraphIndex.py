@@ -0,0 +1,158 @@
+from collections import defaultdict
+from collections.abc import Sequence
+
+from ConstructAST import ConstructAST
+
+class GraphIndex:
+
+    def __init__(self, nodes=None, edges=None):
+
+        self.nodes = {}
+        self.edges = IndexEdges()
+        self.parent_edges = defaultdict(list)
+        self.by_type = defaultdict(dict)
+        self.by_kind = defaultdict(dict)
+        self.edge_dict = defaultdict(list)
+        self.indexed_edges = defaultdict(dict)
+        self.unsorted = set()
+
+        if nodes is not None:
+            for node_id, node in nodes.items():
+                self.add_node(node_id, node["type"], node["attributes"])
+        if edges is not None:
+            for source, relation, destination in edges:
+                self.add_edge(source, relation, destination)
+
+    def add_node(self, node_id, node_type, attributes):
+
+        previous = self.nodes.get(node_id)
+        if previous is not None:
+            self.by_type[previous["type"]].pop(node_id, None)
+            if previous["type"] == "Statement":
+                self.by_kind[previous["attributes"].get("kind")].pop(node_id, None)
+
+        self.nodes[node_id] = {"type": node_type, "attributes": attributes}
+        self.by_type[node_type][node_id] = None
+        if node_type == "Statement":
+            self.by_kind[attributes.get("kind")][node_id] = None
+
+    def add_edge(self, source, relation, destination):
+
+        self.edges.append((source, relation, destination))
+        self.parent_edges[destination].append((source, relation))
+        self.edge_dict[(source, relation)].append(destination)
+
+        indexed_relation = ConstructAST.split_indexed_relation(relation)
+        if indexed_relation is not None:
+            base, idx = indexed_relation
+            indexed_children = self.indexed_edges[source].setdefault(base, [])
+            if indexed_children and indexed_children[-1][0] > idx:
+                self.unsorted.add((source, base))
+            indexed_children.append((idx, destination))
+
+    def remove_node(self, node_id):
+
+        node = self.nodes.pop(node_id)
+        self.by_type[node["type"]].pop(node_id, None)
+        if node["type"] == "Statement":
+            self.by_kind[node["attributes"].get("kind")].pop(node_id, None)
+
+    def remove_edge(self, source, relation, destination):
+
+        self.edges.remove((source, relation, destination))
+        self.parent_edges[destination].remove((source, relation))
+        self.edge_dict[(source, relation)].remove(destination)
+
+        indexed_relation = ConstructAST.split_indexed_relation(relation)
+        if indexed_relation is not None:
+            base, idx = indexed_relation
+            self.indexed_edges[source][base].remove((idx, destination))
+
+    def flush(self):
+
+        pass
+
+    def close(self):
+
+        pass
+
+    def parents(self, node_id):
+
+        return self.parent_edges.get(node_id, [])
+
+    def children(self, source, relation):
+
+        return self.edge_dict.get((source, relation), [])
+
+    def nodes_of_type(self, node_type):
+
+        return list(self.by_type.get(node_type, ()))
+
+    def statements_of_kind(self, kind):
+
+        return list(self.by_kind.get(kind, ()))
+
+    def adjacency(self):
+
+        for source, base in self.unsorted:
+            self.indexed_edges[source][base].sort(key=lambda x: x[0])
+        self.unsorted.clear()
+
+        return self
+
+class IndexEdges(Sequence):
+
+    def __init__(self):
+
+        self.slots = []
+        self.positions = None
+        self.removed = 0
+
+    def append(self, edge):
+
+        if self.positions is not None:
+            self.positions[edge].append(len(self.slots))
+        self.slots.append(edge)
+
+    def remove(self, edge):
+
+        if self.positions is None:
+            self.index_positions()
+        positions = self.positions.get(edge)
+        if not positions:
+            raise ValueError(f"edge {edge!r} is not in the index")
+
+        self.slots[positions.pop(0)] = None
+        if not positions:
+            del self.positions[edge]
+        self.removed += 1
+        if self.removed * 2 > len(self.slots):
+            self.compact()
+
+    def index_positions(self):
+
+        self.positions = defaultdict(list)
+        for position, edge in enumerate(self.slots):
+            if edge is not None:
+                self.positions[edge].append(position)
+
+    def compact(self):
+
+        self.slots = [edge for edge in self.slots if edge is not None]
+        self.removed = 0
+        self.index_positions()
+
+    def __getitem__(self, position):
+
+        if self.removed:
+            self.compact()
+
+        return self.slots[position]
+
+    def __iter__(self):
+
+        return (edge for edge in self.slots if edge is not None)
+
+    def __len__(self):
+
+        return len(self.slots) - self.removed
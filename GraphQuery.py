@@ -0,0 +1,285 @@
+from collections import defaultdict
+
+def is_variable(term):
+
+    return isinstance(term, str) and term.startswith("?")
+
+class GraphQuery:
+
+    def __init__(self, nodes=None, edges=None):
+
+        self.nodes = {}
+        self.spo = defaultdict(list)
+        self.pos = defaultdict(dict)
+        self.osp = defaultdict(list)
+        self.edge_count = 0
+        self.by_type = defaultdict(dict)
+        self.attribute_indexes = {}
+        self.statistics = None
+        self.version = 0
+
+        if nodes is not None:
+            for node_id, node in nodes.items():
+                self.index_node(node_id, node)
+        if edges is not None:
+            for edge in edges:
+                self.index_edge(tuple(edge))
+
+    def add_node(self, node_id, node_type, attributes):
+
+        self.index_node(node_id, {"type": node_type, "attributes": attributes})
+
+    def add_edge(self, source, relation, destination):
+
+        self.index_edge((source, relation, destination))
+
+    def index_node(self, node_id, node):
+
+        previous = self.nodes.get(node_id)
+        if previous is not None:
+            self.by_type[previous["type"]].pop(node_id, None)
+            for name, index in self.attribute_indexes.items():
+                value = self.attribute(previous, name)
+                if value is not None:
+                    index.get(value, {}).pop(node_id, None)
+
+        self.nodes[node_id] = node
+        self.by_type[node["type"]][node_id] = None
+        for name, index in self.attribute_indexes.items():
+            value = self.attribute(node, name)
+            if value is not None:
+                index.setdefault(value, {})[node_id] = None
+        self.version += 1
+
+    def index_edge(self, edge):
+
+        source, relation, destination = edge
+        self.spo[source].append(edge)
+        self.pos[relation].setdefault(destination, []).append(source)
+        self.osp[destination].append(edge)
+        self.edge_count += 1
+        self.version += 1
+
+    def predicate_statistics(self):
+
+        if self.statistics is None or self.statistics[0] != self.version:
+            counts = {}
+            for relation, by_object in self.pos.items():
+                subjects = set()
+                count = 0
+                for sources in by_object.values():
+                    subjects.update(sources)
+                    count += len(sources)
+                counts[relation] = (count, len(subjects), len(by_object))
+            self.statistics = (self.version, counts)
+
+        return self.statistics[1]
+
+    def attribute(self, node, name):
+
+        attributes = node["attributes"]
+        if not isinstance(attributes, dict):
+            return None
+        value = attributes.get(name)
+        try:
+            hash(value)
+        except TypeError:
+            return None
+
+        return value
+
+    def attribute_index(self, name):
+
+        index = self.attribute_indexes.get(name)
+        if index is None:
+            index = {}
+            for node_id, node in self.nodes.items():
+                value = self.attribute(node, name)
+                if value is not None:
+                    index.setdefault(value, {})[node_id] = None
+            self.attribute_indexes[name] = index
+
+        return index
+
+    def accepts(self, node_id, node_filter):
+
+        node_type, attributes = node_filter
+        node = self.nodes.get(node_id)
+        if node is None:
+            return False
+        if node_type is not None and node["type"] != node_type:
+            return False
+        if attributes:
+            node_attributes = node["attributes"] if isinstance(node["attributes"], dict) else {}
+            for name, value in attributes.items():
+                if node_attributes.get(name) != value:
+                    return False
+
+        return True
+
+    def filters(self, types=None, attributes=None):
+
+        filters = {}
+        for variable in set(types or ()) | set(attributes or ()):
+            filters[variable] = ((types or {}).get(variable), (attributes or {}).get(variable) or {})
+
+        return filters
+
+    def candidate_sets(self, node_filter):
+
+        node_type, attributes = node_filter
+        sets = []
+        if node_type is not None:
+            sets.append(self.by_type.get(node_type, {}))
+        for name, value in attributes.items():
+            if value is None:
+                continue
+            try:
+                sets.append(self.attribute_index(name).get(value, {}))
+            except TypeError:
+                continue
+
+        return sets
+
+    def candidates(self, node_filter):
+
+        sets = self.candidate_sets(node_filter)
+        pool = min(sets, key=len) if sets else self.nodes
+        for node_id in pool:
+            if self.accepts(node_id, node_filter):
+                yield node_id
+
+    def selectivity(self, node_filter):
+
+        sets = self.candidate_sets(node_filter)
+        if not sets or not self.nodes:
+            return 1.0
+
+        return min(len(candidates) for candidates in sets) / len(self.nodes)
+
+    def estimate(self, pattern, bound, filters):
+
+        subject, predicate, obj = pattern
+        subject_bound = not is_variable(subject) or subject in bound
+        object_bound = not is_variable(obj) or obj in bound
+        if not is_variable(predicate) or predicate in bound:
+            if not is_variable(predicate):
+                count, subjects, objects = self.predicate_statistics().get(predicate, (0, 0, 0))
+            else:
+                count = self.edge_count / max(1, len(self.pos))
+                subjects = len(self.spo)
+                objects = len(self.osp)
+        else:
+            count = self.edge_count
+            subjects = len(self.spo)
+            objects = len(self.osp)
+
+        if subject_bound and object_bound:
+            cost = min(count, 1)
+        elif subject_bound:
+            cost = count / max(1, subjects)
+        elif object_bound:
+            cost = count / max(1, objects)
+        else:
+            cost = count
+
+        size = cost
+        for term in (subject, obj):
+            if is_variable(term) and term not in bound and term in filters:
+                size *= self.selectivity(filters[term])
+
+        return cost, size
+
+    def plan(self, patterns, types=None, attributes=None):
+
+        filters = self.filters(types, attributes)
+        remaining = list(patterns)
+        bound = set()
+        steps = []
+        while remaining:
+            pattern = min(remaining, key=lambda item: self.estimate(item, bound, filters))
+            cost, _ = self.estimate(pattern, bound, filters)
+            seeds = [variable for variable in filters if variable not in bound
+                     and any(variable in item for item in remaining)]
+            if seeds:
+                seed = min(seeds, key=lambda variable: self.selectivity(filters[variable]))
+                if self.selectivity(filters[seed]) * len(self.nodes) < cost:
+                    steps.append(("seed", seed))
+                    bound.add(seed)
+                    continue
+            remaining.remove(pattern)
+            steps.append(("pattern", pattern))
+            bound.update(term for term in pattern if is_variable(term))
+        for variable in filters:
+            if variable not in bound:
+                steps.append(("seed", variable))
+
+        return steps
+
+    def triples(self, subject, predicate, obj):
+
+        if subject is not None:
+            for edge in self.spo.get(subject, ()):
+                if (predicate is None or edge[1] == predicate) and (obj is None or edge[2] == obj):
+                    yield edge
+        elif obj is not None:
+            if predicate is not None:
+                for source in self.pos.get(predicate, {}).get(obj, ()):
+                    yield source, predicate, obj
+            else:
+                yield from self.osp.get(obj, ())
+        elif predicate is not None:
+            for destination, sources in self.pos.get(predicate, {}).items():
+                for source in sources:
+                    yield source, predicate, destination
+        else:
+            for edges in self.spo.values():
+                yield from edges
+
+    def extend(self, pattern, binding, filters):
+
+        lookup = [binding.get(term) if is_variable(term) else term for term in pattern]
+        for triple in self.triples(*lookup):
+            extended = binding
+            for term, value in zip(pattern, triple):
+                if not is_variable(term):
+                    continue
+                if term in extended:
+                    if extended[term] != value:
+                        break
+                    continue
+                if term in filters and not self.accepts(value, filters[term]):
+                    break
+                if extended is binding:
+                    extended = dict(binding)
+                extended[term] = value
+            else:
+                yield extended
+
+    def execute(self, steps, filters):
+
+        if not steps:
+            yield {}
+            return
+
+        pending = [iter(self.step_bindings(steps[0], {}, filters))]
+        while pending:
+            binding = next(pending[-1], None)
+            if binding is None:
+                pending.pop()
+            elif len(pending) == len(steps):
+                yield binding
+            else:
+                pending.append(iter(self.step_bindings(steps[len(pending)], binding, filters)))
+
+    def step_bindings(self, step, binding, filters):
+
+        kind, term = step
+        if kind == "pattern":
+            return self.extend(term, binding, filters)
+
+        return ({**binding, term: node_id} for node_id in self.candidates(filters[term]))
+
+    def match(self, patterns, types=None, attributes=None):
+
+        return self.execute(self.plan(patterns, types, attributes), self.filters(types, attributes))
@@ -0,0 +1,110 @@
+import json
+
+class MemorySink:
+
+    def __init__(self):
+
+        self.nodes = {}
+        self.edges = []
+
+    def add_node(self, node_id, node_type, attributes):
+
+        self.nodes[node_id] = {"type": node_type, "attributes": attributes}
+
+    def add_edge(self, source, relation, destination):
+
+        self.edges.append((source, relation, destination))
+
+    def flush(self):
+
+        pass
+
+    def close(self):
+
+        pass
+
+class NDJSONSink:
+
+    def __init__(self, target):
+
+        self.owns_handle = isinstance(target, str)
+        self.handle = open(target, "w", encoding="utf-8") if self.owns_handle else target
+
+    def write(self, record):
+
+        self.handle.write(json.dumps(record, default=repr))
+        self.handle.write("\n")
+
+    def add_node(self, node_id, node_type, attributes):
+
+        self.write({"node": node_id, "type": node_type, "attributes": attributes})
+
+    def add_edge(self, source, relation, destination):
+
+        self.write({"edge": [source, relation, destination]})
+
+    def flush(self):
+
+        self.handle.flush()
+
+    def close(self):
+
+        if self.owns_handle:
+            self.handle.close()
+        else:
+            self.handle.flush()
+
+class CallbackSink:
+
+    def __init__(self, on_node=None, on_edge=None):
+
+        self.on_node = on_node
+        self.on_edge = on_edge
+
+    def add_node(self, node_id, node_type, attributes):
+
+        if self.on_node is not None:
+            self.on_node(node_id, node_type, attributes)
+
+    def add_edge(self, source, relation, destination):
+
+        if self.on_edge is not None:
+            self.on_edge(source, relation, destination)
+
+    def flush(self):
+
+        pass
+
+    def close(self):
+
+        pass
+
+class BatchingSink:
+
+    def __init__(self, flush, batch_size=1000):
+
+        self.flush_batch = flush
+        self.batch_size = batch_size
+        self.batch = []
+
+    def add_node(self, node_id, node_type, attributes):
+
+        self.batch.append(("node", node_id, node_type, attributes))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def add_edge(self, source, relation, destination):
+
+        self.batch.append(("edge", source, relation, destination))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+
+        if self.batch:
+            batch, self.batch = self.batch, []
+            self.flush_batch(batch)
+
+    def close(self):
+
+        self.flush()
@@ -0,0 +1,253 @@
+import marshal
+import sqlite3
+from collections.abc import Mapping, Sequence
+
+from ConstructAST import ConstructAST
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    attributes BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS edges (
+    position INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    relation TEXT NOT NULL,
+    destination TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nodes_by_type ON nodes (type);
+CREATE INDEX IF NOT EXISTS edges_by_source ON edges (source, relation);
+CREATE INDEX IF NOT EXISTS edges_by_destination ON edges (destination);
+"""
+
+class GraphStore:
+
+    def __init__(self, path, batch_size=50000):
+
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.pending_nodes = []
+        self.pending_edges = []
+
+        self.nodes = StoreNodes(self)
+        self.edges = StoreEdges(self)
+
+    def add_graph(self, nodes, edges):
+
+        node_rows = ((node_id, node["type"], marshal.dumps(node["attributes"])) for node_id, node in nodes.items())
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO nodes VALUES (?, ?, ?)", node_rows)
+            self.connection.executemany("INSERT INTO edges (source, relation, destination) VALUES (?, ?, ?)", edges)
+
+    def add_node(self, node_id, node_type, attributes):
+
+        self.pending_nodes.append((node_id, node_type, marshal.dumps(attributes)))
+        if len(self.pending_nodes) >= self.batch_size:
+            self.flush()
+
+    def add_edge(self, source, relation, destination):
+
+        self.pending_edges.append((source, relation, destination))
+        if len(self.pending_edges) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO nodes VALUES (?, ?, ?)", self.pending_nodes)
+            self.connection.executemany("INSERT INTO edges (source, relation, destination) VALUES (?, ?, ?)", self.pending_edges)
+        self.pending_nodes = []
+        self.pending_edges = []
+
+    def close(self):
+
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exception):
+
+        self.close()
+
+    def node(self, node_id):
+
+        row = self.connection.execute("SELECT type, attributes FROM nodes WHERE id = ?", (node_id,)).fetchone()
+        if row is None:
+            return None
+
+        return {"type": row[0], "attributes": marshal.loads(row[1])}
+
+    def nodes_of_type(self, node_type):
+
+        rows = self.connection.execute("SELECT id FROM nodes WHERE type = ? ORDER BY id", (node_type,))
+
+        return [node_id for node_id, in rows]
+
+    def outgoing(self, source, relation=None):
+
+        if relation is None:
+            rows = self.connection.execute(
+                "SELECT source, relation, destination FROM edges WHERE source = ? ORDER BY position", (source,))
+        else:
+            rows = self.connection.execute(
+                "SELECT source, relation, destination FROM edges WHERE source = ? AND relation = ? ORDER BY position",
+                (source, relation))
+
+        return rows.fetchall()
+
+    def incoming(self, destination):
+
+        rows = self.connection.execute(
+            "SELECT source, relation, destination FROM edges WHERE destination = ? ORDER BY position", (destination,))
+
+        return rows.fetchall()
+
+    def adjacency(self):
+
+        return StoreAdjacency(self)
+
+class StoreNodes(Mapping):
+
+    def __init__(self, store):
+
+        self.store = store
+
+    def __getitem__(self, node_id):
+
+        node = self.store.node(node_id)
+        if node is None:
+            raise KeyError(node_id)
+
+        return node
+
+    def __contains__(self, node_id):
+
+        row = self.store.connection.execute("SELECT 1 FROM nodes WHERE id = ?", (node_id,)).fetchone()
+
+        return row is not None
+
+    def __iter__(self):
+
+        for node_id, in self.store.connection.execute("SELECT id FROM nodes ORDER BY rowid"):
+            yield node_id
+
+    def __len__(self):
+
+        return self.store.connection.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+class StoreEdges(Sequence):
+
+    def __init__(self, store):
+
+        self.store = store
+
+    def __getitem__(self, position):
+
+        if isinstance(position, slice):
+            return [self[idx] for idx in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+
+        row = self.store.connection.execute(
+            "SELECT source, relation, destination FROM edges ORDER BY position LIMIT 1 OFFSET ?", (position,)).fetchone()
+
+        return row
+
+    def __iter__(self):
+
+        yield from self.store.connection.execute("SELECT source, relation, destination FROM edges ORDER BY position")
+
+    def __len__(self):
+
+        return self.store.connection.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+
+class StoreAdjacency:
+
+    def __init__(self, store):
+
+        self.store = store
+        self.outgoing = {}
+        self.indexed = {}
+        self.edge_dict = StoreEdgeDict(self)
+        self.indexed_edges = StoreIndexedEdges(self)
+
+    def load(self, source):
+
+        outgoing = self.outgoing.get(source)
+        if outgoing is not None:
+            return outgoing
+
+        outgoing = {}
+        indexed = {}
+        for _, relation, destination in self.store.outgoing(source):
+            outgoing.setdefault(relation, []).append(destination)
+            indexed_relation = ConstructAST.split_indexed_relation(relation)
+            if indexed_relation is not None:
+                base, idx = indexed_relation
+                indexed.setdefault(base, []).append((idx, destination))
+        for indexed_children in indexed.values():
+            indexed_children.sort(key=lambda x: x[0])
+
+        self.outgoing[source] = outgoing
+        self.indexed[source] = indexed
+
+        return outgoing
+
+class StoreEdgeDict(Mapping):
+
+    def __init__(self, adjacency):
+
+        self.adjacency = adjacency
+
+    def __getitem__(self, key):
+
+        source, relation = key
+        destinations = self.adjacency.load(source).get(relation)
+        if destinations is None:
+            raise KeyError(key)
+
+        return destinations
+
+    def __iter__(self):
+
+        yield from self.adjacency.store.connection.execute("SELECT DISTINCT source, relation FROM edges")
+
+    def __len__(self):
+
+        return self.adjacency.store.connection.execute(
+            "SELECT COUNT(*) FROM (SELECT DISTINCT source, relation FROM edges)").fetchone()[0]
+
+class StoreIndexedEdges(Mapping):
+
+    def __init__(self, adjacency):
+
+        self.adjacency = adjacency
+
+    def __getitem__(self, source):
+
+        self.adjacency.load(source)
+        relations = self.adjacency.indexed[source]
+        if not relations:
+            raise KeyError(source)
+
+        return relations
+
+    def __iter__(self):
+
+        for source, in self.adjacency.store.connection.execute("SELECT DISTINCT source FROM edges"):
+            if self.adjacency.load(source) is not None and self.adjacency.indexed[source]:
+                yield source
+
+    def __len__(self):
+
+        return sum(1 for _ in self)
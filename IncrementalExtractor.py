@@ -0,0 +1,353 @@
+import ast
+import bisect
+import hashlib
+import importlib.util
+import io
+from collections import defaultdict
+
+from KnowledgeGraph import KnowledgeGraph
+
+DEFINITION_TYPES = {
+    ast.FunctionDef: "Function",
+    ast.AsyncFunctionDef: "AsyncFunction",
+    ast.ClassDef: "Class",
+}
+DEFINITION_NODE_TYPES = frozenset(DEFINITION_TYPES.values())
+STATEMENT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+MODULE_ID = "Module:<top>"
+PARENT_ID = "Parent:<unit>"
+
+class SourceUnit:
+
+    def __init__(self, statements, parent, start, end):
+
+        first = statements[0]
+        self.statements = statements
+        self.parent = parent
+        self.definition = type(first) in DEFINITION_TYPES
+        self.kind = type(first).__name__
+        self.name = first.name if self.definition else ""
+        self.start = start
+        self.end = end
+        self.children = []
+        self.segments = []
+        self.signature = None
+        self.dirty = True
+        self.roots = []
+        self.node_ids = []
+        self.edges = []
+
+def source_lines(source):
+
+    if isinstance(source, bytes):
+        source = importlib.util.decode_source(source)
+
+    return io.StringIO(source, newline=None).readlines()
+
+def statement_lines(statement):
+
+    start = statement.lineno
+    for decorator in getattr(statement, "decorator_list", ()):
+        start = min(start, decorator.lineno)
+
+    return start, statement.end_lineno
+
+def source_units(statements, lines):
+
+    units = []
+    for statement in statements:
+        start, end = statement_lines(statement)
+        if type(statement) in DEFINITION_TYPES or not units or units[-1].definition or units[-1].end < start:
+            units.append(SourceUnit([statement], None, start, end))
+        else:
+            units[-1].statements.append(statement)
+            units[-1].end = max(units[-1].end, end)
+
+    for unit in walk_units(units):
+        pending = []
+        for statement in unit.statements:
+            if unit.definition:
+                for field in STATEMENT_FIELDS:
+                    pending.extend(getattr(statement, field, ()))
+            else:
+                pending.append(statement)
+        while pending:
+            node = pending.pop()
+            if type(node) in DEFINITION_TYPES:
+                start, end = statement_lines(node)
+                unit.children.append(SourceUnit([node], unit, start, end))
+                continue
+            for field in STATEMENT_FIELDS:
+                pending.extend(getattr(node, field, ()))
+        unit.children.sort(key=lambda child: child.start)
+
+        digest = hashlib.blake2b(f"{unit.kind}\0{unit.name}\0".encode("utf-8"), digest_size=16)
+        start = unit.start
+        for child in unit.children:
+            if start < child.start:
+                unit.segments.append((start, child.start - 1))
+            digest.update("".join(lines[start - 1:child.start - 1]).encode("utf-8", "surrogatepass"))
+            digest.update(f"\0{child.kind} {child.name}\0".encode("utf-8"))
+            start = child.end + 1
+        if start <= unit.end:
+            unit.segments.append((start, unit.end))
+        digest.update("".join(lines[start - 1:unit.end]).encode("utf-8", "surrogatepass"))
+        unit.signature = digest.digest()
+
+    return units
+
+def walk_units(units):
+
+    pending = list(reversed(units))
+    while pending:
+        unit = pending.pop()
+        yield unit
+        pending.extend(reversed(unit.children))
+
+def unit_paths(units):
+
+    paths = {}
+    pending = [((), units)]
+    while pending:
+        prefix, siblings = pending.pop()
+        occurrences = defaultdict(int)
+        for unit in siblings:
+            key = (unit.kind, unit.name)
+            path = prefix + ((unit.kind, unit.name, occurrences[key]),)
+            occurrences[key] += 1
+            paths[path] = unit
+            pending.append((path, unit.children))
+
+    return paths
+
+def definition_owner(unit):
+
+    if unit.parent is not None and unit.parent.definition:
+        return unit.parent
+
+    return None
+
+class UnitExtractor(KnowledgeGraph):
+
+    def __init__(self, kept):
+
+        super().__init__()
+        self.kept = kept
+        self.kept_edges = []
+
+    def visit(self, node):
+
+        kept_id = self.kept.get(id(node))
+        if kept_id is None:
+            return super().visit(node)
+
+        parent, relation = self.definition_parent(DEFINITION_TYPES[type(node)])
+        self.kept_edges.append((parent, relation, kept_id))
+
+class IncrementalExtractor:
+
+    def __init__(self, source, nodes=None, edges=None):
+
+        tree = ast.parse(source)
+        if nodes is None:
+            knowledge_graph = KnowledgeGraph()
+            knowledge_graph.visit(tree)
+            nodes, edges = knowledge_graph.nodes, knowledge_graph.edges
+
+        self.generation = 0
+        self.lines = source_lines(source)
+        self.nodes = dict(nodes)
+        self.edge_cache = None
+        self.units = source_units(tree.body, self.lines)
+        self.assign(list(walk_units(self.units)), self.nodes, list(edges))
+
+    @property
+    def edges(self):
+
+        if self.edge_cache is None:
+            self.edge_cache = [edge for unit in walk_units(self.units) for edge in unit.edges]
+
+        return self.edge_cache
+
+    def assign(self, units, nodes, edges):
+
+        definitions = {}
+        statement_units = {}
+        for unit in units:
+            if unit.definition:
+                statement = unit.statements[0]
+                definitions[(DEFINITION_TYPES[type(statement)], unit.name, statement.lineno)] = unit
+            else:
+                for line in range(unit.start, unit.end + 1):
+                    statement_units[line] = unit
+
+        for node_id, node in nodes.items():
+            if node["type"] in DEFINITION_NODE_TYPES:
+                attributes = node["attributes"]
+                unit = definitions.get((node["type"], attributes.get("name"), attributes.get("lineno")))
+                if unit is not None:
+                    unit.roots.append(node_id)
+
+        outgoing = defaultdict(list)
+        for edge in edges:
+            source, _, destination = edge
+            outgoing[source].append(edge)
+            if source == MODULE_ID and nodes[destination]["type"] not in DEFINITION_NODE_TYPES:
+                statement_units[nodes[destination]["attributes"]["lineno"]].roots.append(destination)
+
+        owners = {}
+        root_owners = {}
+        for unit in units:
+            seen = set(unit.roots)
+            unit.node_ids.extend(unit.roots)
+            pending = list(unit.roots)
+            while pending:
+                for edge in outgoing.get(pending.pop(), ()):
+                    destination = edge[2]
+                    if destination in seen or nodes[destination]["type"] in DEFINITION_NODE_TYPES:
+                        continue
+                    seen.add(destination)
+                    unit.node_ids.append(destination)
+                    pending.append(destination)
+            for node_id in unit.node_ids:
+                owners[node_id] = unit
+            for root in unit.roots:
+                root_owners[root] = unit
+
+        for edge in edges:
+            unit = root_owners.get(edge[2]) or owners.get(edge[0])
+            if unit is None:
+                raise ValueError(f"edge {edge!r} is not reachable from any source unit")
+            unit.edges.append(edge)
+
+    def update(self, source):
+
+        lines = source_lines(source)
+        old_lines = self.lines
+        limit = min(len(old_lines), len(lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == lines[prefix]:
+            prefix += 1
+        if prefix == len(old_lines) == len(lines):
+            return []
+        suffix = 0
+        while suffix < limit - prefix and old_lines[-1 - suffix] == lines[-1 - suffix]:
+            suffix += 1
+        delta = len(lines) - len(old_lines)
+        changed_end = len(old_lines) - suffix
+
+        first = max(bisect.bisect_right([unit.start for unit in self.units], prefix) - 1, 0)
+        last = len(self.units) - 1
+        for idx in range(first, len(self.units)):
+            if self.units[idx].end > changed_end:
+                last = idx
+                break
+        low = self.units[first].start if self.units and self.units[first].start <= prefix else 1
+        high = self.units[last].end if self.units and self.units[last].end > changed_end else len(old_lines)
+
+        try:
+            region = ast.parse("".join(lines[low - 1:high + delta]))
+            if low > 1 and any(isinstance(statement, ast.ImportFrom) and statement.module == "__future__"
+                               for statement in region.body):
+                raise SyntaxError("from __future__ imports must occur at the beginning of the file")
+            ast.increment_lineno(region, low - 1)
+        except SyntaxError:
+            region = ast.parse("".join(lines))
+            first, last = 0, len(self.units) - 1
+
+        old_paths = unit_paths(self.units[first:last + 1])
+        new_units = source_units(region.body, lines)
+        new_paths = unit_paths(new_units)
+
+        for path, unit in new_paths.items():
+            old_unit = old_paths.get(path)
+            unit.dirty = old_unit is None or old_unit.signature != unit.signature
+
+        for path, old_unit in old_paths.items():
+            unit = new_paths.get(path)
+            if unit is None or unit.dirty:
+                for node_id in old_unit.node_ids:
+                    self.nodes.pop(node_id, None)
+
+        kept = {}
+        kept_units = {}
+        for path, unit in new_paths.items():
+            if unit.dirty:
+                continue
+            old_unit = old_paths[path]
+            unit.roots = old_unit.roots
+            unit.node_ids = old_unit.node_ids
+            unit.edges = old_unit.edges
+            if unit.parent is not None and unit.parent.dirty:
+                unit.edges = [edge for edge in unit.edges if edge[2] not in unit.roots]
+            if unit.definition:
+                kept[id(unit.statements[0])] = unit.roots[0]
+                kept_units[unit.roots[0]] = unit
+            self.move_lines(unit, old_unit.segments, unit.segments)
+
+        if delta:
+            for unit in walk_units(self.units[last + 1:]):
+                segments = unit.segments
+                unit.start += delta
+                unit.end += delta
+                unit.segments = [(start + delta, end + delta) for start, end in segments]
+                self.move_lines(unit, segments, unit.segments)
+
+        self.generation += 1
+        dirty = [unit for unit in new_paths.values() if unit.dirty]
+        roots = [unit for unit in dirty if unit.parent is None or not unit.parent.dirty]
+        for index, unit in enumerate(roots):
+            extractor = UnitExtractor(kept)
+            rename = {}
+            owner = definition_owner(unit)
+            if owner is not None:
+                extractor.push_stack(PARENT_ID, DEFINITION_TYPES[type(owner.statements[0])])
+                rename[PARENT_ID] = owner.roots[0]
+            for statement in unit.statements:
+                extractor.visit(statement)
+
+            prefix_id = f"g{self.generation}.{index}."
+            for node_id in extractor.nodes:
+                rename[node_id] = prefix_id + node_id
+            nodes = {rename[node_id]: node for node_id, node in extractor.nodes.items()}
+            edges = [(rename.get(source, source), relation, rename.get(destination, destination))
+                     for source, relation, destination in extractor.edges]
+            for source, relation, kept_id in extractor.kept_edges:
+                kept_units[kept_id].edges.append((rename.get(source, source), relation, kept_id))
+
+            subtree = []
+            pending = [unit]
+            while pending:
+                current = pending.pop()
+                subtree.append(current)
+                pending.extend(child for child in current.children if child.dirty)
+            self.assign(subtree, nodes, edges)
+            self.nodes.update(nodes)
+
+        self.units[first:last + 1] = new_units
+        self.lines = lines
+        self.edge_cache = None
+
+        return dirty
+
+    def move_lines(self, unit, old_segments, new_segments):
+
+        if old_segments == new_segments:
+            return
+
+        old_starts = [start for start, _ in old_segments]
+        for node_id in unit.node_ids:
+            node = self.nodes[node_id]
+            attributes = node["attributes"]
+            lineno = attributes.get("lineno")
+            if lineno is None:
+                continue
+            idx = bisect.bisect_right(old_starts, lineno) - 1
+            moved_lineno = lineno + new_segments[idx][0] - old_segments[idx][0]
+            if moved_lineno == lineno:
+                continue
+            moved = dict(attributes)
+            moved["lineno"] = moved_lineno
+            if attributes.get("order") == lineno:
+                moved["order"] = moved_lineno
+            self.nodes[node_id] = {"type": node["type"], "attributes": moved}
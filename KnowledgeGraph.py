@@ -1,13 +1,34 @@
 import ast 
 from typing import Optional
 
+from CompactGraph import CompactGraph
+from ContentIds import content_ids as content_addressed
+from FoldOperations import fold_operations as folded
+from GraphSink import MemorySink
+from SymbolTable import SymbolTable
+
+EXTRACTOR_VERSION = "2"
+
 class KnowledgeGraph(ast.NodeVisitor):
 
-    def __init__(self):
+    def __init__(self, compact=False, sink=None, content_ids=False, intern_leaves=False, fold_operations=False,
+                 symbols=False):
         
-        self.nodes = {}
-        self.edges = []
+        if symbols and (content_ids or intern_leaves):
+            raise ValueError("symbols needs one Name node per occurrence; it cannot be combined with content_ids or intern_leaves")
+        if sink is None:
+            sink = CompactGraph() if compact else MemorySink()
+        self.sink = sink
+        self.content_ids = content_ids
+        self.fold_operations = fold_operations
+        self.buffer = MemorySink() if content_ids or fold_operations else sink
+        self.intern_leaves = intern_leaves
+        self.interned = {}
+        self.symbols = SymbolTable(self.add_edge) if symbols else None
+        self.nodes = getattr(sink, "nodes", None)
+        self.edges = getattr(sink, "edges", None)
         self.stack = []
+        self.stack_types = {}
         self.container = []
         self.class_count = 0
         self.function_count = 0
@@ -30,6 +51,7 @@ class KnowledgeGraph(ast.NodeVisitor):
         self.list_count = 0
         self.for_count = 0
         self.asyncfor_count = 0
+        self.asyncwith_count = 0
         self.augassign_count = 0
         self.import_count = 0
         self.importfrom_count = 0
@@ -55,6 +77,7 @@ class KnowledgeGraph(ast.NodeVisitor):
         self.with_count = 0
         self.with_item_count = 0 
         self.break_count = 0
+        self.continue_count = 0
         self.generator_count = 0
         self.starred_count = 0
         self.named_expression_count = 0
@@ -72,11 +95,94 @@ class KnowledgeGraph(ast.NodeVisitor):
 
     def add_node(self, node_id, node_type, attributes):
 
-        self.nodes[node_id] = {"type": node_type, "attributes": attributes}
+        self.buffer.add_node(node_id, node_type, attributes)
 
     def add_edge(self, source, relation, destination):
 
-        self.edges.append((source, relation, destination))
+        self.buffer.add_edge(source, relation, destination)
+
+    def intern_leaf(self, key, node_id):
+
+        if self.intern_leaves:
+            self.interned[key] = node_id
+
+    def add_operation(self, operation_name, prefix="operation"):
+
+        key = ("Operation", operation_name)
+        operation_id = self.interned.get(key)
+        if operation_id is None:
+            operation_id = f"{prefix}_{self.operation_count}"
+            self.operation_count += 1
+            self.add_node(operation_id, "Operation", {"operation": operation_name})
+            self.intern_leaf(key, operation_id)
+
+        return operation_id
+
+    def visit_Module(self, module_node):
+
+        self.enter_scope("Module:<top>", "Module")
+        self.generic_visit(module_node)
+        self.exit_scope()
+        if self.buffer is not self.sink:
+            self.write_buffer()
+        self.sink.flush()
+
+    def write_buffer(self):
+
+        nodes, edges = self.buffer.nodes, self.buffer.edges
+        if self.fold_operations:
+            nodes, edges = folded(nodes, edges)
+        if self.content_ids:
+            nodes, edges = content_addressed(nodes, edges)
+        for node_id, node in nodes.items():
+            self.sink.add_node(node_id, node["type"], node["attributes"])
+        for source, relation, destination in edges:
+            self.sink.add_edge(source, relation, destination)
+        self.buffer = MemorySink()
+
+    def enter_scope(self, scope_id, kind):
+
+        if self.symbols is not None:
+            self.symbols.enter(scope_id, kind)
+
+    def exit_scope(self):
+
+        if self.symbols is not None:
+            self.symbols.exit()
+
+    def enter_enclosing_scope(self, generator_index):
+
+        if self.symbols is not None and generator_index == 0:
+            self.symbols.enter_enclosing()
+
+    def exit_enclosing_scope(self, generator_index):
+
+        if self.symbols is not None and generator_index == 0:
+            self.symbols.exit_enclosing()
+
+    def define_symbol(self, name, node_id):
+
+        if self.symbols is not None:
+            self.symbols.define(name, node_id)
+
+    def define_parameter(self, scope_id, name, parameter_id):
+
+        if self.symbols is not None:
+            self.symbols.parameter(scope_id, name, parameter_id)
+
+    def declare_symbols(self, names, declaration):
+
+        if self.symbols is not None:
+            self.symbols.declare(names, declaration)
+
+    def push_stack(self, node_id, node_type):
+
+        self.stack.append(node_id)
+        self.stack_types[node_id] = node_type
+
+    def pop_stack(self):
+
+        self.stack_types.pop(self.stack.pop(), None)
 
     def statement_container(self):
         
@@ -85,7 +191,7 @@ class KnowledgeGraph(ast.NodeVisitor):
 
         if self.stack:
             top = self.stack[-1]
-            top_type = self.nodes[top]["type"]
+            top_type = self.stack_types[top]
 
             if top_type in ("Function", "AsyncFunction"):
                 return (top, "Has_Statement")
@@ -95,6 +201,40 @@ class KnowledgeGraph(ast.NodeVisitor):
 
         return ("Module:<top>", "Has_Statement")
 
+    def definition_parent(self, node_type):
+
+        if self.container:
+            return self.container[-1]
+
+        if self.stack:
+            parent = self.stack[-1]
+            parent_type = self.stack_types[parent]
+
+            if parent_type in ("Class", "Function", "AsyncFunction"):
+                if node_type == "Class":
+                    return (parent, "Has_class")
+                if node_type == "AsyncFunction":
+                    return (parent, "Has_Async_Function")
+                return (parent, "Has_def")
+
+        if node_type == "Class":
+            return ("Module:<top>", "Has_class")
+        if node_type == "AsyncFunction":
+            return ("Module:<top>", "Has_Async_Function")
+
+        return ("Module:<top>", "Has_def")
+
+    def visit_definition_body(self, definition_node, definition_id, node_type):
+
+        container, self.container = self.container, []
+        self.define_symbol(definition_node.name, definition_id)
+        self.enter_scope(definition_id, node_type)
+        self.push_stack(definition_id, node_type)
+        self.generic_visit(definition_node)
+        self.pop_stack()
+        self.exit_scope()
+        self.container = container
+
     def add_statement(self, statement_id, kind, lineno=None):
     
         order = lineno if lineno is not None else self.statement_count
@@ -117,6 +257,12 @@ class KnowledgeGraph(ast.NodeVisitor):
             annotation_id = self.handle_expression(arg_node.annotation, function_id=None)
             self.add_edge(parameter_id, "Annotation", annotation_id)
 
+    def attach_return_annotation(self, function_id, function_node):
+
+        if getattr(function_node, "returns", None) is not None:
+            annotation_id = self.handle_expression(function_node.returns, function_id=None)
+            self.add_edge(function_id, "ReturnAnnotation", annotation_id)
+
     def get_function_id(self):
 
         return self.stack[-1] if self.stack else None
@@ -131,6 +277,7 @@ class KnowledgeGraph(ast.NodeVisitor):
             parameter_id = f"Parameter_{self.parameter_count}"
             self.add_node(parameter_id, "Parameter", {"name": arg.arg, "position": position, "kind": "PositionOnly"})
             self.add_edge(function_id, "Has_Parameter", parameter_id)
+            self.define_parameter(function_id, arg.arg, parameter_id)
             ordered_position_parameter_ids.append(parameter_id)
             self.attach_param_annotation(parameter_id, arg, function_id)
             self.parameter_count += 1
@@ -140,6 +287,7 @@ class KnowledgeGraph(ast.NodeVisitor):
             parameter_id = f"Parameter_{self.parameter_count}"
             self.add_node(parameter_id, "Parameter", {"name": arg.arg, "position": position, "kind": "arg"})
             self.add_edge(function_id, "Has_Parameter", parameter_id)
+            self.define_parameter(function_id, arg.arg, parameter_id)
             self.attach_param_annotation(parameter_id, arg, function_id)
             ordered_position_parameter_ids.append(parameter_id)
             self.parameter_count += 1
@@ -150,6 +298,7 @@ class KnowledgeGraph(ast.NodeVisitor):
             parameter_id = f"Parameter_{self.parameter_count}"
             self.add_node(parameter_id, "Parameter", {"name": vararg.arg, "position": 0, "kind": "VariableArg"})
             self.add_edge(function_id, "Has_Parameter", parameter_id)
+            self.define_parameter(function_id, vararg.arg, parameter_id)
             self.attach_param_annotation(parameter_id, vararg, function_id)
             self.parameter_count += 1
 
@@ -158,6 +307,7 @@ class KnowledgeGraph(ast.NodeVisitor):
             parameter_id = f"Parameter_{self.parameter_count}"
             self.add_node(parameter_id, "Parameter", {"name": arg.arg, "position": idx, "kind": "KeywordOnly"})
             self.add_edge(function_id, "Has_Parameter", parameter_id)
+            self.define_parameter(function_id, arg.arg, parameter_id)
             self.attach_param_annotation(parameter_id, arg, function_id)
             ordered_kwonly_param_ids.append(parameter_id)
             self.parameter_count += 1
@@ -167,6 +317,7 @@ class KnowledgeGraph(ast.NodeVisitor):
             parameter_id = f"Parameter_{self.parameter_count}"
             self.add_node(parameter_id, "Parameter", {"name": kwarg.arg, "position": 0, "kind": "KeywordArg"})
             self.add_edge(function_id, "Has_Parameter", parameter_id)
+            self.define_parameter(function_id, kwarg.arg, parameter_id)
             self.attach_param_annotation(parameter_id, kwarg, function_id)
             self.parameter_count += 1
 
@@ -223,6 +374,7 @@ class KnowledgeGraph(ast.NodeVisitor):
             alias_asname = getattr(name, "asname", None)
             alias_id = self.add_alias(alias_name, alias_asname)
             self.add_edge(import_id, f"Alias_{idx}", alias_id)
+            self.define_symbol(alias_asname or alias_name.partition(".")[0], alias_id)
 
     def visit_ImportFrom(self, import_from_node):
         import_from_id = f"importfrom_{self.importfrom_count}"
@@ -247,6 +399,8 @@ class KnowledgeGraph(ast.NodeVisitor):
             alias_asname = getattr(alias, "asname", None)
             alias_id = self.add_alias(alias_name, alias_asname)
             self.add_edge(import_from_id, f"Alias_{idx}", alias_id)
+            if alias_name != "*":
+                self.define_symbol(alias_asname or alias_name, alias_id)
 
     def visit_ClassDef(self, class_node):
         
@@ -261,18 +415,25 @@ class KnowledgeGraph(ast.NodeVisitor):
             base_id = self.handle_expression(base, function_id=None)
             self.add_edge(class_id, f"Base_{idx}", base_id)
 
-        if self.stack and self.nodes[self.stack[-1]]["type"] == "Class":
-            self.add_edge(self.stack[-1], "Has_class", class_id)  
-        else:
-            self.add_edge("Module:<top>", "Has_class", class_id)  
+        for idx, keyword in enumerate(class_node.keywords):
+            value_id = self.handle_expression(keyword.value, function_id=None)
+            if keyword.arg is None:
+                self.add_edge(class_id, f"KeywordStar_{idx}", value_id)
+            else:
+                keyword_id = f"literal_{self.literal_count}"
+                self.literal_count += 1
+                self.add_node(keyword_id, "Literal", {"literal_value": keyword.arg})
+                self.add_edge(class_id, f"KeywordKey_{idx}", keyword_id)
+                self.add_edge(class_id, f"KeywordValue_{idx}", value_id)
+
+        parent, relation = self.definition_parent("Class")
+        self.add_edge(parent, relation, class_id)
 
         for idx, decorator in enumerate(class_node.decorator_list):
             decorator_id = self.handle_expression(decorator, function_id=None)
             self.add_edge(class_id, f"Decorator_{idx}", decorator_id)
 
-        self.stack.append(class_id)
-        self.generic_visit(class_node)
-        self.stack.pop()
+        self.visit_definition_body(class_node, class_id, "Class")
 
     def visit_FunctionDef(self, function_node):
         
@@ -282,51 +443,28 @@ class KnowledgeGraph(ast.NodeVisitor):
         self.add_node(function_id, "Function", {"name": function_node.name, "lineno": lineno, "order": order})
         self.function_count += 1
 
-        if self.stack:
-            parent = self.stack[-1]
-            parent_type = self.nodes[parent]["type"]
-
-            if parent_type == "Class":
-                self.add_edge(parent, "Has_def", function_id) 
-            elif parent_type == "Function":
-                self.add_edge(parent, "Has_def", function_id) 
-            else:
-                self.add_edge("Module:<top>", "Has_def", function_id)
-        else:
-            self.add_edge("Module:<top>", "Has_def", function_id)
+        parent, relation = self.definition_parent("Function")
+        self.add_edge(parent, relation, function_id)
 
         self.process_parameter_args(function_node, function_id)
+        self.attach_return_annotation(function_id, function_node)
 
-        self.stack.append(function_id)
-        self.generic_visit(function_node)
-        self.stack.pop()
+        self.visit_definition_body(function_node, function_id, "Function")
 
     def visit_AsyncFunctionDef(self, async_function_node):
         function_id = f"AsyncFunction_{self.async_function_count}"
         lineno = getattr(async_function_node, "lineno", None)
         order = lineno if lineno is not None else self.statement_count
-        self.add_node(function_id, "AsyncFunction", {"name": function_node.name, "lineno": lineno, "order": order})
+        self.add_node(function_id, "AsyncFunction", {"name": async_function_node.name, "lineno": lineno, "order": order})
         self.async_function_count += 1
 
-        if self.stack:
-            parent = self.stack[-1]
-            parent_type = self.nodes[parent]["type"]
-
-            if parent_type == "Class":
-                self.add_edge(parent, "Has_Async_Function", function_id)
-                # self.add_edge(parent, "Has_def", function_id)     # unify defs list
-            elif parent_type in ("Function", "AsyncFunction"):
-                self.add_edge(parent, "Has_Async_Function", function_id) 
-            else:
-                self.add_edge("Module:<top>", "Has_Async_Function", function_id)
-        else:
-            self.add_edge("Module:<top>", "Has_Async_Function", function_id)
+        parent, relation = self.definition_parent("AsyncFunction")
+        self.add_edge(parent, relation, function_id)
 
-        self.process_parameter_args(async_function_node)
+        self.process_parameter_args(async_function_node, function_id)
+        self.attach_return_annotation(function_id, async_function_node)
 
-        self.stack.append(function_id)
-        self.generic_visit(function_node)
-        self.stack.pop()
+        self.visit_definition_body(async_function_node, function_id, "AsyncFunction")
 
     def visit_Return(self, return_object):
         function_id = self.get_function_id()
@@ -334,8 +472,7 @@ class KnowledgeGraph(ast.NodeVisitor):
         self.return_count += 1
         self.add_statement(return_id, "Return", lineno=getattr(return_object, "lineno", None))
         
-        function_type = self.nodes.get(function_id, None)
-        function_type = function_type.get("type") if function_type else None
+        function_type = self.stack_types.get(function_id)
         if function_id and (function_type == "Function" or function_type == "AsyncFunction"):
             self.add_edge(function_id, "Returns", return_id)
 
@@ -368,6 +505,7 @@ class KnowledgeGraph(ast.NodeVisitor):
         self.add_statement(global_id, "Global", lineno=getattr(global_node, "lineno", None))
 
         names = getattr(global_node, "names", [])
+        self.declare_symbols(names, "global")
         for idx, name in enumerate(names):
             literal_id = f"literal_{self.literal_count}"
             self.literal_count += 1
@@ -381,7 +519,8 @@ class KnowledgeGraph(ast.NodeVisitor):
         self.add_statement(non_local_id, "Nonlocal", lineno=getattr(non_local_node, "lineno", None))
 
         names = getattr(non_local_node, "names", [])
-        for i, name in enumerate(names):
+        self.declare_symbols(names, "nonlocal")
+        for idx, name in enumerate(names):
             literal_id = f"literal_{self.literal_count}"
             self.literal_count += 1
             self.add_node(literal_id, "Literal", {"literal_value": str(name)})
@@ -406,7 +545,7 @@ class KnowledgeGraph(ast.NodeVisitor):
 
         self.container.append((while_id, "OrElse_Statement"))
         or_else = getattr(while_node, "orelse", [])
-        for statement in orelse:
+        for statement in or_else:
             self.visit(statement)
         self.container.pop()
 
@@ -451,7 +590,9 @@ class KnowledgeGraph(ast.NodeVisitor):
                 self.add_edge(handler_id, "Type", type_id)
             
             handler_name = getattr(handler, "name", None)
-            if h.name:
+            if handler_name:
+                self.define_symbol(handler_name, handler_id)
+            if handler_name:
                 name_literal = f"literal_{self.literal_count}"
                 self.literal_count += 1
                 self.add_node(name_literal, "Literal", {"literal_value": str(handler_name)})
@@ -518,13 +659,12 @@ class KnowledgeGraph(ast.NodeVisitor):
         if target:
             target_id = self.handle_expression(target, function_id)
             self.add_edge(augment_id, "Target", target_id)
+            if self.symbols is not None and isinstance(target, ast.Name):
+                self.symbols.use(target.id, target_id)
 
         operation = getattr(aug_assign_node, "op", None)
         if operation:
-            operation_name = type(operation).__name__
-            operation_id = f"operation_{self.operation_count}"
-            self.operation_count += 1
-            self.add_node(operation_id, "Operation", {"operation": operation_name})
+            operation_id = self.add_operation(type(operation).__name__)
             self.add_edge(augment_id, "Operation", operation_id)
 
         aug_value = getattr(aug_assign_node, "value", None)
@@ -534,7 +674,7 @@ class KnowledgeGraph(ast.NodeVisitor):
 
     def visit_AnnAssign(self, ann_assign_node):
         function_id = self.get_function_id()
-        annotation_id = f"annassign_{self.annassign_count}"
+        ann_id = f"annassign_{self.annassign_count}"
         self.annassign_count += 1
         self.add_statement(ann_id, "AnnAssign", lineno=getattr(ann_assign_node, "lineno", None))
 
@@ -565,6 +705,16 @@ class KnowledgeGraph(ast.NodeVisitor):
         with_id = f"with_{self.with_count}"
         self.with_count += 1
         self.add_statement(with_id, "With", lineno=getattr(with_node, "lineno", None))
+        self.process_with_statements(with_node, function_id, with_id)
+
+    def visit_AsyncWith(self, async_with_node):
+        function_id = self.get_function_id()
+        async_with_id = f"asyncwith_{self.asyncwith_count}"
+        self.asyncwith_count += 1
+        self.add_statement(async_with_id, "AsyncWith", lineno=getattr(async_with_node, "lineno", None))
+        self.process_with_statements(async_with_node, function_id, async_with_id)
+
+    def process_with_statements(self, with_node, function_id, with_id):
 
         with_items = getattr(with_node, "items", [])
         for idx, item in enumerate(with_items):
@@ -651,529 +801,650 @@ class KnowledgeGraph(ast.NodeVisitor):
         self.continue_count += 1
         self.add_statement(continue_id, "Continue", lineno=getattr(continue_node, "lineno", None))
 
-    def handle_expression(self, return_node, function_id):
+    def handle_expression(self, expression_node, function_id):
+
+        result = self.start_expression(expression_node, function_id)
+        if result.__class__ is str:
+            return result
+
+        handlers = self.expression_handlers
+        pending = [result.send]
+        send = result.send
+        value = None
+        while True:
+            try:
+                child = send(value)
+            except StopIteration as stop:
+                pending.pop()
+                value = stop.value
+                if not pending:
+                    return value
+                send = pending[-1]
+                continue
+
+            handler = handlers.get(child.__class__)
+            if handler is None:
+                handler = self.resolve_expression_handler(child.__class__)
+            result = handler(self, child, function_id)
+            if result.__class__ is str:
+                value = result
+            else:
+                send = result.send
+                pending.append(send)
+                value = None
 
-        if isinstance(return_node, ast.BinOp):
-            
-            binary_operator_id = f"binary_operator_{self.binary_operator_count}"
-            self.add_node(binary_operator_id, "Expression", {"type":"binary_operator"})
-            self.binary_operator_count += 1
-
-            operation = getattr(return_node, "op", None)
-            if operation:
-                operation_name = type(operation).__name__ 
-                operation_id = f"operation_{self.operation_count}"
-                self.add_node(operation_id, "Operation", {"operation":operation_name})
-                self.operation_count += 1
-                self.add_edge(binary_operator_id, "Operation", operation_id)
-
-            left = getattr(return_node, "left", None)
-            if left:
-                left_id = self.handle_expression(left, function_id)
-                self.add_edge(binary_operator_id, "Left", left_id)
-
-            right = getattr(return_node, "right", None)
-            if right:
-                right_id = self.handle_expression(right, function_id)
-                self.add_edge(binary_operator_id, "Right", right_id)
-
-            return binary_operator_id
-
-        if isinstance(return_node, ast.SetComp):
-            
-            set_comp_id = f"setcomp_{self.setcomp_count}"
-            self.setcomp_count += 1
-            self.add_node(set_comp_id, "Expression", {"type": "setcomp"})
-
-            element = getattr(return_node, "elt", None)
-            if element:
-                element_id = self.handle_expression(element, function_id)
-                self.add_edge(set_comp_id, "Element", element_id)
-
-            generators = getattr(return_node, "generators", [])
-            for idx, generator in enumerate(generators):
-                generator_id = f"generator_{self.generator_count}"
-                self.generator_count += 1
-                self.add_node(generator_id, "Expression", {"type": "generator"})
-                self.add_edge(set_comp_id, f"Gen_{idx}", generator_id)
-
-                target = getattr(generator, "target", None)
-                if target:
-                    target_id = self.handle_expression(target, function_id)
-                    self.add_edge(generator_id, "Target", target_id)
-
-                iterator = getattr(generator, "iter", None)
-                if iterator:
-                    iterator_id = self.handle_expression(iterator, function_id)
-                    self.add_edge(generator_id, "Iterator", iterator_id)
-
-                generator_ifs = getattr(generator, "ifs", [])
-                for ifs_idx, if_expression in enumerate(generator_ifs):
-                    if_id = self.handle_expression(if_expression, function_id)
-                    self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
-
-                async_literal = f"literal_{self.literal_count}"
-                self.literal_count += 1
-                self.add_node(async_literal, "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
-                self.add_edge(g_id, "IsAsync", async_lit)
-
-            return set_comp_id
-
-        if isinstance(return_node, ast.Lambda):
-            lambda_id = f"lambda_{self.lambda_count}"
-            self.lambda_count += 1
-            self.add_node(lambda_id, "Expression", {"type": "lambda"})
-
-            parameter_ids = []
-            args = getattr(return_node, "args", None)
-            if args:
-                for idx, arg in enumerate(getattr(args, "args", [])):
-                    parameter_id = f"Parameter_{self.parameter_count}"
-                    self.parameter_count += 1
-                    parameter_arg = getattr(arg, "arg", None)
-                    if parameter_arg:
-                        self.add_node(parameter_id, "Parameter", {"name": parameter_arg, "position": idx, "kind": "arg"})
-                        self.add_edge(lambda_id, f"Parameter_{idx}", parameter_id)
-                        parameter_ids.append(parameter_id)
-
-            defaults = getattr(args, "defaults", None)
-            defaults = list(defaults) if defaults else None
-            if defaults:
-                start = len(parameter_ids) - len(defaults)
-                for idx, default_expression in enumerate(defaults):
-                    parameter_id = parameter_ids[start + idx]
-                    default_id = self.handle_expression(default_expression, function_id)
-                    self.add_edge(parameter_id, "Default", default_id)
-
-            body = getattr(return_node, "body", None)
-            if body:
-                body_id = self.handle_expression(body, function_id)
-                self.add_edge(lambda_id, "Body", body_id)
-
-            return lambda_id
-
-        if isinstance(return_node, ast.Set):
-            set_id = f"set_{self.set_count}"
-            self.set_count += 1
-            self.add_node(set_id, "Expression", {"type": "set"})
-
-            elements = getattr(return_node, "elts", [])
-            for idx, element in enumerate(elements):
-                element_id = self.handle_expression(element, function_id)
-                self.add_edge(set_id, f"Element_{idx}", element_id)
-
-            return set_id
-
-        if isinstance(return_node, ast.DictComp):
-            
-            dictcomp_id = f"dictcomp_{self.dictcomp_count}"
-            self.dictcomp_count += 1
-            self.add_node(dictcomp_id, "Expression", {"type": "dictcomp"})
-
-            key_id = self.handle_expression(return_node.key, function_id)
-            value_id = self.handle_expression(return_node.value, function_id)
-            self.add_edge(dictcomp_id, "Key", key_id)
-            self.add_edge(dictcomp_id, "Value", value_id)
-
-            generators = getattr(return_node, "generators", [])
-            for idx, generator in enumerate(generators):
-                generator_id = f"generator_{self.generator_count}"
-                self.generator_count += 1
-                self.add_node(generator_id, "Expression", {"type": "generator"})
-                self.add_edge(dictcomp_id, f"Gen_{idx}", generator_id)
-
-                target_id = self.handle_expression(generator.target, function_id)
+    def start_expression(self, expression_node, function_id):
+
+        handler = self.expression_handlers.get(type(expression_node))
+        if handler is None:
+            handler = self.resolve_expression_handler(type(expression_node))
+
+        return handler(self, expression_node, function_id)
+
+    @classmethod
+    def resolve_expression_handler(cls, expression_type):
+
+        handler = cls.handle_other
+        for base in expression_type.__mro__[1:]:
+            if base in cls.expression_handlers:
+                handler = cls.expression_handlers[base]
+                break
+        cls.expression_handlers[expression_type] = handler
+
+        return handler
+
+    def handle_binary_operator(self, binary_operator_node, function_id):
+        
+        binary_operator_id = f"binary_operator_{self.binary_operator_count}"
+        self.add_node(binary_operator_id, "Expression", {"type":"binary_operator"})
+        self.binary_operator_count += 1
+
+        operation = getattr(binary_operator_node, "op", None)
+        if operation:
+            operation_id = self.add_operation(type(operation).__name__)
+            self.add_edge(binary_operator_id, "Operation", operation_id)
+
+        left = getattr(binary_operator_node, "left", None)
+        if left:
+            left_id = (yield left)
+            self.add_edge(binary_operator_id, "Left", left_id)
+
+        right = getattr(binary_operator_node, "right", None)
+        if right:
+            right_id = (yield right)
+            self.add_edge(binary_operator_id, "Right", right_id)
+
+        return binary_operator_id
+
+    def handle_setcomp(self, set_comp_node, function_id):
+        
+        set_comp_id = f"setcomp_{self.setcomp_count}"
+        self.setcomp_count += 1
+        self.add_node(set_comp_id, "Expression", {"type": "setcomp"})
+        self.enter_scope(set_comp_id, "Comprehension")
+
+        element = getattr(set_comp_node, "elt", None)
+        if element:
+            element_id = (yield element)
+            self.add_edge(set_comp_id, "Element", element_id)
+
+        generators = getattr(set_comp_node, "generators", [])
+        for idx, generator in enumerate(generators):
+            generator_id = f"generator_{self.generator_count}"
+            self.generator_count += 1
+            self.add_node(generator_id, "Expression", {"type": "generator"})
+            self.add_edge(set_comp_id, f"Gen_{idx}", generator_id)
+
+            target = getattr(generator, "target", None)
+            if target:
+                target_id = (yield target)
                 self.add_edge(generator_id, "Target", target_id)
 
-                iterator_id = self.handle_expression(generator.iter, function_id)
-                self.add_edge(generator_id, "Iter", iterator_id)
+            iterator = getattr(generator, "iter", None)
+            if iterator:
+                self.enter_enclosing_scope(idx)
+                iterator_id = (yield iterator)
+                self.exit_enclosing_scope(idx)
+                self.add_edge(generator_id, "Iterator", iterator_id)
 
-                generator_ifs = getattr(generator, "ifs", [])
-                for ifs_idx, if_expression in enumerate(generators_ifs):
-                    if_id = self.handle_expression(if_expression, function_id)
-                    self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
+            generator_ifs = getattr(generator, "ifs", [])
+            for ifs_idx, if_expression in enumerate(generator_ifs):
+                if_id = (yield if_expression)
+                self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
 
-                async_literal = f"literal_{self.literal_count}"
-                self.literal_count += 1
-                self.add_node(async_literal, "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
-                self.add_edge(generator_id, "IsAsync", async_literal)
+            async_literal = f"literal_{self.literal_count}"
+            self.literal_count += 1
+            self.add_node(async_literal, "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
+            self.add_edge(generator_id, "IsAsync", async_literal)
 
-            return dictcomp_id
+        self.exit_scope()
+        return set_comp_id
 
-        if isinstance(return_node, ast.Starred):
-            
-            starred_id = f"starred_{self.starred_count}"
-            self.starred_count += 1
-            self.add_node(starred_id, "Expression", {"type": "starred"})
-            value_id = self.handle_expression(return_node.value, function_id)
-            self.add_edge(starred_id, "Value", value_id)
-            
-            return star_id
+    def handle_lambda(self, lambda_node, function_id):
+        lambda_id = f"lambda_{self.lambda_count}"
+        self.lambda_count += 1
+        self.add_node(lambda_id, "Expression", {"type": "lambda"})
 
-        if isinstance(return_node, ast.Name):
-            
-            name_id = f"name_{self.name_count}"
-            self.add_node(name_id, "Name", {"name":return_node.id})
-            self.name_count += 1
-            
-            return name_id
+        args = getattr(lambda_node, "args", None)
+        position_only_args = getattr(args, "posonlyargs", [])
+        position_args = getattr(args, "args", [])
+        keyword_only_args = getattr(args, "kwonlyargs", [])
+        vararg = getattr(args, "vararg", None)
+        kwarg = getattr(args, "kwarg", None)
 
-        if isinstance(return_node, ast.Constant):
-            
-            literal_id = f"literal_{self.literal_count}"
-            self.add_node(literal_id, "Literal", {"literal_value":return_node.value})
+        parameters = [(arg, position, "PositionOnly") for position, arg in enumerate(position_only_args)]
+        parameters.extend((arg, position, "arg") for position, arg in enumerate(position_args, len(position_only_args)))
+        if vararg is not None:
+            parameters.append((vararg, 0, "VariableArg"))
+        parameters.extend((arg, position, "KeywordOnly") for position, arg in enumerate(keyword_only_args))
+        if kwarg is not None:
+            parameters.append((kwarg, 0, "KeywordArg"))
+
+        parameter_ids = []
+        for idx, (arg, position, kind) in enumerate(parameters):
+            parameter_id = f"Parameter_{self.parameter_count}"
+            self.parameter_count += 1
+            self.add_node(parameter_id, "Parameter", {"name": arg.arg, "position": position, "kind": kind})
+            self.add_edge(lambda_id, f"Parameter_{idx}", parameter_id)
+            self.define_parameter(lambda_id, arg.arg, parameter_id)
+            parameter_ids.append(parameter_id)
+
+        position_parameter_ids = parameter_ids[:len(position_only_args) + len(position_args)]
+        defaults = list(getattr(args, "defaults", None) or [])
+        start = len(position_parameter_ids) - len(defaults)
+        for idx, default_expression in enumerate(defaults):
+            default_id = (yield default_expression)
+            self.add_edge(position_parameter_ids[start + idx], "Default", default_id)
+
+        keyword_only_parameter_ids = [parameter_id for parameter_id, (_, _, kind) in zip(parameter_ids, parameters) if kind == "KeywordOnly"]
+        for parameter_id, default_expression in zip(keyword_only_parameter_ids, getattr(args, "kw_defaults", None) or []):
+            if default_expression is not None:
+                default_id = (yield default_expression)
+                self.add_edge(parameter_id, "Default", default_id)
+
+        body = getattr(lambda_node, "body", None)
+        if body:
+            self.enter_scope(lambda_id, "Lambda")
+            body_id = (yield body)
+            self.exit_scope()
+            self.add_edge(lambda_id, "Body", body_id)
+
+        return lambda_id
+
+    def handle_set(self, set_node, function_id):
+        set_id = f"set_{self.set_count}"
+        self.set_count += 1
+        self.add_node(set_id, "Expression", {"type": "set"})
+
+        elements = getattr(set_node, "elts", [])
+        for idx, element in enumerate(elements):
+            element_id = (yield element)
+            self.add_edge(set_id, f"Element_{idx}", element_id)
+
+        return set_id
+
+    def handle_dictcomp(self, dictcomp_node, function_id):
+        
+        dictcomp_id = f"dictcomp_{self.dictcomp_count}"
+        self.dictcomp_count += 1
+        self.add_node(dictcomp_id, "Expression", {"type": "dictcomp"})
+        self.enter_scope(dictcomp_id, "Comprehension")
+
+        key_id = (yield dictcomp_node.key)
+        value_id = (yield dictcomp_node.value)
+        self.add_edge(dictcomp_id, "Key", key_id)
+        self.add_edge(dictcomp_id, "Value", value_id)
+
+        generators = getattr(dictcomp_node, "generators", [])
+        for idx, generator in enumerate(generators):
+            generator_id = f"generator_{self.generator_count}"
+            self.generator_count += 1
+            self.add_node(generator_id, "Expression", {"type": "generator"})
+            self.add_edge(dictcomp_id, f"Gen_{idx}", generator_id)
+
+            target_id = (yield generator.target)
+            self.add_edge(generator_id, "Target", target_id)
+
+            self.enter_enclosing_scope(idx)
+            iterator_id = (yield generator.iter)
+            self.exit_enclosing_scope(idx)
+            self.add_edge(generator_id, "Iter", iterator_id)
+
+            generator_ifs = getattr(generator, "ifs", [])
+            for ifs_idx, if_expression in enumerate(generator_ifs):
+                if_id = (yield if_expression)
+                self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
+
+            async_literal = f"literal_{self.literal_count}"
             self.literal_count += 1
-            
+            self.add_node(async_literal, "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
+            self.add_edge(generator_id, "IsAsync", async_literal)
+
+        self.exit_scope()
+        return dictcomp_id
+
+    def handle_starred(self, starred_node, function_id):
+        
+        starred_id = f"starred_{self.starred_count}"
+        self.starred_count += 1
+        self.add_node(starred_id, "Expression", {"type": "starred"})
+        value_id = (yield starred_node.value)
+        self.add_edge(starred_id, "Value", value_id)
+        
+        return starred_id
+
+    def handle_name(self, name_node, function_id):
+        
+        key = ("Name", name_node.id)
+        name_id = self.interned.get(key)
+        if name_id is not None:
+            return name_id
+
+        name_id = f"name_{self.name_count}"
+        self.add_node(name_id, "Name", {"name":name_node.id})
+        self.name_count += 1
+        self.intern_leaf(key, name_id)
+        if self.symbols is not None:
+            self.symbols.record(name_node.id, name_id, name_node.ctx)
+        
+        return name_id
+
+    def handle_constant(self, constant_node, function_id):
+        
+        value = constant_node.value
+        key = ("Literal", type(value), repr(value))
+        literal_id = self.interned.get(key)
+        if literal_id is not None:
             return literal_id
 
-        if isinstance(return_node, ast.Attribute):
-            
-            attribute_id = f"attribute_{self.attribute_count}"
-            self.attribute_count += 1
-            self.add_node(attribute_id, "Expression", {"type": "attribute", "attribute_value": return_node.attr})
-            base_id = self.handle_expression(return_node.value, function_id)
-            self.add_edge(attribute_id, "Value", base_id)
-            
-            return attribute_id
+        literal_id = f"literal_{self.literal_count}"
+        self.add_node(literal_id, "Literal", {"literal_value":value})
+        self.literal_count += 1
+        self.intern_leaf(key, literal_id)
+        
+        return literal_id
 
+    def handle_attribute(self, attribute_node, function_id):
+        
+        attribute_id = f"attribute_{self.attribute_count}"
+        self.attribute_count += 1
+        self.add_node(attribute_id, "Expression", {"type": "attribute", "attribute_value": attribute_node.attr})
+        base_id = (yield attribute_node.value)
+        self.add_edge(attribute_id, "Value", base_id)
+        
+        return attribute_id
 
-        if isinstance(return_node, ast.NamedExpr):
-            
-            named_expression_id = f"namedexpr_{self.named_expression_count}"
-            self.named_expression_count += 1
-            self.add_node(named_expression_id, "Expression", {"type": "named_expression"})
+    def handle_named_expression(self, named_expression_node, function_id):
+        
+        named_expression_id = f"namedexpr_{self.named_expression_count}"
+        self.named_expression_count += 1
+        self.add_node(named_expression_id, "Expression", {"type": "named_expression"})
 
-            target_id = self.handle_expression(return_node.target, function_id)
-            value_id = self.handle_expression(return_node.value, function_id)
+        if self.symbols is not None:
+            self.symbols.assignment_expression = True
+        target_id = (yield named_expression_node.target)
+        value_id = (yield named_expression_node.value)
 
-            self.add_edge(named_expression_id, "Target", target_id)
-            self.add_edge(named_expression_id, "Value", value_id)
+        self.add_edge(named_expression_id, "Target", target_id)
+        self.add_edge(named_expression_id, "Value", value_id)
 
-            return named_expression_id
+        return named_expression_id
 
-        if isinstance(return_node, ast.Yield):
-            
-            yield_id = f"yield_{self.yield_count}"
-            self.yield_count += 1
-            self.add_node(y_id, "Expression", {"type": "yield"})
+    def handle_yield(self, yield_node, function_id):
+        
+        yield_id = f"yield_{self.yield_count}"
+        self.yield_count += 1
+        self.add_node(yield_id, "Expression", {"type": "yield"})
 
-            value = getattr(return_node, "value", None)
-            if value:
-                value_id = self.handle_expression(value, function_id)
-                self.add_edge(yield_id, "Value", value_id)
+        value = getattr(yield_node, "value", None)
+        if value:
+            value_id = (yield value)
+            self.add_edge(yield_id, "Value", value_id)
 
-            return yield_id
+        return yield_id
 
-        if isinstance(return_node, ast.YieldFrom):
-            
-            yield_from_id = f"yieldfrom_{self.yield_count}"
-            self.yield_count += 1
-            self.add_node(yield_from_id, "Expression", {"type": "yieldfrom"})
+    def handle_yield_from(self, yield_from_node, function_id):
+        
+        yield_from_id = f"yieldfrom_{self.yield_count}"
+        self.yield_count += 1
+        self.add_node(yield_from_id, "Expression", {"type": "yieldfrom"})
 
-            value = getattr(return_node, "value", None)
-            if value:
-                value_id = self.handle_expression(value, function_id)
-                self.add_edge(yield_from_id, "Value", value_id)
+        value = getattr(yield_from_node, "value", None)
+        if value:
+            value_id = (yield value)
+            self.add_edge(yield_from_id, "Value", value_id)
 
-            return yield_from_id
+        return yield_from_id
 
-        if isinstance(return_node, ast.Await):
-            
-            await_id = f"await_{self.await_count}"
-            self.await_count += 1
-            self.add_node(await_id, "Expression", {"type": "await"})
+    def handle_await(self, await_node, function_id):
+        
+        await_id = f"await_{self.await_count}"
+        self.await_count += 1
+        self.add_node(await_id, "Expression", {"type": "await"})
 
-            value = getattr(return_node, "value", None)
-            if value:
-                value_id = self.handle_expression(value, function_id)
-                self.add_edge(await_id, "Value", value_id)
+        value = getattr(await_node, "value", None)
+        if value:
+            value_id = (yield value)
+            self.add_edge(await_id, "Value", value_id)
 
-            return await_id
+        return await_id
 
-        if isinstance(return_node, ast.Slice):
-            
-            slice_id = f"slice_{self.slice_count}"
-            self.slice_count += 1
-            self.add_node(slice_id, "Expression", {"type": "slice"})
+    def handle_slice(self, slice_node, function_id):
+        
+        slice_id = f"slice_{self.slice_count}"
+        self.slice_count += 1
+        self.add_node(slice_id, "Expression", {"type": "slice"})
 
-            lower = getattr(return_node, "lower", None)
-            if lower:
-                lower_id = self.handle_expression(lower, function_id)
-                self.add_edge(slice_id, "Lower", lower_id)
+        lower = getattr(slice_node, "lower", None)
+        if lower:
+            lower_id = (yield lower)
+            self.add_edge(slice_id, "Lower", lower_id)
 
-            upper = getattr(return_node, "upper", None)
-            if upper:
-                upper_id = self.handle_expression(upper, function_id)
-                self.add_edge(slice_id, "Upper", upper_id)
+        upper = getattr(slice_node, "upper", None)
+        if upper:
+            upper_id = (yield upper)
+            self.add_edge(slice_id, "Upper", upper_id)
 
-            step = getattr(return_node, "step", None)
-            if step:
-                step_id = self.handle_expression(step, function_id)
-                self.add_edge(slice_id, "Step", step_id)
+        step = getattr(slice_node, "step", None)
+        if step:
+            step_id = (yield step)
+            self.add_edge(slice_id, "Step", step_id)
 
-            return slice_id
+        return slice_id
 
-        if isinstance(return_node, ast.GeneratorExp):
-            
-            generator_expression_id = f"generator_expression_{self.generator_expression_count}"
-            self.generator_expression_count += 1
-            self.add_node(generator_expression_id, "Expression", {"type": "generator_expression"})
+    def handle_generator_expression(self, generator_expression_node, function_id):
+        
+        generator_expression_id = f"generator_expression_{self.generator_expression_count}"
+        self.generator_expression_count += 1
+        self.add_node(generator_expression_id, "Expression", {"type": "generator_expression"})
+        self.enter_scope(generator_expression_id, "Comprehension")
+
+        element_id = (yield generator_expression_node.elt)
+        self.add_edge(generator_expression_id, "Element", element_id)
+
+        generators = getattr(generator_expression_node, "generators", [])
+        for idx, generator in enumerate(generator_expression_node.generators):
+            generator_id = f"generator_{self.generator_count}"
+            self.generator_count += 1
+            self.add_node(generator_id, "Expression", {"type": "generator"})
+            self.add_edge(generator_expression_id, f"Gen_{idx}", generator_id)
+
+            target_id = (yield generator.target)
+            self.add_edge(generator_id, "Target", target_id)
+
+            self.enter_enclosing_scope(idx)
+            iterator_id = (yield generator.iter)
+            self.exit_enclosing_scope(idx)
+            self.add_edge(generator_id, "Iterator", iterator_id)
+
+            ifs = getattr(generator, "ifs", [])
+            for ifs_idx, if_expression in enumerate(ifs):
+                if_id = (yield if_expression)
+                self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
+
+            async_literal = f"{generator_id}_async"
+            self.add_node(async_literal, "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
+            self.add_edge(generator_id, "IsAsync", async_literal)
+
+        self.exit_scope()
+        return generator_expression_id
+
+    def handle_call(self, call_node, function_id):
+        
+        call_id = f"call_{self.call_count}"
+        self.call_count += 1
+        self.add_node(call_id, "Expression", {"type": "call"})
+
+        function = getattr(call_node, "func", None)
+        if function:
+            function_expression = (yield function)
+            self.add_edge(call_id, "Function_call", function_expression)
+
+        args = getattr(call_node, "args", [])
+        for idx, arg in enumerate(args):
+            arg_id = (yield arg)
+            self.add_edge(call_id, f"Arg_{idx}", arg_id)
+
+        keywords = getattr(call_node, "keywords", [])
+        for idx, keyword in enumerate(keywords):
+            if keyword.arg is None:
+                value_id = (yield keyword.value)
+                self.add_edge(call_id, f"KeywordStar_{idx}", value_id)
+            else:
+                keyword_id = f"literal_{self.literal_count}"
+                self.literal_count += 1
+                self.add_node(keyword_id, "Literal", {"literal_value": keyword.arg})
 
-            element_id = self.handle_expression(return_node.elt, function_id)
-            self.add_edge(generator_expression_id, "Element", element_id)
+                value_id = (yield keyword.value)
+                self.add_edge(call_id, f"KeywordKey_{idx}", keyword_id)
+                self.add_edge(call_id, f"KeywordValue_{idx}", value_id)
+        
+        return call_id
 
-            generators = getattr(return_node, "generators", [])
-            for idx, generator in enumerate(return_node.generators):
-                generator_id = f"generator_{self.generator_count}"
-                self.generator_count += 1
-                self.add_node(generator_id, "Expression", {"type": "generator"})
-                self.add_edge(generator_expression_id, f"Gen_{idx}", generator_id)
+    def handle_subscript(self, subscript_node, function_id):
+        
+        subscript_id = f"subscript_{self.subscript_count}"
+        self.subscript_count += 1
+        self.add_node(subscript_id, "Expression", {"type": "subscript"})
+        value_id = (yield subscript_node.value)
+        slice_id = (yield subscript_node.slice)
+        self.add_edge(subscript_id, "Value", value_id)
+        self.add_edge(subscript_id, "Slice", slice_id)
+        
+        return subscript_id
 
-                target_id = self.handle_expression(generator.target, function_id)
-                self.add_edge(generator_id, "Target", target_id)
+    def handle_compare(self, compare_node, function_id):
+        
+        compare_id = f"compare_{self.compare_count}"
+        self.compare_count += 1
+        self.add_node(compare_id, "Expression", {"type": "compare"})
 
-                iterator_id = self.handle_expression(generator.iter, function_id)
-                self.add_edge(generator_id, "Iterator", iterator_id)
+        left = getattr(compare_node, "left", None)
+        if left:
+            left_id = (yield left)
+            self.add_edge(compare_id, "Left", left_id)
 
-                ifs = getattr(generator, "ifs", [])
-                for ifs_idx, if_expression in enumerate(ifs):
-                    if_id = self.handle_expression(if_expression, function_id)
-                    self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
+        for idx, (operation, comparator) in enumerate(zip(compare_node.ops, compare_node.comparators)):
+            operation_id = self.add_operation(type(operation).__name__)
+            self.add_edge(compare_id, f"Op_{idx}", operation_id)
 
-                async_literal = f"{generator_id}_async"
-                self.add_node(async_literal, "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
-                self.add_edge(generator_id, "IsAsync", async_literal)
+            comparator_id = (yield comparator)
+            self.add_edge(compare_id, f"Comparator_{idx}", comparator_id)
 
-            return generator_expression_id
+        return compare_id
 
-        if isinstance(return_node, ast.Call):
-            
-            call_id = f"call_{self.call_count}"
-            self.call_count += 1
-            self.add_node(call_id, "Expression", {"type": "call"})
-
-            function = getattr(return_node, "func", None)
-            if function:
-                function_expression = self.handle_expression(function, function_id)
-                self.add_edge(call_id, "Function_call", function_expression)
-
-            args = getattr(return_node, "args", [])
-            for idx, arg in enumerate(args):
-                arg_id = self.handle_expression(arg, function_id)
-                self.add_edge(call_id, f"Arg_{idx}", arg_id)
-
-            keywords = getattr(return_node, "keywords", [])
-            for idx, keyword in enumerate(keywords):
-                if keyword.arg is None:
-                    value_id = self.handle_expression(keyword.value, function_id)
-                    self.add_edge(call_id, f"KeywordStar_{idx}", value_id)
-                else:
-                    keyword_id = f"literal_{self.literal_count}"
-                    self.literal_count += 1
-                    self.add_node(keyword_id, "Literal", {"literal_value": keyword.arg})
-
-                    value_id = self.handle_expression(keyword.value, function_id)
-                    self.add_edge(call_id, f"KeywordKey_{idx}", keyword_id)
-                    self.add_edge(call_id, f"KeywordValue_{idx}", value_id)
-            
-            return call_id
+    def handle_tuple(self, tuple_node, function_id):
+        
+        tuple_id = f"tuple_{self.tuple_count}"
+        self.tuple_count += 1
+        self.add_node(tuple_id, "Expression", {"type": "tuple"})
+        
+        elements = getattr(tuple_node, "elts", [])
+        for idx, element in enumerate(elements):
+            element_id = (yield element)
+            self.add_edge(tuple_id, f"Element_{idx}", element_id)
+        
+        return tuple_id
 
-        if isinstance(return_node, ast.Subscript):
-            
-            subscript_id = f"subscript_{self.subscript_count}"
-            self.subscript_count += 1
-            self.add_node(subscript_id, "Expression", {"type": "subscript"})
-            value_id = self.handle_expression(return_node.value, function_id)
-            slice_id = self.handle_expression(return_node.slice, function_id)
-            self.add_edge(subscript_id, "Value", value_id)
-            self.add_edge(subscript_id, "Slice", slice_id)
-            
-            return subscript_id
+    def handle_dictionary(self, dictionary_node, function_id):
+        
+        dictionary_id = f"dictionary_{self.dictionary_count}"
+        self.dictionary_count += 1
+        self.add_node(dictionary_id, "Expression", {"type": "dict"})
+  
+        for idx, (key, value) in enumerate(zip(dictionary_node.keys, dictionary_node.values)):
+            if key is not None:
+                key_id = (yield key)
+                self.add_edge(dictionary_id, f"Key_{idx}", key_id)
+            value_id = (yield value)
+            self.add_edge(dictionary_id, f"Value_{idx}", value_id)
+        
+        return dictionary_id
 
-        if isinstance(return_node, ast.Compare):
-            
-            compare_id = f"compare_{self.compare_count}"
-            self.compare_count += 1
-            self.add_node(compare_id, "Expression", {"type": "compare"})
+    def handle_list(self, list_node, function_id):
+        
+        list_id = f"list_{self.list_count}"
+        self.list_count += 1
+        self.add_node(list_id, "Expression", {"type": "list"})
 
-            left = getattr(return_node, "left", None)
-            if left:
-                left_id = self.handle_expression(left, function_id)
-                self.add_edge(compare_id, "Left", left_id)
+        elements = getattr(list_node, "elts", [])
+        for idx, element in enumerate(elements):
+            element_id = (yield element)
+            self.add_edge(list_id, f"Element_{idx}", element_id)
 
-            for idx, (operation, comparator) in enumerate(zip(return_node.ops, return_node.comparators)):
-                operation_name = type(operation).__name__ 
-                operation_id = f"operation_{self.operation_count}"
-                self.operation_count += 1
-                self.add_node(operation_id, "Operation", {"operation": operation_name})
-                self.add_edge(compare_id, f"Op_{idx}", operation_id)
+        return list_id
 
-                comparator_id = self.handle_expression(comparator, function_id)
-                self.add_edge(compare_id, f"Comparator_{idx}", comparator_id)
+    def handle_joined_string(self, joined_string_node, function_id):
+        
+        joined_string_id = f"joinedstr_{self.joined_string_count}"
+        self.joined_string_count += 1
+        self.add_node(joined_string_id, "Expression", {"type": "joinedstr"})
+        
+        values = getattr(joined_string_node, "values", [])
+        for idx, value in enumerate(values):
+            value_id = (yield value)
+            self.add_edge(joined_string_id, f"Value_{idx}", value_id)
+        
+        return joined_string_id
 
-            return compare_id
+    def handle_list_comp(self, list_comp_node, function_id):
+        
+        list_comp_id = f"listcomp_{self.list_comp_count}"
+        self.list_comp_count += 1
+        self.add_node(list_comp_id, "Expression", {"type": "listcomp"})
+        self.enter_scope(list_comp_id, "Comprehension")
 
-        if isinstance(return_node, ast.Tuple):
-            
-            tuple_id = f"tuple_{self.tuple_count}"
-            self.tuple_count += 1
-            self.add_node(tuple_id, "Expression", {"type": "tuple"})
-            
-            elements = getattr(return_node, "elts", [])
-            for idx, element in enumerate(elements):
-                element_id = self.handle_expression(element, function_id)
-                self.add_edge(tuple_id, f"Element_{idx}", element_id)
-            
-            return tuple_id
+        element_id = (yield list_comp_node.elt)
+        self.add_edge(list_comp_id, "Element", element_id)
 
-        if isinstance(return_node, ast.Dict):
-            
-            dictionary_id = f"dictionary_{self.dictionary_count}"
-            self.dictionary_count += 1
-            self.add_node(dictionary_id, "Expression", {"type": "dict"})
-      
-            for idx, (key, value) in enumerate(zip(return_node.keys, return_node.values)):
-                if key is not None:
-                    key_id = self.handle_expression(key, function_id)
-                    self.add_edge(dictionary_id, f"Key_{idx}", key_id)
-                value_id = self.handle_expression(value, function_id)
-                self.add_edge(dictionary_id, f"Value_{idx}", value_id)
-            
-            return dictionary_id
+        generators = getattr(list_comp_node, "generators", [])
+        for idx, generator in enumerate(generators):
+            generator_id = f"generator_{self.generator_count}"
+            self.generator_count += 1
+            self.add_node(generator_id, "Expression", {"type": "generator"})
+            self.add_edge(list_comp_id, f"Gen_{idx}", generator_id)
 
-        if isinstance(return_node, ast.List):
-            
-            list_id = f"list_{self.list_count}"
-            self.list_count += 1
-            self.add_node(list_id, "Expression", {"type": "list"})
+            target_id = (yield generator.target)
+            self.add_edge(generator_id, "Target", target_id)
 
-            elements = getattr(return_node, "elts", [])
-            for idx, element in enumerate(elements):
-                element_id = self.handle_expression(element, function_id)
-                self.add_edge(list_id, f"Element_{idx}", element_id)
+            self.enter_enclosing_scope(idx)
+            iterator_id = (yield generator.iter)
+            self.exit_enclosing_scope(idx)
+            self.add_edge(generator_id, "Iterator", iterator_id)
 
-            return list_id
+            generator_ifs = getattr(generator, "ifs", [])
+            for ifs_idx, if_expression in enumerate(generator_ifs):
+                if_id = (yield if_expression)
+                self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
 
-        if isinstance(return_node, ast.JoinedStr):
-            
-            joined_string_id = f"joinedstr_{self.joined_string_count}"
-            self.joined_string_count += 1
-            self.add_node(joined_string_id, "Expression", {"type": "joinedstr"})
-            
-            values = getattr(return_node, "values", [])
-            for idx, value in enumerate(values):
-                value_id = self.handle_expression(value, function_id)
-                self.add_edge(joined_string_id, f"Value_{idx}", value_id)
-            
-            return joined_string_id
+            self.add_node(f"{generator_id}_async", "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
+            self.add_edge(generator_id, "IsAsync", f"{generator_id}_async")
 
-        if isinstance(return_node, ast.ListComp):
-            
-            list_comp_id = f"listcomp_{self.list_comp_count}"
-            self.list_comp_count += 1
-            self.add_node(list_comp_id, "Expression", {"type": "listcomp"})
+        self.exit_scope()
+        return list_comp_id
 
-            element_id = self.handle_expression(return_node.elt, function_id)
-            self.add_edge(list_comp_id, "Element", element_id)
+    def handle_formatted_value(self, formatted_value_node, function_id):
+        
+        formatted_value_id = f"formatted_{self.formatted_value_count}"
+        self.formatted_value_count += 1
+        conversion = getattr(formatted_value_node, "conversion", -1)
+        self.add_node(formatted_value_id, "Expression", {"type": "formatted_value", "conversion": conversion})
+        value_id = (yield formatted_value_node.value)
+        self.add_edge(formatted_value_id, "Value", value_id)
+ 
+        format_specification = getattr(formatted_value_node, "format_spec", None)
+        if format_specification:
+            format_specification_id = (yield format_specification)
+            self.add_edge(formatted_value_id, "FormatSpecification", format_specification_id)
+        
+        return formatted_value_id
 
-            generators = getattr(return_node, "generators", [])
-            for idx, generator in enumerate(generators):
-                generator_id = f"generator_{self.generator_count}"
-                self.generator_count += 1
-                self.add_node(generator_id, "Expression", {"type": "generator"})
-                self.add_edge(list_comp_id, f"Gen_{idx}", generator_id)
+    def handle_bool_operation(self, bool_operation_node, function_id):
+        
+        bool_id = f"boolop_{self.bool_operation_count}"
+        self.bool_operation_count += 1
+        self.add_node(bool_id, "Expression", {"type": "boolop"})
 
-                target_id = self.handle_expression(generator.target, function_id)
-                self.add_edge(generator_id, "Target", target_id)
+        operation = getattr(bool_operation_node, "op", None)
+        if operation:
+            operation_id = self.add_operation(type(operation).__name__, prefix="bool_operation")
+            self.add_edge(bool_id, "Operation", operation_id)
 
-                iterator_id = self.handle_expression(generator.iter, function_id)
-                self.add_edge(generator_id, "Iterator", iterator_id)
+        values = getattr(bool_operation_node, "values", [])
+        for idx, value in enumerate(values):
+            value_id = (yield value)
+            self.add_edge(bool_id, f"Value_{idx}", value_id)
 
-                generator_ifs = getattr(generator, "ifs", [])
-                for ifs_idx, if_expression in enumerate(generator_ifs):
-                    if_id = self.handle_expression(if_expression, function_id)
-                    self.add_edge(generator_id, f"If_{ifs_idx}", if_id)
+        return bool_id
 
-                self.add_node(f"{generator_id}_async", "Literal", {"literal_value": bool(getattr(generator, "is_async", False))})
-                self.add_edge(generator_id, "IsAsync", f"{generator_id}_async")
+    def handle_unary_operation(self, unary_node, function_id):
+        
+        unary_id = f"unaryop_{self.unary_count}"
+        self.unary_count += 1
+        self.add_node(unary_id, "Expression", {"type": "unaryop"})
 
-            return list_comp_id
+        operation = getattr(unary_node, "op", None)
+        if operation:
+            operation_id = self.add_operation(type(operation).__name__)
+            self.add_edge(unary_id, "Operation", operation_id)
 
-        if isinstance(return_node, ast.FormattedValue):
-            
-            formatted_value_id = f"formatted_{self.formatted_value_count}"
-            self.formatted_value_count += 1
-            self.add_node(formatted_value_id, "Expression", {"type": "formatted_value"})
-            value_id = self.handle_expression(return_node.value, function_id)
-            self.add_edge(formatted_value_id, "Value", value_id)
- 
-            format_specification = getattr(return_node, "format_spec", None)
-            if format_specification:
-                format_specification_id = self.handle_expression(format_specification, function_id)
-                self.add_edge(formatted_value_id, "FormatSpecification", format_specification_id)
-            
-            return formatted_value_id
+        operand = getattr(unary_node, "operand", None)
+        if operand:
+            operand_id = (yield operand)
+            self.add_edge(unary_id, "Operand", operand_id)
+        
+        return unary_id
 
-        if isinstance(return_node, ast.BoolOp):
-            
-            bool_id = f"boolop_{self.bool_operation_count}"
-            self.bool_operation_count += 1
-            self.add_node(bool_id, "Expression", {"type": "boolop"})
-
-            operation = getattr(return_node, "op", None)
-            if operation:
-                operation_name = type(operation).__name__ 
-                operation_id = f"bool_operation_{self.operation_count}"
-                self.operation_count += 1
-                self.add_node(operation_id, "Operation", {"operation": operation_name})
-                self.add_edge(bool_id, "Operation", operation_id)
-
-            values = getattr(return_node, "values", [])
-            for idx, value in enumerate(values):
-                value_id = self.handle_expression(value, function_id)
-                self.add_edge(bool_id, f"Value_{idx}", value_id)
-
-            return bool_id
-
-        if isinstance(return_node, ast.UnaryOp):
-            
-            unary_id = f"unaryop_{self.unary_count}"
-            self.unary_count += 1
-            self.add_node(unary_id, "Expression", {"type": "unaryop"})
-
-            operation = getattr(return_node, "op", None)
-            if operation:
-                operation_name = type(operation).__name__ 
-                operation_id = f"operation_{self.operation_count}"
-                self.operation_count += 1
-                self.add_node(operation_id, "Operation", {"operation": operation_name})
-                self.add_edge(unary_id, "Operation", operation_id)
-
-            operand = getattr(return_node, "operand", None)
-            if operand:
-                operand_id = self.handle_expression(operand, function_id)
-                self.add_edge(unary_id, "Operand", operand_id)
-            
-            return unary_id
+    def handle_if_expression(self, if_expression_node, function_id):
+        
+        if_expression_id = f"ifexp_{self.if_expression_count}"
+        self.if_expression_count += 1
+        self.add_node(if_expression_id, "Expression", {"type": "if_expression"})
 
-        if isinstance(return_node, ast.IfExp):
-            
-            if_expression_id = f"ifexp_{self.if_expression_count}"
-            self.if_expression_count += 1
-            self.add_node(if_expression_id, "Expression", {"type": "if_expression"})
+        condition_id = (yield if_expression_node.test)
+        body_id = (yield if_expression_node.body)
+        else_id = (yield if_expression_node.orelse)
 
-            condition_id = self.handle_expression(return_node.test, function_id)
-            body_id = self.handle_expression(return_node.body, function_id)
-            else_id = self.handle_expression(return_node.orelse, function_id)
+        self.add_edge(if_expression_id, "Condition", condition_id)
+        self.add_edge(if_expression_id, "Body", body_id)
+        self.add_edge(if_expression_id, "OrElse", else_id)
 
-            self.add_edge(if_expression_id, "Condition", condition_id)
-            self.add_edge(if_expression_id, "Body", body_id)
-            self.add_edge(if_expression_id, "OrElse", else_id)
+        return if_expression_id
 
-            return if_expression_id
+    def handle_other(self, other_node, function_id):
 
         other_id = f"other_{self.other_count}"
-        self.add_node(other_id, "Expression", {"name":type(return_node).__name__})
+        self.add_node(other_id, "Expression", {"name":type(other_node).__name__})
         self.other_count += 1
         
-        return other_id
\ No newline at end of file
+        return other_id
+
+    expression_handlers = {
+        ast.BinOp: handle_binary_operator,
+        ast.SetComp: handle_setcomp,
+        ast.Lambda: handle_lambda,
+        ast.Set: handle_set,
+        ast.DictComp: handle_dictcomp,
+        ast.Starred: handle_starred,
+        ast.Name: handle_name,
+        ast.Constant: handle_constant,
+        ast.Attribute: handle_attribute,
+        ast.NamedExpr: handle_named_expression,
+        ast.Yield: handle_yield,
+        ast.YieldFrom: handle_yield_from,
+        ast.Await: handle_await,
+        ast.Slice: handle_slice,
+        ast.GeneratorExp: handle_generator_expression,
+        ast.Call: handle_call,
+        ast.Subscript: handle_subscript,
+        ast.Compare: handle_compare,
+        ast.Tuple: handle_tuple,
+        ast.Dict: handle_dictionary,
+        ast.List: handle_list,
+        ast.JoinedStr: handle_joined_string,
+        ast.ListComp: handle_list_comp,
+        ast.FormattedValue: handle_formatted_value,
+        ast.BoolOp: handle_bool_operation,
+        ast.UnaryOp: handle_unary_operation,
+        ast.IfExp: handle_if_expression,
+    }
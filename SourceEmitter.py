@@ -0,0 +1,921 @@
+import ast
+import io
+import sys
+from collections import defaultdict
+
+from ConstructAST import DEFINITION_NODE_TYPES, DEFINITION_RELATIONS, ConstructAST
+
+NAMED_EXPR, TUPLE, YIELD, TEST, OR, AND, NOT, CMP, EXPR, BXOR, BAND, SHIFT, ARITH, TERM, FACTOR, POWER, AWAIT, ATOM = range(1, 19)
+BOR = EXPR
+INFSTR = "1e" + repr(sys.float_info.max_10_exp + 1)
+
+BINARY_OPERATORS = {
+    "Add": ("+", ARITH),
+    "Sub": ("-", ARITH),
+    "Mult": ("*", TERM),
+    "MatMult": ("@", TERM),
+    "Div": ("/", TERM),
+    "Mod": ("%", TERM),
+    "LShift": ("<<", SHIFT),
+    "RShift": (">>", SHIFT),
+    "BitOr": ("|", BOR),
+    "BitXor": ("^", BXOR),
+    "BitAnd": ("&", BAND),
+    "FloorDiv": ("//", TERM),
+    "Pow": ("**", POWER),
+}
+UNARY_OPERATORS = {"Invert": ("~", FACTOR), "Not": ("not", NOT), "UAdd": ("+", FACTOR), "USub": ("-", FACTOR)}
+BOOLEAN_OPERATORS = {"And": ("and", AND), "Or": ("or", OR)}
+COMPARISON_OPERATORS = {
+    "Eq": "==",
+    "NotEq": "!=",
+    "Lt": "<",
+    "LtE": "<=",
+    "Gt": ">",
+    "GtE": ">=",
+    "Is": "is",
+    "IsNot": "is not",
+    "In": "in",
+    "NotIn": "not in",
+}
+ATOMIC_NODES = (ast.Name, ast.Constant, ast.Attribute, ast.Subscript, ast.Call, ast.List, ast.Dict, ast.Set,
+                ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.JoinedStr, ast.Starred, ast.Slice)
+
+def next_precedence(precedence):
+
+    return min(precedence + 1, ATOM)
+
+def constant_text(value):
+
+    if isinstance(value, (float, complex)):
+        return repr(value).replace("inf", INFSTR).replace("nan", f"({INFSTR}-{INFSTR})")
+    if value is ...:
+        return "..."
+    if isinstance(value, tuple):
+        if len(value) == 1:
+            return f"({constant_text(value[0])},)"
+        return "(" + ", ".join(constant_text(item) for item in value) + ")"
+
+    return repr(value)
+
+def docstring_text(value):
+
+    return ast.unparse(ast.Module(body=[ast.Expr(value=ast.Constant(value=value))], type_ignores=[]))
+
+class SourceEmitter(ConstructAST):
+
+    def __init__(self, nodes, edges, module_id="Module:<top>", adjacency=None):
+
+        super().__init__(nodes, edges, module_id, adjacency)
+        self.parts = []
+        self.indent = 0
+        self.started = False
+
+    def write(self, text):
+
+        self.started = True
+        self.parts.append(text)
+
+    def maybe_newline(self):
+
+        if self.started:
+            self.write("\n")
+
+    def fill(self, text=""):
+
+        self.maybe_newline()
+        self.write("    " * self.indent + text)
+
+    def flush(self, stream):
+
+        stream.write("".join(self.parts))
+        self.parts.clear()
+
+    def reset(self):
+
+        self.parts.clear()
+        self.indent = 0
+        self.started = False
+
+    def emit_module(self, stream):
+
+        self.reset()
+        items = self.definition_body(self.module_id, ("Has_Statement", *DEFINITION_RELATIONS))
+        docstring = self.docstring(items)
+        if docstring is not None:
+            self.fill(docstring_text(docstring))
+            items = items[1:]
+        for kind, identity in items:
+            self.run(self.start_item(kind, identity))
+            self.flush(stream)
+        self.flush(stream)
+
+    def emit_subtree(self, node_id, stream):
+
+        if node_id == self.module_id:
+            return self.emit_module(stream)
+
+        self.reset()
+        node_type = self.nodes[node_id]["type"]
+        if node_type in ("Function", "AsyncFunction", "Class"):
+            self.run(self.start_item("def", node_id))
+        elif node_type == "Statement":
+            self.run(self.start_emit_statement(node_id))
+        else:
+            raise ValueError(f"cannot emit a subtree from {node_type} node {node_id!r}")
+        self.flush(stream)
+
+    def source(self, node_id=None):
+
+        stream = io.StringIO()
+        self.emit_subtree(self.module_id if node_id is None else node_id, stream)
+
+        return stream.getvalue()
+
+    def definition_body(self, owner_id, relations):
+
+        body_items = []
+        for relation in relations:
+            kind = "statement" if relation == "Has_Statement" else "def"
+            order = self.statement_order if kind == "statement" else self.def_order
+            for identity in self.edge_dict.get((owner_id, relation), []):
+                body_items.append((kind, identity, order(identity)))
+        body_items.sort(key=lambda x: (x[2], x[1]))
+
+        return [(kind, identity) for kind, identity, _ in body_items]
+
+    def docstring(self, items):
+
+        if not items or items[0][0] != "statement":
+            return None
+
+        statement = self.nodes[items[0][1]]
+        attributes = statement["attributes"]
+        if statement["type"] != "Statement" or not isinstance(attributes, dict):
+            return None
+        if attributes.get("kind") != "ExpressionStatement" or "ExpressionStatement" not in self.statement_builders:
+            return None
+
+        value_ids = self.children(items[0][1], "Value")
+        if not value_ids or self.node_kind(value_ids[0]) != "Literal":
+            return None
+        literal = self.nodes[value_ids[0]]["attributes"]
+        value = literal.get("literal_value", literal)
+
+        return value if isinstance(value, str) else None
+
+    def start_item(self, kind, identity):
+
+        if kind == "statement":
+            return self.start_emit_statement(identity)
+
+        node_type = self.nodes[identity]["type"]
+        if node_type == "Function":
+            return self.emit_function(identity, "def")
+        if node_type == "AsyncFunction":
+            return self.emit_function(identity, "async def")
+        if node_type == "Class":
+            return self.emit_class(identity)
+
+        return self.fill("pass")
+
+    def emit_definition_body(self, owner_id, relations):
+
+        items = self.definition_body(owner_id, relations)
+        if not items:
+            self.fill("pass")
+            return
+
+        docstring = self.docstring(items)
+        if docstring is not None:
+            self.fill(docstring_text(docstring))
+            items = items[1:]
+        for kind, identity in items:
+            yield self.start_item(kind, identity)
+
+    def emit_decorators(self, definition_id):
+
+        self.maybe_newline()
+        for _, decorator_id in self.children_by_prefix(definition_id, "Decorator_"):
+            self.fill("@")
+            yield self.start_emit_expression(decorator_id)
+
+    def emit_function(self, function_id, keyword):
+
+        yield self.emit_decorators(function_id)
+        self.fill(f"{keyword} {self.nodes[function_id]['attributes']['name']}")
+        self.write("(")
+        yield self.emit_parameters(function_id)
+        self.write(")")
+        returns_id = self.one(function_id, "ReturnAnnotation", optional=True)
+        if returns_id is not None:
+            self.write(" -> ")
+            yield self.start_emit_expression(returns_id)
+        self.write(":")
+        self.indent += 1
+        yield self.emit_definition_body(function_id, ("Has_Statement", *DEFINITION_RELATIONS))
+        self.indent -= 1
+
+    def emit_class(self, class_id):
+
+        yield self.emit_decorators(class_id)
+        self.fill(f"class {self.nodes[class_id]['attributes']['name']}")
+        base_ids = [base_id for _, base_id in self.children_by_prefix(class_id, "Base_")]
+        keyword_items = self.keyword_items(class_id)
+        if base_ids or keyword_items:
+            self.write("(")
+            yield self.emit_separated(base_ids)
+            yield self.emit_keywords(keyword_items, bool(base_ids))
+            self.write(")")
+        self.write(":")
+        self.indent += 1
+        yield self.emit_definition_body(class_id, ("Has_Statement", *DEFINITION_RELATIONS))
+        self.indent -= 1
+
+    def emit_parameter(self, parameter_id):
+
+        parameter = self.nodes[parameter_id]["attributes"]
+        self.write(str(parameter.get("name", parameter)))
+        annotation_id = self.one(parameter_id, "Annotation", optional=True)
+        if annotation_id:
+            self.write(": ")
+            yield self.start_emit_expression(annotation_id)
+
+    def emit_parameters(self, function_id):
+
+        (position_only_parameters, position_parameters, keyword_only_parameters,
+         variable_arg_parameter_id, keyword_arg_parameter_id) = self.parameter_groups(function_id)
+
+        combined_position = position_only_parameters + position_parameters
+        default_ids = [self.one(parameter_id, "Default", optional=True) for _, _, parameter_id in combined_position]
+        defaults_sum = sum(1 for default_id in default_ids if default_id is not None)
+        position_defaults = [default_id for default_id in default_ids[len(default_ids) - defaults_sum:]
+                             if default_id is not None] if defaults_sum else []
+        position_defaults = [None] * (len(combined_position) - len(position_defaults)) + position_defaults
+
+        first = True
+        for index, ((_, _, parameter_id), default_id) in enumerate(zip(combined_position, position_defaults), 1):
+            if not first:
+                self.write(", ")
+            first = False
+            yield self.emit_parameter(parameter_id)
+            if default_id is not None:
+                self.write("=")
+                yield self.start_emit_expression(default_id)
+            if index == len(position_only_parameters):
+                self.write(", /")
+
+        if variable_arg_parameter_id is not None or keyword_only_parameters:
+            if not first:
+                self.write(", ")
+            first = False
+            self.write("*")
+            if variable_arg_parameter_id is not None:
+                yield self.emit_parameter(variable_arg_parameter_id)
+
+        for _, _, parameter_id in keyword_only_parameters:
+            self.write(", ")
+            yield self.emit_parameter(parameter_id)
+            default_id = self.one(parameter_id, "Default", optional=True)
+            if default_id is not None:
+                self.write("=")
+                yield self.start_emit_expression(default_id)
+
+        if keyword_arg_parameter_id is not None:
+            if not first:
+                self.write(", ")
+            self.write("**")
+            yield self.emit_parameter(keyword_arg_parameter_id)
+
+    def emit_separated(self, expression_ids, precedence=TEST):
+
+        for idx, expression_id in enumerate(expression_ids):
+            if idx:
+                self.write(", ")
+            yield self.start_emit_expression(expression_id, precedence)
+
+    def emit_items(self, expression_ids):
+
+        yield self.emit_separated(expression_ids)
+        if len(expression_ids) == 1:
+            self.write(",")
+
+    def start_emit_expression(self, expression_id, precedence=TEST):
+
+        kind = self.node_kind(expression_id)
+        emitter = self.expression_emitters.get(kind)
+        if emitter is None or kind not in self.expression_builders:
+            return self.emit_built_expression(expression_id, precedence)
+
+        return emitter(self, expression_id, precedence)
+
+    def emit_built_expression(self, expression_id, precedence):
+
+        expression = self.build_expression(expression_id)
+        if expression is None:
+            raise ValueError(f"cannot emit {self.node_kind(expression_id)} node {expression_id!r}")
+
+        text = ast.unparse(expression)
+        if precedence > TEST and not isinstance(expression, ATOMIC_NODES):
+            text = f"({text})"
+        self.write(text)
+
+    def emit_target(self, expression_id, precedence=TEST):
+
+        if self.node_kind(expression_id) not in self.target_builders:
+            raise ValueError(f"cannot emit {self.node_kind(expression_id)} node {expression_id!r} as a target")
+
+        return self.start_emit_expression(expression_id, precedence)
+
+    def emit_name(self, expression_id, precedence):
+
+        attributes = self.nodes[expression_id]["attributes"]
+        self.write(str(attributes.get("name", attributes)))
+
+    def emit_literal(self, expression_id, precedence):
+
+        attributes = self.nodes[expression_id]["attributes"]
+        self.write(constant_text(attributes.get("literal_value", attributes)))
+
+    def emit_binary_operator(self, expression_id, precedence):
+
+        symbol, operator_precedence = BINARY_OPERATORS[self.operation_name(expression_id)]
+        if symbol == "**":
+            left_precedence, right_precedence = next_precedence(operator_precedence), operator_precedence
+        else:
+            left_precedence, right_precedence = operator_precedence, next_precedence(operator_precedence)
+
+        parenthesize = precedence > operator_precedence
+        if parenthesize:
+            self.write("(")
+        yield self.start_emit_expression(self.one(expression_id, "Left"), left_precedence)
+        self.write(f" {symbol} ")
+        yield self.start_emit_expression(self.one(expression_id, "Right"), right_precedence)
+        if parenthesize:
+            self.write(")")
+
+    def emit_comprehensions(self, expression_id):
+
+        for _, generator_id in self.edge_dict_extraction(expression_id, "Gen_"):
+            yield self.emit_comprehension(generator_id)
+
+    def emit_comprehension(self, expression_id):
+
+        iterator_id = self.one(expression_id, "Iterator", optional=True)
+        if iterator_id is None:
+            iterator_id = self.one(expression_id, "Iter")
+
+        self.write(" async for " if self.comprehension_is_async(expression_id) else " for ")
+        yield self.emit_target(self.one(expression_id, "Target"), TUPLE)
+        self.write(" in ")
+        yield self.start_emit_expression(iterator_id, next_precedence(TEST))
+        for _, if_id in self.edge_dict_extraction(expression_id, "If_"):
+            self.write(" if ")
+            yield self.start_emit_expression(if_id, next_precedence(TEST))
+
+    def emit_generator_expression(self, expression_id, precedence):
+
+        self.write("(")
+        yield self.start_emit_expression(self.one(expression_id, "Element"))
+        yield self.emit_comprehensions(expression_id)
+        self.write(")")
+
+    def emit_listcomp(self, expression_id, precedence):
+
+        self.write("[")
+        yield self.start_emit_expression(self.one(expression_id, "Element"))
+        yield self.emit_comprehensions(expression_id)
+        self.write("]")
+
+    def emit_setcomp(self, expression_id, precedence):
+
+        self.write("{")
+        yield self.start_emit_expression(self.one(expression_id, "Element"))
+        yield self.emit_comprehensions(expression_id)
+        self.write("}")
+
+    def emit_dictcomp(self, expression_id, precedence):
+
+        self.write("{")
+        yield self.start_emit_expression(self.one(expression_id, "Key"))
+        self.write(": ")
+        yield self.start_emit_expression(self.one(expression_id, "Value"))
+        yield self.emit_comprehensions(expression_id)
+        self.write("}")
+
+    def emit_set(self, expression_id, precedence):
+
+        element_ids = [element_id for _, element_id in self.children_by_prefix(expression_id, "Element_")]
+        if not element_ids:
+            self.write("{*()}")
+            return
+
+        self.write("{")
+        yield self.emit_separated(element_ids)
+        self.write("}")
+
+    def emit_named_expression(self, expression_id, precedence):
+
+        parenthesize = precedence > NAMED_EXPR
+        if parenthesize:
+            self.write("(")
+        yield self.emit_target(self.one(expression_id, "Target"), ATOM)
+        self.write(" := ")
+        yield self.start_emit_expression(self.one(expression_id, "Value"), ATOM)
+        if parenthesize:
+            self.write(")")
+
+    def emit_starred(self, expression_id, precedence):
+
+        self.write("*")
+        yield self.start_emit_expression(self.one(expression_id, "Value"), EXPR)
+
+    def emit_await(self, expression_id, precedence):
+
+        parenthesize = precedence > AWAIT
+        if parenthesize:
+            self.write("(")
+        self.write("await ")
+        yield self.start_emit_expression(self.one(expression_id, "Value"), ATOM)
+        if parenthesize:
+            self.write(")")
+
+    def emit_yield(self, expression_id, precedence):
+
+        parenthesize = precedence > YIELD
+        if parenthesize:
+            self.write("(")
+        self.write("yield")
+        value_id = self.one(expression_id, "Value", optional=True)
+        if value_id is not None:
+            self.write(" ")
+            yield self.start_emit_expression(value_id, ATOM)
+        if parenthesize:
+            self.write(")")
+
+    def emit_yield_from(self, expression_id, precedence):
+
+        parenthesize = precedence > YIELD
+        if parenthesize:
+            self.write("(")
+        self.write("yield from ")
+        yield self.start_emit_expression(self.one(expression_id, "Value"), ATOM)
+        if parenthesize:
+            self.write(")")
+
+    def emit_lambda(self, expression_id, precedence):
+
+        parenthesize = precedence > TEST
+        if parenthesize:
+            self.write("(")
+        self.write("lambda")
+        if self.parameter_ids(expression_id):
+            self.write(" ")
+            yield self.emit_parameters(expression_id)
+        self.write(": ")
+        yield self.start_emit_expression(self.one(expression_id, "Body"), TEST)
+        if parenthesize:
+            self.write(")")
+
+    def emit_slice(self, expression_id, precedence):
+
+        lower_id = self.one(expression_id, "Lower", optional=True)
+        upper_id = self.one(expression_id, "Upper", optional=True)
+        step_id = self.one(expression_id, "Step", optional=True)
+        if lower_id is not None:
+            yield self.start_emit_expression(lower_id)
+        self.write(":")
+        if upper_id is not None:
+            yield self.start_emit_expression(upper_id)
+        if step_id is not None:
+            self.write(":")
+            yield self.start_emit_expression(step_id)
+
+    def emit_attribute(self, expression_id, precedence):
+
+        value_id = self.one(expression_id, "Value")
+        yield self.start_emit_expression(value_id, ATOM)
+        if self.node_kind(value_id) == "Literal":
+            literal = self.nodes[value_id]["attributes"]
+            if isinstance(literal.get("literal_value", literal), int):
+                self.write(" ")
+        self.write(".")
+        self.write(str(self.nodes[expression_id]["attributes"].get("attribute_value", None)))
+
+    def emit_call(self, expression_id, precedence):
+
+        yield self.start_emit_expression(self.one(expression_id, "Function_call"), ATOM)
+        self.write("(")
+        arg_ids = [arg_id for _, arg_id in self.children_by_prefix(expression_id, "Arg_")]
+        yield self.emit_separated(arg_ids)
+        yield self.emit_keywords(self.keyword_items(expression_id), bool(arg_ids))
+        self.write(")")
+
+    def emit_keywords(self, keyword_items, comma):
+
+        for name, value_id in keyword_items:
+            if comma:
+                self.write(", ")
+            comma = True
+            self.write("**" if name is None else f"{name}=")
+            yield self.start_emit_expression(value_id)
+
+    def emit_subscript(self, expression_id, precedence):
+
+        yield self.start_emit_expression(self.one(expression_id, "Value"), ATOM)
+        self.write("[")
+        slice_id = self.one(expression_id, "Slice")
+        element_ids = []
+        if self.node_kind(slice_id) == "tuple":
+            element_ids = [element_id for _, element_id in self.children_by_prefix(slice_id, "Element_")]
+        if element_ids:
+            yield self.emit_items(element_ids)
+        else:
+            yield self.start_emit_expression(slice_id)
+        self.write("]")
+
+    def emit_tuple(self, expression_id, precedence):
+
+        element_ids = [element_id for _, element_id in self.children_by_prefix(expression_id, "Element_")]
+        parenthesize = not element_ids or precedence > TUPLE
+        if parenthesize:
+            self.write("(")
+        yield self.emit_items(element_ids)
+        if parenthesize:
+            self.write(")")
+
+    def emit_list(self, expression_id, precedence):
+
+        self.write("[")
+        yield self.emit_separated([element_id for _, element_id in self.children_by_prefix(expression_id, "Element_")])
+        self.write("]")
+
+    def emit_dict(self, expression_id, precedence):
+
+        grouped = defaultdict(dict)
+        for tag in ("Key", "Value"):
+            for idx, destination in self.children_by_prefix(expression_id, tag):
+                grouped[idx][tag] = destination
+
+        self.write("{")
+        for position, idx in enumerate(sorted(grouped)):
+            if position:
+                self.write(", ")
+            key_id = grouped[idx].get("Key")
+            value_id = grouped[idx].get("Value")
+            if key_id is None:
+                self.write("**")
+                yield self.start_emit_expression(value_id, EXPR)
+            else:
+                yield self.start_emit_expression(key_id)
+                self.write(": ")
+                yield self.start_emit_expression(value_id)
+        self.write("}")
+
+    def emit_if_expression(self, expression_id, precedence):
+
+        parenthesize = precedence > TEST
+        if parenthesize:
+            self.write("(")
+        yield self.start_emit_expression(self.one(expression_id, "Body"), next_precedence(TEST))
+        self.write(" if ")
+        yield self.start_emit_expression(self.one(expression_id, "Condition"), next_precedence(TEST))
+        self.write(" else ")
+        yield self.start_emit_expression(self.one(expression_id, "OrElse"), TEST)
+        if parenthesize:
+            self.write(")")
+
+    def emit_boolop(self, expression_id, precedence):
+
+        symbol, operator_precedence = BOOLEAN_OPERATORS[self.operation_name(expression_id)]
+        parenthesize = precedence > operator_precedence
+        if parenthesize:
+            self.write("(")
+        value_precedence = operator_precedence
+        for idx, (_, value_id) in enumerate(self.edge_dict_extraction(expression_id, "Value_")):
+            if idx:
+                self.write(f" {symbol} ")
+            value_precedence = next_precedence(value_precedence)
+            yield self.start_emit_expression(value_id, value_precedence)
+        if parenthesize:
+            self.write(")")
+
+    def emit_unaryop(self, expression_id, precedence):
+
+        symbol, operator_precedence = UNARY_OPERATORS[self.operation_name(expression_id)]
+        parenthesize = precedence > operator_precedence
+        if parenthesize:
+            self.write("(")
+        self.write(symbol)
+        if operator_precedence != FACTOR:
+            self.write(" ")
+        yield self.start_emit_expression(self.one(expression_id, "Operand"), operator_precedence)
+        if parenthesize:
+            self.write(")")
+
+    def emit_compare(self, expression_id, precedence):
+
+        operation_names = self.nodes[expression_id]["attributes"].get("operations")
+        if operation_names is None:
+            operation_names = [self.nodes[operation_id]["attributes"]["operation"]
+                               for _, operation_id in self.children_by_prefix(expression_id, "Op_")]
+
+        parenthesize = precedence > CMP
+        if parenthesize:
+            self.write("(")
+        yield self.start_emit_expression(self.one(expression_id, "Left"), next_precedence(CMP))
+        for operation_name, (_, comparator_id) in zip(operation_names, self.children_by_prefix(expression_id, "Comparator_")):
+            self.write(f" {COMPARISON_OPERATORS[operation_name]} ")
+            yield self.start_emit_expression(comparator_id, next_precedence(CMP))
+        if parenthesize:
+            self.write(")")
+
+    def start_emit_statement(self, statement_id):
+
+        statement_node = self.nodes[statement_id]
+        attributes = statement_node["attributes"]
+        if statement_node["type"] != "Statement" or not isinstance(attributes, dict):
+            return self.fill("pass")
+
+        kind = attributes.get("kind")
+        if kind not in self.statement_builders:
+            return self.fill("pass")
+
+        emitter = self.statement_emitters.get(kind)
+        if emitter is None:
+            return self.emit_built_statement(statement_id)
+
+        return emitter(self, statement_id)
+
+    def emit_built_statement(self, statement_id):
+
+        lines = ast.unparse(self.build_statement(statement_id)).split("\n")
+        self.fill(lines[0])
+        for line in lines[1:]:
+            self.write("\n" + "    " * self.indent + line)
+
+    def emit_block(self, statement_id, relation, placeholder=True):
+
+        self.write(":")
+        self.indent += 1
+        statement_ids = sorted(self.many(statement_id, relation), key=self.statement_order)
+        if placeholder and not statement_ids:
+            self.fill("pass")
+        for body_id in statement_ids:
+            yield self.start_item("def" if self.nodes[body_id]["type"] in DEFINITION_NODE_TYPES else "statement", body_id)
+        self.indent -= 1
+
+    def emit_else(self, statement_id, relation="OrElse_Statement", keyword="else"):
+
+        if self.many(statement_id, relation):
+            self.fill(keyword)
+            yield self.emit_block(statement_id, relation, placeholder=False)
+
+    def emit_pass_statement(self, statement_id):
+
+        self.fill("pass")
+
+    def emit_break_statement(self, statement_id):
+
+        self.fill("break")
+
+    def emit_continue_statement(self, statement_id):
+
+        self.fill("continue")
+
+    def emit_delete_statement(self, statement_id):
+
+        self.fill("del ")
+        yield self.emit_separated([target_id for _, target_id in self.children_by_prefix(statement_id, "Target_")])
+
+    def emit_global_statement(self, statement_id):
+
+        self.fill("global " + ", ".join(self.literal_value_extraction(statement_id)))
+
+    def emit_nonlocal_statement(self, statement_id):
+
+        self.fill("nonlocal " + ", ".join(self.literal_value_extraction(statement_id)))
+
+    def emit_while_statement(self, statement_id):
+
+        self.fill("while ")
+        yield self.start_emit_expression(self.one(statement_id, "Condition"))
+        yield self.emit_block(statement_id, "Body_Statement")
+        yield self.emit_else(statement_id)
+
+    def emit_with_statement(self, statement_id, keyword="with"):
+
+        self.fill(f"{keyword} ")
+        for idx, (_, item_id) in enumerate(self.children_by_prefix(statement_id, "Item_")):
+            if idx:
+                self.write(", ")
+            yield self.start_emit_expression(self.one(item_id, "Context"))
+            target_id = self.one(item_id, "Target", optional=True)
+            if target_id is not None:
+                self.write(" as ")
+                yield self.emit_target(target_id)
+        yield self.emit_block(statement_id, "Body_Statement")
+
+    def emit_asyncwith_statement(self, statement_id):
+
+        return self.emit_with_statement(statement_id, "async with")
+
+    def emit_assert_statement(self, statement_id):
+
+        self.fill("assert ")
+        yield self.start_emit_expression(self.one(statement_id, "Condition"))
+        message_id = self.one(statement_id, "Message", optional=True)
+        if message_id is not None:
+            self.write(", ")
+            yield self.start_emit_expression(message_id)
+
+    def emit_try_statement(self, statement_id):
+
+        self.fill("try")
+        yield self.emit_block(statement_id, "Body_Statement")
+        for _, handler_id in self.children_by_prefix(statement_id, "Handler_"):
+            self.fill("except")
+            type_id = self.one(handler_id, "Type", optional=True)
+            if type_id is not None:
+                self.write(" ")
+                yield self.start_emit_expression(type_id)
+            name_id = self.one(handler_id, "Name", optional=True)
+            if name_id is not None:
+                attributes = self.nodes[name_id]["attributes"]
+                name = attributes.get("literal_value", attributes)
+                if name:
+                    self.write(f" as {name}")
+            yield self.emit_block(handler_id, "Body_Statement")
+        yield self.emit_else(statement_id)
+        yield self.emit_else(statement_id, "FinalBody_Statement", "finally")
+
+    def emit_raise_statement(self, statement_id):
+
+        self.fill("raise")
+        exception_id = self.one(statement_id, "Exception", optional=True)
+        cause_id = self.one(statement_id, "Cause", optional=True)
+        if exception_id is None:
+            if cause_id is not None:
+                raise ValueError("Node can't use cause without an exception.")
+            return
+        self.write(" ")
+        yield self.start_emit_expression(exception_id)
+        if cause_id is not None:
+            self.write(" from ")
+            yield self.start_emit_expression(cause_id)
+
+    def alias_text(self, names):
+
+        return ", ".join(f"{alias.name} as {alias.asname}" if alias.asname else alias.name for alias in names)
+
+    def emit_import_statement(self, statement_id):
+
+        self.fill("import " + self.alias_text(self.build_import_statement(statement_id).names))
+
+    def emit_importfrom_statement(self, statement_id):
+
+        node = self.build_importfrom_statement(statement_id)
+        self.fill("from " + "." * (node.level or 0) + (node.module or "") + " import " + self.alias_text(node.names))
+
+    def emit_augassign_statement(self, statement_id):
+
+        self.fill()
+        yield self.emit_target(self.children(statement_id, "Target")[0])
+        self.write(f" {BINARY_OPERATORS[self.operation_name(statement_id)][0]}= ")
+        yield self.start_emit_expression(self.children(statement_id, "Value")[0])
+
+    def emit_annassign_statement(self, statement_id):
+
+        target_id = self.one(statement_id, "Target")
+        simple_id = self.one(statement_id, "Simple", optional=True)
+        simple = 1
+        if simple_id:
+            attributes = self.nodes[simple_id]["attributes"]
+            simple = int(attributes.get("literal_value", 1))
+
+        self.fill()
+        parenthesize = not simple and self.node_kind(target_id) == "Name"
+        if parenthesize:
+            self.write("(")
+        yield self.emit_target(target_id)
+        if parenthesize:
+            self.write(")")
+        self.write(": ")
+        yield self.start_emit_expression(self.one(statement_id, "Annotation"))
+        value_id = self.one(statement_id, "Value", optional=True)
+        if value_id is not None:
+            self.write(" = ")
+            yield self.start_emit_expression(value_id)
+
+    def emit_for_statement(self, statement_id, keyword="for "):
+
+        self.fill(keyword)
+        yield self.emit_target(self.one(statement_id, "Target"), TUPLE)
+        self.write(" in ")
+        yield self.start_emit_expression(self.one(statement_id, "Iterator"))
+        yield self.emit_block(statement_id, "Body_Statement")
+        yield self.emit_else(statement_id)
+
+    def emit_asyncfor_statement(self, statement_id):
+
+        return self.emit_for_statement(statement_id, "async for ")
+
+    def emit_return_statement(self, statement_id):
+
+        self.fill("return")
+        expression_ids = self.children(statement_id, "Computes")
+        if expression_ids:
+            self.write(" ")
+            yield self.start_emit_expression(expression_ids[0])
+
+    def emit_assign_statement(self, statement_id):
+
+        self.fill()
+        for target_id in self.children(statement_id, "Target"):
+            yield self.emit_target(target_id, TUPLE)
+            self.write(" = ")
+        yield self.start_emit_expression(self.children(statement_id, "Value")[0])
+
+    def emit_expression_statement(self, statement_id):
+
+        self.fill()
+        value_ids = self.children(statement_id, "Value")
+        if not value_ids:
+            self.write("None")
+            return
+        yield self.start_emit_expression(value_ids[0], YIELD)
+
+    def is_if_statement(self, statement_id):
+
+        statement_node = self.nodes[statement_id]
+        attributes = statement_node["attributes"]
+
+        return (statement_node["type"] == "Statement" and isinstance(attributes, dict)
+                and attributes.get("kind") == "If" and "If" in self.statement_builders)
+
+    def emit_if_statement(self, statement_id):
+
+        self.fill("if ")
+        yield self.start_emit_expression(self.children(statement_id, "Condition")[0])
+        yield self.emit_block(statement_id, "Body_Statement")
+        or_else_ids = self.many(statement_id, "OrElse_Statement")
+        while len(or_else_ids) == 1 and self.is_if_statement(or_else_ids[0]):
+            statement_id = or_else_ids[0]
+            self.fill("elif ")
+            yield self.start_emit_expression(self.children(statement_id, "Condition")[0])
+            yield self.emit_block(statement_id, "Body_Statement")
+            or_else_ids = self.many(statement_id, "OrElse_Statement")
+        yield self.emit_else(statement_id)
+
+    expression_emitters = {
+        "Name": emit_name,
+        "Literal": emit_literal,
+        "binary_operator": emit_binary_operator,
+        "generator_expression": emit_generator_expression,
+        "set": emit_set,
+        "named_expression": emit_named_expression,
+        "starred": emit_starred,
+        "await": emit_await,
+        "yield": emit_yield,
+        "yieldfrom": emit_yield_from,
+        "lambda": emit_lambda,
+        "setcomp": emit_setcomp,
+        "dictcomp": emit_dictcomp,
+        "slice": emit_slice,
+        "attribute": emit_attribute,
+        "call": emit_call,
+        "subscript": emit_subscript,
+        "tuple": emit_tuple,
+        "list": emit_list,
+        "dict": emit_dict,
+        "if_expression": emit_if_expression,
+        "boolop": emit_boolop,
+        "listcomp": emit_listcomp,
+        "unaryop": emit_unaryop,
+        "compare": emit_compare,
+    }
+
+    statement_emitters = {
+        "Pass": emit_pass_statement,
+        "Delete": emit_delete_statement,
+        "Global": emit_global_statement,
+        "Nonlocal": emit_nonlocal_statement,
+        "While": emit_while_statement,
+        "With": emit_with_statement,
+        "AsyncWith": emit_asyncwith_statement,
+        "Assert": emit_assert_statement,
+        "Try": emit_try_statement,
+        "Raise": emit_raise_statement,
+        "Import": emit_import_statement,
+        "ImportFrom": emit_importfrom_statement,
+        "AugAssign": emit_augassign_statement,
+        "AnnAssign": emit_annassign_statement,
+        "Break": emit_break_statement,
+        "Continue": emit_continue_statement,
+        "For": emit_for_statement,
+        "AsyncFor": emit_asyncfor_statement,
+        "Return": emit_return_statement,
+        "Assign": emit_assign_statement,
+        "ExpressionStatement": emit_expression_statement,
+        "If": emit_if_statement,
+    }
@@ -0,0 +1,121 @@
+import ast
+from collections import defaultdict
+
+class Scope:
+
+    def __init__(self, scope_id, kind, parent):
+
+        self.scope_id = scope_id
+        self.kind = kind
+        self.parent = parent
+        self.bindings = defaultdict(list)
+        self.declared = {}
+        self.uses = []
+        self.free = []
+        self.nonlocal_definitions = []
+
+class SymbolTable:
+
+    def __init__(self, add_edge):
+
+        self.add_edge = add_edge
+        self.scopes = []
+        self.module = None
+        self.parameters = defaultdict(list)
+        self.assignment_expression = False
+        self.unresolved = []
+
+    def enter(self, scope_id, kind):
+
+        scope = Scope(scope_id, kind, self.scopes[-1] if self.scopes else None)
+        if self.module is None:
+            self.module = scope
+        self.scopes.append(scope)
+        for name, parameter_id in self.parameters.pop(scope_id, ()):
+            self.define(name, parameter_id)
+
+    def exit(self):
+
+        self.resolve(self.scopes.pop())
+
+    def enter_enclosing(self):
+
+        self.scopes.append(self.scopes[-1].parent)
+
+    def exit_enclosing(self):
+
+        self.scopes.pop()
+
+    def parameter(self, scope_id, name, parameter_id):
+
+        self.parameters[scope_id].append((name, parameter_id))
+
+    def declare(self, names, declaration):
+
+        scope = self.scopes[-1]
+        for name in names:
+            scope.declared[name] = declaration
+
+    def record(self, name, node_id, context):
+
+        if context.__class__ is ast.Load:
+            self.use(name, node_id)
+        else:
+            self.define(name, node_id)
+
+    def define(self, name, node_id):
+
+        scope = self.scopes[-1]
+        if self.assignment_expression:
+            self.assignment_expression = False
+            while scope.kind == "Comprehension":
+                scope = scope.parent
+
+        declaration = scope.declared.get(name)
+        if declaration == "global":
+            scope = self.module
+        elif declaration == "nonlocal":
+            scope.nonlocal_definitions.append((name, node_id))
+            return
+
+        scope.bindings[name].append(node_id)
+        self.add_edge(scope.scope_id, "Defines", node_id)
+
+    def use(self, name, node_id):
+
+        scope = self.scopes[-1]
+        self.add_edge(scope.scope_id, "Uses", node_id)
+        if scope.declared.get(name) == "global":
+            self.module.free.append((name, node_id))
+        else:
+            scope.uses.append((name, node_id))
+
+    def bind(self, scope, name, node_id):
+
+        for definition_id in scope.bindings[name]:
+            self.add_edge(node_id, "ResolvesTo", definition_id)
+
+    def resolve(self, scope):
+
+        parent = scope.parent
+        local = scope.kind != "Class"
+        for name, node_id in scope.nonlocal_definitions:
+            if scope.declared.get(name) is None and name in scope.bindings and local:
+                scope.bindings[name].append(node_id)
+                self.add_edge(scope.scope_id, "Defines", node_id)
+            elif parent is not None:
+                parent.nonlocal_definitions.append((name, node_id))
+
+        for names, visible in ((scope.uses, True), (scope.free, local)):
+            for name, node_id in names:
+                declaration = scope.declared.get(name)
+                if declaration == "global" and scope is not self.module:
+                    self.module.free.append((name, node_id))
+                elif visible and declaration is None and name in scope.bindings:
+                    self.bind(scope, name, node_id)
+                elif parent is not None:
+                    parent.free.append((name, node_id))
+                elif name in scope.bindings:
+                    self.bind(scope, name, node_id)
+                else:
+                    self.unresolved.append((name, node_id))
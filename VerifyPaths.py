@@ -0,0 +1,140 @@
+import argparse
+import ast
+import hashlib
+import sys
+
+from ConstructAST import ConstructAST
+from ExtractPaths import map_tasks, python_files
+from KnowledgeGraph import KnowledgeGraph
+
+reversed_fields = {}
+
+class VerificationResult:
+
+    def __init__(self):
+
+        self.passed = []
+        self.mismatches = {}
+        self.failures = {}
+
+    def merge(self, path, outcome):
+
+        difference, failure = outcome
+        if failure is not None:
+            self.failures[path] = failure
+        elif difference is not None:
+            self.mismatches[path] = difference
+        else:
+            self.passed.append(path)
+
+def node_fields(cls):
+
+    if cls not in reversed_fields:
+        reversed_fields[cls] = tuple(reversed(cls._fields)) if issubclass(cls, ast.AST) else None
+
+    return reversed_fields[cls]
+
+def structural_hash(tree):
+
+    shape = []
+    values = []
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        cls = node.__class__
+        if cls is list:
+            shape.append(len(node))
+            pending.extend(reversed(node))
+            continue
+        fields = reversed_fields[cls] if cls in reversed_fields else node_fields(cls)
+        if fields is None:
+            shape.append(None)
+            values.append(node)
+        else:
+            shape.append(cls.__name__)
+            pending.extend(map(node.__dict__.get, fields))
+
+    return hashlib.blake2b(repr((shape, values)).encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+def value_text(value):
+
+    if isinstance(value, ast.AST):
+        return type(value).__name__
+    if isinstance(value, list):
+        return f"list of {len(value)}"
+
+    return f"{type(value).__name__} {value!r}"
+
+def first_difference(original, rebuilt):
+
+    pending = [("", original, rebuilt)]
+    while pending:
+        path, left, right = pending.pop()
+        if isinstance(left, ast.AST) and type(left) is type(right):
+            for field in reversed(left._fields):
+                child_path = f"{path}.{field}" if path else field
+                pending.append((child_path, getattr(left, field, None), getattr(right, field, None)))
+        elif isinstance(left, list) and isinstance(right, list):
+            if len(left) != len(right):
+                return path, f"{len(left)} items, rebuilt has {len(right)}"
+            for idx in reversed(range(len(left))):
+                pending.append((f"{path}[{idx}]", left[idx], right[idx]))
+        elif isinstance(left, ast.AST) or isinstance(right, ast.AST) or isinstance(left, list) or isinstance(right, list):
+            return path, f"{value_text(left)}, rebuilt has {value_text(right)}"
+        elif type(left) is not type(right) or repr(left) != repr(right):
+            return path, f"{value_text(left)}, rebuilt has {value_text(right)}"
+
+    return None
+
+def verify_source(source):
+
+    tree = ast.parse(source)
+    original_hash = structural_hash(tree)
+
+    knowledge_graph = KnowledgeGraph()
+    knowledge_graph.visit(tree)
+    rebuilt = ConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()
+    if structural_hash(rebuilt) == original_hash:
+        return None
+
+    return first_difference(tree, rebuilt) or ("", "structural hashes differ")
+
+def verify_file(path):
+
+    try:
+        with open(path, "rb") as handle:
+            source = handle.read()
+        difference = verify_source(source)
+    except Exception as error:
+        return None, f"{type(error).__name__}: {error}"
+
+    return difference, None
+
+def verify_paths(paths, workers=None):
+
+    result = VerificationResult()
+    for outcome, path in zip(map_tasks(verify_file, paths, workers), paths):
+        result.merge(path, outcome)
+
+    return result
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Check that Python files survive the knowledge graph round trip.")
+    parser.add_argument("paths", nargs="+", help="Python files or directories to scan for .py files")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    arguments = parser.parse_args(argv)
+
+    result = verify_paths(python_files(arguments.paths), workers=arguments.workers)
+
+    for path, (node_path, detail) in result.mismatches.items():
+        print(f"{path}: {node_path or '<module>'}: {detail}")
+    for path, failure in result.failures.items():
+        print(f"{path}: {failure}", file=sys.stderr)
+    print(f"{len(result.passed)} passed, {len(result.mismatches)} mismatched, {len(result.failures)} failures",
+          file=sys.stderr)
+
+    return 1 if result.mismatches or result.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import ast
+
+from KnowledgeGraph import KnowledgeGraph
+
+SAMPLE_SOURCE = """import os
+from collections import OrderedDict as Ordered
+
+LIMIT = 10
+
+if os.name == 'nt':
+
+    def separator():
+        return os.sep
+else:
+
+    class Separator(str):
+        pass
+
+
+def scale(values, factor=2, *rest, key=None, **options) -> list:
+    total = 0
+    for value in values:
+        if value > LIMIT and not key:
+            total += value * factor
+        elif value < 0 or value is None:
+            break
+        else:
+            total -= value
+    if total > LIMIT:
+        total //= 2
+    return [total, -total, ~total] + list(rest)
+
+
+class Shape(object):
+    sides = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    @property
+    def label(self):
+        return f'{self.name!r}:{self.sides}'
+
+    def area(self):
+        raise NotImplementedError
+
+
+class Square(Shape, metaclass=type):
+    sides = 4
+
+    def area(self):
+        return self.size ** 2 if self.size else 0.0
+
+
+def outer(start):
+    count = start
+
+    def inner(step):
+        nonlocal count
+        count = count + step
+        return count
+    return inner
+
+
+def read(path):
+    retries: int = 3
+    data: str
+    while retries:
+        retries -= 1
+        try:
+            with open(path) as handle:
+                data = handle.read()
+        except (OSError, ValueError) as error:
+            if retries:
+                continue
+            raise RuntimeError(path) from error
+        else:
+            break
+        finally:
+            path = str(path)
+    else:
+        data = ''
+    squares = {x: x * x for x in range(3) if x}
+    pairs = [(a, b) for a in 'ab' for b in (1, 2)]
+    lookup = lambda item, default=None, *rest, strict=False, **extra: Ordered(item).get(default)
+    return (data, squares, pairs, lookup, {1, 2}, os.sep[1:2], 1 < 2 <= 3)
+
+
+async def fetch(client, urls):
+    async with client.session() as session:
+        async for url in session.stream(urls):
+            await session.get(url)
+    return [await client.done()]
+"""
+
+SAMPLE_EDITS = (
+    ("edit a method body", "self.name = name\n", "self.name = name.strip()\n"),
+    ("change a module constant", "LIMIT = 10\n", "LIMIT = 12\n"),
+    ("move every definition down", "import os\n", "import os\nimport sys\n\n\n"),
+    ("add a function", "async def fetch", "def added(x):\n    return x\n\n\nasync def fetch"),
+    ("remove a nested function", "    def inner(step):\n        nonlocal count\n        count = count + step\n"
+                                 "        return count\n    return inner\n", "    return count\n"),
+    ("rename a class", "class Square(Shape, metaclass=type):", "class Rectangle(Shape, metaclass=type):"),
+)
+
+
+def edited_sources(source=SAMPLE_SOURCE):
+
+    for label, old, new in SAMPLE_EDITS:
+        edited = source.replace(old, new, 1)
+        yield label, source, edited
+        source = edited
+
+
+def extract(source=SAMPLE_SOURCE, **options):
+
+    kg = KnowledgeGraph(**options)
+    kg.visit(ast.parse(source))
+    return kg
+
+
+def normalized(source=SAMPLE_SOURCE):
+
+    return ast.unparse(ast.parse(source))
@@ -0,0 +1,74 @@
+import ast
+import os
+import tempfile
+import unittest
+
+from BinaryGraph import BinaryGraph, write_graph
+from ConstructAST import ConstructAST
+from tests.samples import extract, normalized
+
+
+class BinaryGraphTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.kgb")
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def assertRoundTrip(self, nodes, edges, **options):
+
+        write_graph(self.path, nodes, edges, **options)
+        with BinaryGraph(self.path) as graph:
+            self.assertEqual(len(graph.nodes), len(nodes))
+            self.assertEqual(dict(graph.nodes), dict(nodes))
+            self.assertEqual(list(graph.edges), list(edges))
+            self.assertEqual(graph.edges[-1], edges[-1])
+            return ConstructAST.from_graph(graph).build_module()
+
+    def test_round_trip_rebuilds_module(self):
+
+        kg = extract()
+        module = self.assertRoundTrip(kg.nodes, kg.edges)
+
+        self.assertEqual(ast.unparse(module), normalized())
+
+    def test_round_trip_across_edge_blocks(self):
+
+        kg = extract(symbols=True)
+
+        self.assertRoundTrip(kg.nodes, kg.edges, block_size=7)
+
+    def test_round_trip_of_shared_and_folded_graphs(self):
+
+        for options in ({"content_ids": True}, {"intern_leaves": True}, {"fold_operations": True}):
+            kg = extract(**options)
+            self.assertRoundTrip(kg.nodes, kg.edges)
+
+    def test_attribute_values(self):
+
+        nodes = {
+            "value_0": {"type": "Literal", "attributes": {"literal_value": None, "flag": True, "count": -3}},
+            "value_1": {"type": "Literal", "attributes": {"literal_value": 1.5, "raw": b"\x00\xff", "z": 2j}},
+            "value_2": {"type": "Literal", "attributes": {"literal_value": "text", "items": ["a", 1], "rest": ...}},
+            f"value_{2 ** 40}": {"type": "Literal", "attributes": {}},
+        }
+        edges = [("value_0", "Arg_0", "value_1"), ("value_0", f"Arg_{2 ** 40}", "value_2"),
+                 ("value_2", "Uses", f"value_{2 ** 40}")]
+
+        self.assertRoundTrip(nodes, edges)
+
+    def test_rejects_other_files(self):
+
+        with open(self.path, "wb") as handle:
+            handle.write(b"not a graph file at all")
+
+        with self.assertRaises(ValueError):
+            BinaryGraph(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
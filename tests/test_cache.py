@@ -0,0 +1,159 @@
+import os
+import tempfile
+import unittest
+
+import CallGraph as call_graph
+import ExtractionCache as extraction_cache
+from CallGraph import SummaryCache
+from ExtractionCache import ExtractionCache
+from KnowledgeGraph import KnowledgeGraph
+
+
+class ExtractionCacheKeyTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ExtractionCache(self.directory.name)
+        self.tag = extraction_cache.INTERPRETER_TAG
+        self.digest = extraction_cache.EXTRACTOR_DIGEST
+
+    def tearDown(self):
+
+        extraction_cache.INTERPRETER_TAG = self.tag
+        extraction_cache.EXTRACTOR_DIGEST = self.digest
+        self.directory.cleanup()
+
+    def test_key_depends_on_interpreter(self):
+
+        key = self.cache.key("x = 1\n")
+        extraction_cache.INTERPRETER_TAG = "cpython-0.0"
+
+        self.assertNotEqual(self.cache.key("x = 1\n"), key)
+
+    def test_key_depends_on_extractor_sources(self):
+
+        key = self.cache.key("x = 1\n")
+        extraction_cache.EXTRACTOR_DIGEST = extraction_cache.source_files_digest(extraction_cache.EXTRACTOR_FILES[1:])
+
+        self.assertNotEqual(self.cache.key("x = 1\n"), key)
+
+    def test_extractor_files_cover_imported_modules(self):
+
+        self.assertTrue(all(path.endswith(f"{name}.py") for name, path in
+                            zip(extraction_cache.EXTRACTOR_MODULES, extraction_cache.EXTRACTOR_FILES)))
+
+    def test_key_accepts_text_and_bytes(self):
+
+        self.assertEqual(self.cache.key("x = 1\n"), self.cache.key(b"x = 1\n"))
+
+
+class BrokenKnowledgeGraph:
+
+    def __init__(self, **options):
+
+        self.options = options
+
+    def visit(self, tree):
+
+        raise RuntimeError("extractor bug")
+
+
+class ExtractionCacheFailureTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ExtractionCache(self.directory.name)
+
+    def tearDown(self):
+
+        extraction_cache.KnowledgeGraph = KnowledgeGraph
+        self.directory.cleanup()
+
+    def test_extractor_errors_are_not_cached(self):
+
+        extraction_cache.KnowledgeGraph = BrokenKnowledgeGraph
+        with self.assertRaises(RuntimeError):
+            self.cache.extract("x = 1\n")
+        extraction_cache.KnowledgeGraph = KnowledgeGraph
+        nodes, edges = self.cache.extract("x = 1\n")
+
+        self.assertIn("Module:<top>", {source for source, _, _ in edges})
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_failed_store_leaves_no_temporary_file(self):
+
+        with self.assertRaises(Exception):
+            self.cache.store(self.cache.key("x = 1\n"), lambda: None)
+
+        self.assertEqual([name for _, _, names in os.walk(self.directory.name) for name in names], [])
+
+    def test_parse_errors_are_cached(self):
+
+        for _ in range(2):
+            with self.assertRaises(SyntaxError):
+                self.cache.extract("def broken(:\n")
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+
+class SummaryCacheKeyTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = SummaryCache(self.directory.name)
+        self.tag = call_graph.INTERPRETER_TAG
+        self.extractor_digest = call_graph.EXTRACTOR_DIGEST
+        self.summary_digest = call_graph.SUMMARY_DIGEST
+
+    def tearDown(self):
+
+        call_graph.INTERPRETER_TAG = self.tag
+        call_graph.EXTRACTOR_DIGEST = self.extractor_digest
+        call_graph.SUMMARY_DIGEST = self.summary_digest
+        call_graph.KnowledgeGraph = KnowledgeGraph
+        self.directory.cleanup()
+
+    def test_key_depends_on_interpreter(self):
+
+        key = self.cache.key("x = 1\n")
+        call_graph.INTERPRETER_TAG = "cpython-0.0"
+
+        self.assertNotEqual(self.cache.key("x = 1\n"), key)
+
+    def test_key_depends_on_extractor_and_summary_sources(self):
+
+        key = self.cache.key("x = 1\n")
+        call_graph.EXTRACTOR_DIGEST = "0" * 64
+        extractor_key = self.cache.key("x = 1\n")
+        call_graph.SUMMARY_DIGEST = "0" * 64
+
+        self.assertEqual(len({key, extractor_key, self.cache.key("x = 1\n")}), 3)
+
+    def test_extractor_errors_are_not_cached(self):
+
+        call_graph.KnowledgeGraph = BrokenKnowledgeGraph
+        with self.assertRaises(RuntimeError):
+            self.cache.summarize("x = 1\n")
+        call_graph.KnowledgeGraph = KnowledgeGraph
+        self.cache.summarize("x = 1\n")
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 2))
+
+    def test_parse_errors_are_cached(self):
+
+        for _ in range(2):
+            with self.assertRaises(SyntaxError):
+                self.cache.summarize("def broken(:\n")
+
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_differs_from_extraction_cache(self):
+
+        self.assertNotEqual(self.cache.key("x = 1\n"), ExtractionCache(self.directory.name).key("x = 1\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
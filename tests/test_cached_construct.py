@@ -0,0 +1,95 @@
+import ast
+import copy
+import unittest
+
+from CachedConstructAST import CachedConstructAST
+from KnowledgeGraph import KnowledgeGraph
+
+SOURCE = """def area(width, height):
+    return width * height
+
+class Box:
+
+    def volume(self, depth):
+        return area(self.width, self.height) * depth
+
+print(area(2, 3))
+"""
+
+
+def extract():
+
+    kg = KnowledgeGraph()
+    kg.visit(ast.parse(SOURCE))
+    return kg
+
+
+class CachedConstructASTTest(unittest.TestCase):
+
+    def setUp(self):
+
+        kg = extract()
+        self.construct = CachedConstructAST(kg.nodes, kg.edges)
+        self.expected = ast.unparse(ast.parse(SOURCE))
+
+    def test_results_share_cached_subtrees(self):
+
+        first = self.construct.build_module()
+        second = self.construct.build_module()
+
+        self.assertIsNot(first, second)
+        self.assertEqual([id(statement) for statement in first.body], [id(statement) for statement in second.body])
+        self.assertEqual(self.construct.stats()["hits"], len(first.body))
+
+    def test_copied_result_can_be_changed(self):
+
+        module = copy.deepcopy(self.construct.build_module())
+        module.body[0].name = "changed"
+        module.body.pop()
+
+        self.assertEqual(ast.unparse(self.construct.build_module()), self.expected)
+
+    def test_edit_rebuilds_only_changed_path(self):
+
+        first = self.construct.build_module()
+        function_id = next(node_id for node_id, node in self.construct.nodes.items()
+                           if node["type"] == "Function" and node["attributes"]["name"] == "area")
+        attributes = dict(self.construct.nodes[function_id]["attributes"], name="surface")
+        self.construct.set_node(function_id, "Function", attributes)
+        second = self.construct.build_module()
+
+        self.assertEqual(second.body[0].name, "surface")
+        self.assertEqual(first.body[0].name, "area")
+        self.assertIs(second.body[1], first.body[1])
+        self.assertEqual(ast.unparse(second), self.expected.replace("def area", "def surface", 1))
+
+    def test_node_count_covers_every_cached_subtree(self):
+
+        module = self.construct.build_module()
+
+        self.assertEqual(self.construct.stats()["nodes"], sum(len(list(ast.walk(item))) for item in module.body))
+
+    def test_node_limit_evicts_entries_and_their_ancestors(self):
+
+        self.construct.build_module()
+        function_id = next(node_id for node_id, node in self.construct.nodes.items()
+                           if node["type"] == "Function" and node["attributes"]["name"] == "area")
+        self.construct.max_nodes = self.construct.stats()["nodes"] - 1
+        self.construct.enforce_limit()
+        stats = self.construct.stats()
+
+        self.assertEqual(stats["evictions"], 2)
+        self.assertNotIn(function_id, self.construct.cache)
+        self.assertEqual(stats["nodes"], sum(self.construct.sizes.values()))
+        self.assertEqual(ast.unparse(self.construct.build_module()), self.expected)
+
+    def test_small_node_limit_still_builds(self):
+
+        kg = extract()
+        construct = CachedConstructAST(kg.nodes, kg.edges, max_nodes=20)
+
+        self.assertEqual(ast.unparse(construct.build_module()), self.expected)
+        self.assertLessEqual(construct.stats()["nodes"], 20)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+
+from CallGraph import CallGraph, SummaryCache
+from ExtractPaths import python_files
+
+REPOSITORY = {
+    "pkg/__init__.py": "from .util import helper\nfrom . import shapes\n",
+    "pkg/util.py": "def helper(value):\n    return value + 1\n\n\ndef unused():\n    return helper(0)\n",
+    "pkg/shapes.py": "from .util import helper\n\n\nclass Shape:\n\n    def area(self):\n        return helper(1)\n\n"
+                     "    def describe(self):\n        return self.area()\n\n\nclass Square(Shape):\n\n"
+                     "    def double(self):\n        return self.describe() * 2\n",
+    "main.py": "import pkg\nfrom pkg.shapes import Square\nfrom pkg import helper as assist\n\n\ndef run():\n"
+               "    square = Square()\n    return square, pkg.helper(2), assist(3), pkg.shapes.Shape()\n\n\nrun()\n",
+    "broken.py": "def broken(:\n",
+}
+EDITS = (
+    ("edit a function body", {"pkg/util.py": "def helper(value):\n    return value * 2\n\n\ndef unused():\n"
+                                             "    return helper(1)\n"}),
+    ("add an export", {"pkg/util.py": "def helper(value):\n    return value * 2\n\n\ndef unused():\n"
+                                      "    return helper(1)\n\n\ndef extra():\n    return unused()\n",
+                       "main.py": "import pkg\nfrom pkg.util import extra\n\n\ndef run():\n    return extra(), pkg.helper(2)\n"}),
+    ("fix a broken file", {"broken.py": "from pkg.util import extra\n\n\ndef fixed():\n    return extra()\n"}),
+    ("remove a re-export", {"pkg/__init__.py": "from . import shapes\n"}),
+    ("delete a module", {"pkg/shapes.py": None}),
+)
+
+
+class CallGraphTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, "repo")
+        self.write(REPOSITORY)
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def write(self, files):
+
+        for name, source in files.items():
+            path = os.path.join(self.root, name)
+            if source is None:
+                os.remove(path)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(source)
+
+    def fresh(self, **options):
+
+        graph = CallGraph(root=self.root, **options)
+        graph.update(python_files([self.root]))
+
+        return graph
+
+    def assertSameGraph(self, graph, expected):
+
+        self.assertEqual(sorted(graph.edges()), sorted(expected.edges()))
+        self.assertEqual(sorted(graph.call_sites()), sorted(expected.call_sites()))
+        self.assertEqual(graph.failures.keys(), expected.failures.keys())
+        self.assertEqual(graph.unresolved, expected.unresolved)
+
+    def callees(self, graph):
+
+        return {(caller.split(":")[0], callee.split(":")[0]) for caller, _, callee in graph.edges()}
+
+    def test_resolves_imports_reexports_and_methods(self):
+
+        graph = self.fresh()
+
+        self.assertEqual(list(graph.failures), [os.path.join(self.root, "broken.py")])
+        self.assertLessEqual({("main.py", "pkg/shapes.py"), ("main.py", "pkg/util.py"), ("pkg/shapes.py", "pkg/util.py"),
+                              ("pkg/shapes.py", "pkg/shapes.py"), ("pkg/util.py", "pkg/util.py")}, self.callees(graph))
+        self.assertEqual(len(list(graph.edges())), 9)
+
+    def test_incremental_updates_match_fresh_build(self):
+
+        graph = self.fresh()
+        for label, files in EDITS:
+            with self.subTest(label):
+                self.write(files)
+                paths = python_files([self.root])
+                graph.remove([path for path in graph.entries if path not in paths])
+                graph.update(paths)
+                self.assertSameGraph(graph, self.fresh())
+
+    def test_cached_and_parallel_builds_match(self):
+
+        cache = SummaryCache(os.path.join(self.directory.name, "cache"))
+        expected = self.fresh()
+
+        self.assertSameGraph(self.fresh(cache=cache, workers=2), expected)
+        self.assertSameGraph(self.fresh(cache=cache, workers=1), expected)
+        self.assertEqual(cache.misses, 0)
+        self.assertGreater(cache.hits, 0)
+
+    def test_unchanged_files_relink_nothing(self):
+
+        graph = self.fresh()
+
+        self.assertFalse(graph.update(python_files([self.root])))
+
+
+if __name__ == "__main__":
+    unittest.main()
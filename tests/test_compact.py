@@ -0,0 +1,74 @@
+import ast
+import unittest
+
+from CompactGraph import DENSE_SLOT_SLACK, CompactGraph, split_numbered
+from ConstructAST import ConstructAST
+from KnowledgeGraph import KnowledgeGraph
+
+SOURCE = """import math
+
+def hypotenuse(a, b):
+    return math.sqrt(a ** 2 + b ** 2)
+
+values = [hypotenuse(x, x + 1) for x in range(3) if x]
+print(values, -values[0], not values)
+"""
+
+
+class CompactGraphTest(unittest.TestCase):
+
+    def test_compact_graph_matches_memory_graph(self):
+
+        expected = KnowledgeGraph()
+        expected.visit(ast.parse(SOURCE))
+        kg = KnowledgeGraph(compact=True)
+        kg.visit(ast.parse(SOURCE))
+
+        self.assertEqual(dict(kg.nodes), expected.nodes)
+        self.assertEqual(list(kg.edges), expected.edges)
+        self.assertEqual(ast.unparse(ConstructAST(kg.nodes, kg.edges).build_module()), ast.unparse(ast.parse(SOURCE)))
+
+    def test_far_suffix_uses_sparse_slots(self):
+
+        graph = CompactGraph()
+        far = 10 * DENSE_SLOT_SLACK
+        node_ids = ["name_0", "name_1", f"name_{far}", "name_2", f"name_{far + 1}"]
+        for node_id in node_ids:
+            graph.add_node(node_id, "Name", {"name": node_id})
+        graph.add_edge("name_0", "Uses", f"name_{far}")
+
+        self.assertEqual(len(graph.prefix_slots[graph.prefix_codes["name"]]), 3)
+        self.assertEqual(len(graph.sparse_slots), 2)
+        self.assertEqual(list(graph.nodes), node_ids)
+        self.assertEqual(graph.nodes[f"name_{far + 1}"]["attributes"], {"name": f"name_{far + 1}"})
+        self.assertNotIn(f"name_{far + 2}", graph.nodes)
+        self.assertEqual(list(graph.edges), [("name_0", "Uses", f"name_{far}")])
+
+    def test_dense_slots_grow_past_sparse_entry(self):
+
+        graph = CompactGraph()
+        far = 3 * DENSE_SLOT_SLACK
+        graph.add_node("name_0", "Name", {})
+        graph.add_node(f"name_{far}", "Name", {"sparse": True})
+        for number in range(1, far + 10):
+            if number != far:
+                graph.add_node(f"name_{number}", "Name", {})
+
+        self.assertEqual(len(graph.nodes), far + 10)
+        self.assertEqual(graph.nodes[f"name_{far}"]["attributes"], {"sparse": True})
+        self.assertEqual(len(graph.sparse_slots), 1)
+
+    def test_suffix_past_32_bits_is_a_plain_name(self):
+
+        graph = CompactGraph()
+        node_id = f"name_{2 ** 40}"
+        graph.add_node(node_id, "Name", {})
+        graph.add_edge(node_id, f"Arg_{2 ** 40}", node_id)
+
+        self.assertIsNone(split_numbered(node_id))
+        self.assertEqual(list(graph.nodes), [node_id])
+        self.assertEqual(list(graph.edges), [(node_id, f"Arg_{2 ** 40}", node_id)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+
+from Datalog import Datalog
+from GraphQuery import GraphQuery
+from tests.samples import extract
+
+HIERARCHY_SOURCE = """class Base:
+    pass
+
+class Left(Base):
+    pass
+
+class Right(Base):
+    pass
+
+class Diamond(Left, Right):
+    pass
+
+class Leaf(Diamond):
+    pass
+
+class Other(object):
+    pass
+"""
+BODY_RELATIONS = ("Has_Statement", "Body_Statement", "OrElse_Statement")
+
+
+def closure(pairs):
+
+    reachable = {}
+    for start in {source for source, _ in pairs}:
+        seen = set()
+        pending = [start]
+        while pending:
+            current = pending.pop()
+            for source, destination in pairs:
+                if source == current and destination not in seen:
+                    seen.add(destination)
+                    pending.append(destination)
+        reachable[start] = seen
+
+    return {(start, end) for start, ends in reachable.items() for end in ends}
+
+
+def class_rules(program):
+
+    program.rule(("class_named", "?name", "?class"), ("node", "?class", "Class"), ("attribute", "?class", "name", "?name"))
+    program.rule(("base", "?class", "?base"), ("indexed", "?class", "Base", "?expression"),
+                 ("attribute", "?expression", "name", "?name"), ("class_named", "?name", "?base"))
+
+
+class DatalogTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.kg = extract(HIERARCHY_SOURCE)
+        self.classes = {node["attributes"]["name"]: node_id for node_id, node in self.kg.nodes.items()
+                        if node["type"] == "Class"}
+
+    def names(self, pairs):
+
+        names = {node_id: name for name, node_id in self.classes.items()}
+
+        return {(names[first], names[second]) for first, second in pairs}
+
+    def test_linear_ancestor_closure(self):
+
+        program = Datalog(GraphQuery(self.kg.nodes, self.kg.edges))
+        class_rules(program)
+        program.rule(("ancestor", "?class", "?base"), ("base", "?class", "?base"))
+        program.rule(("ancestor", "?class", "?ancestor"), ("ancestor", "?class", "?base"), ("base", "?base", "?ancestor"))
+        ancestors = self.names(program.relation("ancestor"))
+
+        self.assertEqual(ancestors, closure(self.names(program.relation("base"))))
+        self.assertEqual({ancestor for name, ancestor in ancestors if name == "Leaf"}, {"Diamond", "Left", "Right", "Base"})
+        self.assertNotIn("Other", {name for name, _ in ancestors})
+
+    def test_nonlinear_rule_gives_same_closure(self):
+
+        linear = Datalog(GraphQuery(self.kg.nodes, self.kg.edges))
+        nonlinear = Datalog(GraphQuery(self.kg.nodes, self.kg.edges))
+        for program in (linear, nonlinear):
+            class_rules(program)
+            program.rule(("ancestor", "?class", "?base"), ("base", "?class", "?base"))
+        linear.rule(("ancestor", "?class", "?ancestor"), ("ancestor", "?class", "?base"), ("base", "?base", "?ancestor"))
+        nonlinear.rule(("ancestor", "?class", "?ancestor"), ("ancestor", "?class", "?base"),
+                       ("ancestor", "?base", "?ancestor"))
+
+        self.assertEqual(set(nonlinear.relation("ancestor")), set(linear.relation("ancestor")))
+
+    def test_nested_statement_closure(self):
+
+        kg = extract()
+        program = Datalog(GraphQuery(kg.nodes, kg.edges))
+        for relation in BODY_RELATIONS:
+            program.rule(("nested", "?function", "?statement"), ("node", "?function", "Function"),
+                         ("edge", "?function", relation, "?statement"))
+            program.rule(("nested", "?function", "?statement"), ("nested", "?function", "?parent"),
+                         ("edge", "?parent", relation, "?statement"))
+        functions = {node_id for node_id, node in kg.nodes.items() if node["type"] == "Function"}
+        expected = {(function, statement) for function, statement in
+                    closure({(source, destination) for source, relation, destination in kg.edges
+                             if relation in BODY_RELATIONS})
+                    if function in functions}
+
+        self.assertTrue(expected)
+        self.assertEqual(set(program.relation("nested")), expected)
+        returns = {binding["?statement"] for binding in program.match(("nested", "?function", "?statement"),
+                                                                       ("attribute", "?statement", "kind", "Return"))}
+        self.assertEqual(returns, {statement for _, statement in expected
+                                   if kg.nodes[statement]["attributes"].get("kind") == "Return"})
+
+    def test_graph_changes_are_picked_up(self):
+
+        query = GraphQuery(self.kg.nodes, self.kg.edges)
+        program = Datalog(query)
+        class_rules(program)
+        before = set(program.relation("base"))
+        self.assertIs(program.solve(), program.solve())
+
+        query.add_node("expression_new", "Expression", {"type": "name", "name": "Leaf"})
+        query.add_edge(self.classes["Other"], "Base_1", "expression_new")
+
+        self.assertEqual(set(program.relation("base")) - before, {(self.classes["Other"], self.classes["Leaf"])})
+
+    def test_invalid_rules_are_rejected(self):
+
+        program = Datalog(GraphQuery(self.kg.nodes, self.kg.edges))
+
+        with self.assertRaises(ValueError):
+            program.rule(("edge", "?a", "Uses", "?b"), ("node", "?a", "Name"))
+        with self.assertRaises(ValueError):
+            program.rule(("named", "?class", "?name"), ("node", "?class", "Class"))
+
+
+if __name__ == "__main__":
+    unittest.main()
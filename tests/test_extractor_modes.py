@@ -0,0 +1,151 @@
+import ast
+import unittest
+
+from ConstructAST import ConstructAST
+from FoldOperations import fold_operations, unfold_operations
+from SourceEmitter import SourceEmitter
+from tests.samples import SAMPLE_SOURCE, extract, normalized
+
+DEFINITION_TYPES = ("Function", "AsyncFunction", "Class")
+
+
+def definition_ids(kg):
+
+    return {node_id for node_id, node in kg.nodes.items() if node["type"] in DEFINITION_TYPES}
+
+
+class ModeTest(unittest.TestCase):
+
+    options = {}
+
+    def assertRoundTrip(self, kg, source=SAMPLE_SOURCE):
+
+        self.assertEqual(ast.unparse(ConstructAST(kg.nodes, kg.edges).build_module()), normalized(source))
+        self.assertEqual(ast.unparse(ast.parse(SourceEmitter(kg.nodes, kg.edges).source())), normalized(source))
+
+    def test_round_trip(self):
+
+        self.assertRoundTrip(extract(**self.options))
+
+    def test_compact_round_trip(self):
+
+        kg = extract(**self.options)
+        compact = extract(compact=True, **self.options)
+
+        self.assertEqual(dict(compact.nodes), kg.nodes)
+        self.assertEqual(list(compact.edges), kg.edges)
+        self.assertRoundTrip(compact)
+
+class DefaultModeTest(ModeTest):
+
+    pass
+
+class ContentIdsTest(ModeTest):
+
+    options = {"content_ids": True}
+
+    def test_moved_definitions_keep_their_ids(self):
+
+        moved = extract("import sys\n\n\n" + SAMPLE_SOURCE, **self.options)
+
+        self.assertEqual(definition_ids(moved), definition_ids(extract(**self.options)))
+
+    def test_identical_subtrees_share_a_node(self):
+
+        source = "def first():\n    return size + 1\n\ndef second():\n    return size + 1\n"
+        kg = extract(source, **self.options)
+        additions = [node_id for node_id, node in kg.nodes.items() if node["attributes"].get("type") == "binary_operator"]
+
+        self.assertEqual(len(additions), 1)
+        self.assertEqual(len(definition_ids(kg)), 2)
+        self.assertRoundTrip(kg, source)
+
+    def test_edited_definition_changes_only_its_ids(self):
+
+        kg = extract(**self.options)
+        edited = extract(SAMPLE_SOURCE.replace("self.name = name\n", "self.name = name.strip()\n"), **self.options)
+
+        changed = {kg.nodes[node_id]["attributes"]["name"] for node_id in definition_ids(kg) - definition_ids(edited)}
+
+        self.assertEqual(changed, {"__init__", "Shape"})
+
+
+class InternLeavesTest(ModeTest):
+
+    options = {"intern_leaves": True}
+
+    def test_leaves_are_shared(self):
+
+        kg = extract(**self.options)
+        plain = extract()
+        names = [node["attributes"]["name"] for node in kg.nodes.values() if node["type"] == "Name"]
+        operations = [node["attributes"]["operation"] for node in kg.nodes.values() if node["type"] == "Operation"]
+
+        self.assertEqual(len(names), len(set(names)))
+        self.assertEqual(len(operations), len(set(operations)))
+        self.assertLess(len(kg.nodes), len(plain.nodes))
+        self.assertEqual(len(kg.edges), len(plain.edges))
+
+    def test_equal_looking_constants_stay_apart(self):
+
+        source = "values = [1, 1.0, True, 1]\n"
+        kg = extract(source, **self.options)
+        literals = [node for node in kg.nodes.values() if node["type"] == "Literal"]
+
+        self.assertEqual(len(literals), 3)
+        self.assertRoundTrip(kg, source)
+
+
+class FoldOperationsTest(ModeTest):
+
+    options = {"fold_operations": True}
+
+    def test_folding_while_extracting_matches_converter(self):
+
+        plain = extract()
+        nodes, edges = fold_operations(plain.nodes, plain.edges)
+        kg = extract(**self.options)
+
+        self.assertEqual(nodes, kg.nodes)
+        self.assertEqual(edges, kg.edges)
+        self.assertFalse([node for node in kg.nodes.values() if node["type"] == "Operation"])
+
+    def test_unfold_then_fold_is_identity(self):
+
+        kg = extract(**self.options)
+        nodes, edges = unfold_operations(kg.nodes, kg.edges)
+
+        self.assertEqual(len(nodes), len(extract().nodes))
+        self.assertEqual(ast.unparse(ConstructAST(nodes, edges).build_module()), normalized())
+        self.assertEqual(fold_operations(nodes, edges), (kg.nodes, kg.edges))
+
+
+class SymbolsTest(ModeTest):
+
+    options = {"symbols": True}
+
+    def test_reference_edges_are_added_alongside_tree(self):
+
+        kg = extract(**self.options)
+        plain = extract()
+        tree_edges = [edge for edge in kg.edges if edge[1] not in ("Defines", "Uses", "ResolvesTo")]
+
+        self.assertEqual(kg.nodes, plain.nodes)
+        self.assertEqual(tree_edges, plain.edges)
+        self.assertEqual({name for name, _ in kg.symbols.unresolved},
+                         {"NotImplementedError", "OSError", "RuntimeError", "ValueError",
+                          "int", "list", "object", "open", "property", "range", "str", "type"})
+
+    def test_folded_symbols_round_trip(self):
+
+        self.assertRoundTrip(extract(fold_operations=True, **self.options))
+
+    def test_shared_node_modes_are_rejected(self):
+
+        for option in ("content_ids", "intern_leaves"):
+            with self.assertRaises(ValueError):
+                extract(**{option: True}, **self.options)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import ast
+import unittest
+
+from ConstructAST import ConstructAST
+from GraphDiff import GraphSignature, graph_diff, patch
+from IncrementalExtractor import IncrementalExtractor
+from tests.samples import SAMPLE_SOURCE, edited_sources, extract, normalized
+
+MODES = ({}, {"symbols": True}, {"content_ids": True}, {"intern_leaves": True}, {"fold_operations": True})
+
+
+def module_hash(nodes, edges):
+
+    return GraphSignature(nodes, edges).node_hash("Module:<top>")
+
+
+class GraphDiffTest(unittest.TestCase):
+
+    def test_patch_matches_fresh_extraction(self):
+
+        for options in MODES:
+            for label, old_source, new_source in edited_sources():
+                with self.subTest(label, **options):
+                    old = extract(old_source, **options)
+                    new = extract(new_source, **options)
+                    delta = graph_diff((old.nodes, old.edges), (new.nodes, new.edges))
+                    nodes, edges = patch(old.nodes, old.edges, delta)
+
+                    self.assertTrue(len(delta))
+                    self.assertTrue(all(source in nodes or source == "Module:<top>" for source, _, _ in edges))
+                    self.assertTrue(all(destination in nodes for _, _, destination in edges))
+                    self.assertEqual(ast.unparse(ConstructAST(nodes, edges).build_module()), normalized(new_source))
+                    self.assertEqual(module_hash(nodes, edges), module_hash(new.nodes, new.edges))
+                    self.assertEqual(len(graph_diff((nodes, edges), (new.nodes, new.edges))), 0)
+
+    def test_same_graph_gives_empty_delta(self):
+
+        kg = extract()
+        delta = graph_diff((kg.nodes, kg.edges), (kg.nodes, kg.edges))
+
+        self.assertEqual(len(delta), 0)
+        self.assertEqual(patch(kg.nodes, kg.edges, delta), (kg.nodes, kg.edges))
+
+    def test_incremental_graph_matches_fresh_extraction(self):
+
+        graph = IncrementalExtractor(SAMPLE_SOURCE)
+        fresh = extract()
+
+        self.assertEqual(len(graph_diff((graph.nodes, graph.edges), (fresh.nodes, fresh.edges))), 0)
+        self.assertEqual(module_hash(graph.nodes, graph.edges), module_hash(fresh.nodes, fresh.edges))
+
+    def test_signature_can_be_reused(self):
+
+        old = extract()
+        signature = GraphSignature(old.nodes, old.edges)
+        for _, _, new_source in edited_sources():
+            new = extract(new_source)
+            self.assertEqual(len(graph_diff(signature, GraphSignature(new.nodes, new.edges))),
+                             len(graph_diff((old.nodes, old.edges), (new.nodes, new.edges))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import ast
+import os
+import tempfile
+import unittest
+
+from ConstructAST import ConstructAST
+from ExtractPaths import module_id, namespace_graph
+from GraphStore import GraphStore
+from tests.samples import SAMPLE_SOURCE, extract, normalized
+
+HELPER_SOURCE = """def helper(value):
+    return value + 1
+"""
+
+
+class GraphStoreTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "graph.db")
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_add_graph_rebuilds_each_module(self):
+
+        nodes, edges = {}, []
+        for namespace, source in (("pkg/sample.py", SAMPLE_SOURCE), ("pkg/helper.py", HELPER_SOURCE)):
+            kg = extract(source)
+            module_nodes, module_edges = namespace_graph(kg.nodes, kg.edges, namespace)
+            nodes.update(module_nodes)
+            edges.extend(module_edges)
+
+        with GraphStore(self.path) as store:
+            store.add_graph(nodes, edges)
+        with GraphStore(self.path) as store:
+            self.assertEqual(dict(store.nodes), nodes)
+            self.assertEqual(list(store.edges), edges)
+            for namespace, source in (("pkg/sample.py", SAMPLE_SOURCE), ("pkg/helper.py", HELPER_SOURCE)):
+                module = ConstructAST.from_graph(store, module_id(namespace)).build_module()
+                self.assertEqual(ast.unparse(module), normalized(source))
+
+    def test_store_as_sink(self):
+
+        expected = extract()
+        store = GraphStore(self.path, batch_size=16)
+        kg = extract(sink=store)
+
+        self.assertEqual(store.pending_nodes, [])
+        self.assertEqual(dict(kg.nodes), expected.nodes)
+        self.assertEqual(list(kg.edges), expected.edges)
+        self.assertEqual(ast.unparse(ConstructAST.from_graph(store).build_module()), normalized())
+        store.close()
+
+    def test_indexed_queries(self):
+
+        expected = extract()
+        with GraphStore(self.path) as store:
+            store.add_graph(expected.nodes, expected.edges)
+            functions = sorted(node_id for node_id, node in expected.nodes.items() if node["type"] == "Function")
+
+            self.assertEqual(store.nodes_of_type("Function"), functions)
+            self.assertEqual(store.outgoing(functions[0]),
+                             [edge for edge in expected.edges if edge[0] == functions[0]])
+            self.assertEqual(store.incoming(functions[0]),
+                             [edge for edge in expected.edges if edge[2] == functions[0]])
+            self.assertIsNone(store.node("missing"))
+            self.assertNotIn("missing", store.nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()
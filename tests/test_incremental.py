@@ -0,0 +1,53 @@
+import ast
+import unittest
+
+from ConstructAST import ConstructAST
+from GraphDiff import GraphSignature
+from IncrementalExtractor import IncrementalExtractor
+from tests.samples import SAMPLE_SOURCE, edited_sources, extract, normalized
+
+
+class IncrementalExtractorTest(unittest.TestCase):
+
+    def assertMatchesFresh(self, graph, source):
+
+        fresh = extract(source)
+        node_ids = set(graph.nodes)
+
+        self.assertEqual(ast.unparse(ConstructAST(graph.nodes, graph.edges).build_module()), normalized(source))
+        self.assertEqual(len(graph.nodes), len(fresh.nodes))
+        self.assertEqual(len(graph.edges), len(fresh.edges))
+        self.assertTrue(all(source in node_ids or source == "Module:<top>" for source, _, _ in graph.edges))
+        self.assertTrue(all(destination in node_ids for _, _, destination in graph.edges))
+        self.assertEqual(GraphSignature(graph.nodes, graph.edges).node_hash("Module:<top>"),
+                         GraphSignature(fresh.nodes, fresh.edges).node_hash("Module:<top>"))
+
+    def test_each_edit_matches_fresh_extraction(self):
+
+        graph = IncrementalExtractor(SAMPLE_SOURCE)
+        self.assertMatchesFresh(graph, SAMPLE_SOURCE)
+        for label, _, source in edited_sources():
+            with self.subTest(label):
+                graph.update(source)
+                self.assertMatchesFresh(graph, source)
+
+    def test_edit_reextracts_only_changed_unit(self):
+
+        graph = IncrementalExtractor(SAMPLE_SOURCE)
+        kept = {node_id for node_id, node in graph.nodes.items() if node["type"] == "Function"}
+        changed = graph.update(SAMPLE_SOURCE.replace("self.name = name\n", "self.name = name.strip()\n"))
+
+        self.assertEqual([unit.name for unit in changed], ["__init__"])
+        self.assertEqual(len(kept - set(graph.nodes)), 1)
+
+    def test_unchanged_source_reextracts_nothing(self):
+
+        graph = IncrementalExtractor(SAMPLE_SOURCE)
+        edges = list(graph.edges)
+
+        self.assertEqual(list(graph.update(SAMPLE_SOURCE)), [])
+        self.assertEqual(list(graph.edges), edges)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import ast
+import unittest
+
+from CachedConstructAST import CachedConstructAST
+from ConstructAST import ConstructAST
+from GraphIndex import GraphIndex
+from KnowledgeGraph import KnowledgeGraph
+
+SOURCE = """def area(width, height):
+    return width * height
+
+def perimeter(width, height):
+    return 2 * (width + height)
+
+print(area(2, 3), perimeter(2, 3))
+"""
+
+
+def extract(**options):
+
+    kg = KnowledgeGraph(**options)
+    kg.visit(ast.parse(SOURCE))
+    return kg
+
+
+class GraphIndexTest(unittest.TestCase):
+
+    def test_index_as_sink_matches_memory_graph(self):
+
+        expected = extract()
+        kg = extract(sink=GraphIndex())
+
+        self.assertIs(kg.edges, kg.sink.edges)
+        self.assertEqual(list(kg.edges), expected.edges)
+        self.assertEqual(ast.unparse(ConstructAST.from_graph(kg.sink).build_module()), ast.unparse(ast.parse(SOURCE)))
+
+    def test_remove_edge_keeps_order(self):
+
+        kg = extract()
+        index = GraphIndex(kg.nodes, kg.edges)
+        removed = kg.edges[::3]
+        for edge in removed:
+            index.remove_edge(*edge)
+        expected = [edge for position, edge in enumerate(kg.edges) if position % 3]
+
+        self.assertEqual(list(index.edges), expected)
+        self.assertEqual(len(index.edges), len(expected))
+        self.assertEqual(index.edges[-1], expected[-1])
+        self.assertEqual(index.edges[1:4], expected[1:4])
+
+    def test_remove_all_edges_then_add(self):
+
+        kg = extract()
+        index = GraphIndex(kg.nodes, kg.edges)
+        for edge in reversed(kg.edges):
+            index.remove_edge(*edge)
+        index.add_edge("Module:<top>", "Body_0", "statement_0")
+
+        self.assertEqual(list(index.edges), [("Module:<top>", "Body_0", "statement_0")])
+        self.assertEqual(index.parents("statement_0"), [("Module:<top>", "Body_0")])
+
+    def test_remove_duplicate_edge_once(self):
+
+        index = GraphIndex()
+        for edge in (("a", "Uses", "b"), ("a", "Uses", "c"), ("a", "Uses", "b")):
+            index.add_edge(*edge)
+        index.remove_edge("a", "Uses", "b")
+
+        self.assertEqual(list(index.edges), [("a", "Uses", "c"), ("a", "Uses", "b")])
+        self.assertEqual(index.children("a", "Uses"), ["c", "b"])
+        with self.assertRaises(ValueError):
+            index.remove_edge("a", "Uses", "d")
+
+    def test_cached_reconstructor_rebuilds_after_edge_edits(self):
+
+        kg = extract()
+        reconstructor = CachedConstructAST(kg.nodes, kg.edges)
+        reconstructor.build_module()
+        module_edges = [edge for edge in kg.edges if edge[0] == "Module:<top>"]
+        for edge in module_edges:
+            reconstructor.remove_edge(*edge)
+        for edge in module_edges:
+            reconstructor.add_edge(*edge)
+
+        self.assertEqual(ast.unparse(reconstructor.build_module()), ast.unparse(ast.parse(SOURCE)))
+
+
+if __name__ == "__main__":
+    unittest.main()
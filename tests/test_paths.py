@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+from ExtractionCache import ExtractionCache
+from ExtractPaths import extract_paths, map_tasks
+from VerifyPaths import verify_paths, verify_source
+
+SOURCES = {
+    "shapes.py": "def area(width, height):\n    return width * height\n",
+    "main.py": "from shapes import area\n\nprint(area(2, 3))\n",
+    "broken.py": "def broken(:\n",
+}
+
+
+def square(value):
+
+    return value * value
+
+
+class PathsTest(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, source in sorted(SOURCES.items()):
+            path = os.path.join(self.directory.name, name)
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(source)
+            self.paths.append(path)
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_map_tasks_keeps_task_order(self):
+
+        tasks = list(range(20))
+
+        self.assertEqual(list(map_tasks(square, tasks, workers=1)), [value * value for value in tasks])
+        self.assertEqual(list(map_tasks(square, tasks, workers=2)), [value * value for value in tasks])
+
+    def test_parallel_extraction_matches_serial(self):
+
+        serial = extract_paths(self.paths, workers=1, root=self.directory.name)
+        parallel = extract_paths(self.paths, workers=2, root=self.directory.name)
+
+        self.assertEqual(parallel.nodes, serial.nodes)
+        self.assertEqual(parallel.edges, serial.edges)
+        self.assertEqual(parallel.failures, serial.failures)
+        self.assertEqual(list(serial.failures), [self.paths[0]])
+
+    def test_cache_counts_lookups_in_both_modes(self):
+
+        cache_directory = os.path.join(self.directory.name, "cache")
+        for workers, hits, misses in ((1, 0, 3), (2, 3, 0), (1, 3, 0)):
+            cache = ExtractionCache(cache_directory)
+            extract_paths(self.paths, workers=workers, root=self.directory.name, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (hits, misses))
+
+    def test_parallel_extraction_enforces_cache_limit(self):
+
+        cache = ExtractionCache(os.path.join(self.directory.name, "cache"), max_bytes=1)
+        extract_paths(self.paths, workers=2, root=self.directory.name, cache=cache)
+
+        self.assertEqual(cache.evictions, 3)
+        self.assertEqual(cache.total_bytes, 0)
+
+    def test_parallel_verification_matches_serial(self):
+
+        serial = verify_paths(self.paths, workers=1)
+        parallel = verify_paths(self.paths, workers=2)
+
+        self.assertEqual(vars(parallel), vars(serial))
+
+
+class VerifyTest(unittest.TestCase):
+
+    def test_nested_definitions_stay_in_place(self):
+
+        source = ("if flag:\n    def f():\n        pass\nelse:\n    class C:\n        pass\n"
+                  "try:\n    from fast import g\nexcept ImportError:\n    async def g():\n        pass\n"
+                  "def outer():\n    for item in items:\n        def inner():\n            return item\n")
+
+        self.assertIsNone(verify_source(source))
+
+    def test_unsupported_statement_is_a_mismatch(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "matching.py")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write("match command:\n    case 'go':\n        move()\n")
+            result = verify_paths([path], workers=1)
+
+        self.assertEqual(result.mismatches, {path: ("body[0]", "Match, rebuilt has Expr")})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import ast
+import unittest
+
+from CachedConstructAST import CachedConstructAST
+from ConstructAST import ConstructAST
+from SourceEmitter import SourceEmitter
+from tests.samples import extract, normalized
+
+ASYNC_SOURCE = '''
+async def fetch(url):
+    return await get(url)
+
+class Client:
+
+    async def request(self, path):
+        async with self.session() as session:
+            return await session.get(path)
+
+    class Options:
+        retries = 3
+
+def outer():
+
+    async def inner():
+        async for item in stream():
+            await item
+    return inner
+
+async def factory():
+
+    def build():
+        return 1
+
+    class Product:
+
+        def make(self):
+            return build()
+    return Product
+'''
+
+SIGNATURE_SOURCE = '''
+class Registry(Base, metaclass=Meta, **options):
+    pass
+
+def lookup(key: str, *, default=None) -> dict[str, int]:
+    return {key: f'{default!r:>10}', 'ascii': f'{key!a}', 'plain': f'{key!s}'}
+
+handlers = [lambda a, /, b=1, *rest, c, d=2, **extra: (a, b, rest, c, d, extra), lambda *, key: key, lambda **kw: kw]
+'''
+
+class AsyncRoundTripTest(unittest.TestCase):
+
+    def test_async_definitions_survive_every_builder(self):
+
+        knowledge_graph = extract(ASYNC_SOURCE)
+        expected = normalized(ASYNC_SOURCE)
+
+        self.assertEqual(ast.unparse(ConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()), expected)
+        self.assertEqual(ast.unparse(CachedConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()), expected)
+        emitted = SourceEmitter(knowledge_graph.nodes, knowledge_graph.edges).source()
+        self.assertEqual(ast.unparse(ast.parse(emitted)), expected)
+
+    def test_async_method_keeps_class_body(self):
+
+        knowledge_graph = extract("class C:\n    async def m(self):\n        pass\n")
+        module = ConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()
+
+        self.assertIsInstance(module.body[0].body[0], ast.AsyncFunctionDef)
+
+    def test_definitions_nested_in_async_function_stay_nested(self):
+
+        knowledge_graph = extract("async def f():\n    def g():\n        return 1\n    return g\n")
+        module = ConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()
+
+        self.assertEqual(len(module.body), 1)
+        self.assertEqual([type(statement) for statement in module.body[0].body], [ast.FunctionDef, ast.Return])
+
+class SignatureRoundTripTest(unittest.TestCase):
+
+    def test_signatures_survive_every_builder(self):
+
+        knowledge_graph = extract(SIGNATURE_SOURCE)
+        expected = ast.dump(ast.parse(SIGNATURE_SOURCE))
+
+        self.assertEqual(ast.dump(ConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()), expected)
+        self.assertEqual(ast.dump(CachedConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()), expected)
+        emitted = SourceEmitter(knowledge_graph.nodes, knowledge_graph.edges).source()
+        self.assertEqual(ast.dump(ast.parse(emitted)), expected)
+
+    def test_keywords_keep_source_order(self):
+
+        knowledge_graph = extract("call(*args, **options, key=1)\n")
+        module = ConstructAST(knowledge_graph.nodes, knowledge_graph.edges).build_module()
+
+        self.assertEqual([keyword.arg for keyword in module.body[0].value.keywords], [None, "key"])
+
+if __name__ == "__main__":
+    unittest.main()
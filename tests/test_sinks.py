@@ -0,0 +1,59 @@
+import ast
+import io
+import json
+import unittest
+
+from GraphSink import BatchingSink, NDJSONSink
+from KnowledgeGraph import KnowledgeGraph
+
+SOURCE = """def area(width, height):
+    return width * height
+
+print(area(2, 3))
+"""
+
+
+def extract(**options):
+
+    kg = KnowledgeGraph(**options)
+    kg.visit(ast.parse(SOURCE))
+    return kg
+
+
+class SinkTest(unittest.TestCase):
+
+    def test_batching_sink_delivers_last_partial_batch(self):
+
+        expected = extract()
+        batches = []
+        kg = extract(sink=BatchingSink(batches.append, batch_size=7))
+        records = [record for batch in batches for record in batch]
+
+        self.assertTrue(all(len(batch) <= 7 for batch in batches))
+        self.assertEqual({record[1]: {"type": record[2], "attributes": record[3]}
+                          for record in records if record[0] == "node"}, expected.nodes)
+        self.assertEqual([record[1:] for record in records if record[0] == "edge"], expected.edges)
+        self.assertEqual(kg.sink.batch, [])
+
+    def test_batching_sink_flushes_buffered_modes(self):
+
+        expected = extract(content_ids=True)
+        batches = []
+        extract(sink=BatchingSink(batches.append, batch_size=1000), content_ids=True)
+
+        self.assertEqual(sum(len(batch) for batch in batches), len(expected.nodes) + len(expected.edges))
+
+    def test_ndjson_sink_writes_graph(self):
+
+        expected = extract()
+        handle = io.StringIO()
+        extract(sink=NDJSONSink(handle))
+        records = [json.loads(line) for line in handle.getvalue().splitlines()]
+
+        self.assertEqual({record["node"]: {"type": record["type"], "attributes": record["attributes"]}
+                          for record in records if "node" in record}, expected.nodes)
+        self.assertEqual([tuple(record["edge"]) for record in records if "edge" in record], expected.edges)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import ast
+import unittest
+
+from KnowledgeGraph import KnowledgeGraph
+
+NONLOCAL_SOURCE = """def outer():
+    a = 1
+    def inner():
+        nonlocal a
+        a = a + 1
+    inner()
+    return a
+"""
+
+
+def extract(source):
+
+    kg = KnowledgeGraph(symbols=True)
+    kg.visit(ast.parse(source))
+    return kg
+
+
+def function_id(kg, name):
+
+    return next(node_id for node_id, node in kg.nodes.items()
+                if node["type"] == "Function" and node["attributes"]["name"] == name)
+
+
+class NonlocalTest(unittest.TestCase):
+
+    def test_nonlocal_use_resolves_to_outer_binding(self):
+
+        kg = extract(NONLOCAL_SOURCE)
+        outer = function_id(kg, "outer")
+        inner = function_id(kg, "inner")
+        defined = [destination for source, relation, destination in kg.edges
+                   if source == outer and relation == "Defines" and kg.nodes[destination]["type"] == "Name"]
+        used = [destination for source, relation, destination in kg.edges if source == inner and relation == "Uses"]
+
+        self.assertEqual(len(defined), 2)
+        self.assertEqual(len(used), 1)
+        resolved = {destination for source, relation, destination in kg.edges
+                    if source == used[0] and relation == "ResolvesTo"}
+        self.assertEqual(resolved, set(defined))
+        self.assertFalse([destination for source, relation, destination in kg.edges
+                          if source == inner and relation == "Defines"])
+        self.assertEqual(kg.symbols.unresolved, [])
+
+    def test_nonlocal_keeps_declared_names(self):
+
+        kg = extract(NONLOCAL_SOURCE)
+        statement = next(node_id for node_id, node in kg.nodes.items() if node_id.startswith("nonlocal_"))
+        names = [kg.nodes[destination]["attributes"]["literal_value"] for source, relation, destination in kg.edges
+                 if source == statement and relation.startswith("Name_")]
+
+        self.assertEqual(names, ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()